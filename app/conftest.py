@@ -0,0 +1,13 @@
+from django.conf import settings
+
+from experimenter.base.http import RATE_LIMIT_BACKEND_LOCAL
+from experimenter.base.locks import TASK_LOCK_BACKEND_LOCAL
+
+
+def pytest_configure():
+    # the test suite runs without Redis, so task locks and rate limits are
+    # kept in process
+    settings.TASK_LOCK_BACKEND = TASK_LOCK_BACKEND_LOCAL
+    settings.RATE_LIMIT_BACKEND = RATE_LIMIT_BACKEND_LOCAL
+    # queued Bugzilla updates are flushed inline unless a test sets a window
+    settings.BUGZILLA_COALESCE_WINDOW = 0
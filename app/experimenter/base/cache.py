@@ -0,0 +1,115 @@
+import pickle
+import threading
+import time
+from collections import OrderedDict
+
+import redis
+from django.core.cache.backends.base import DEFAULT_TIMEOUT, BaseCache
+
+
+class RedisCache(BaseCache):
+    """
+    A minimal Django cache backend on top of the redis client that celery
+    already depends on, so a shared cache can run on the existing Redis.
+
+    LOCATION is a redis URL, for example redis://redis:6379/1
+    """
+
+    def __init__(self, server, params):
+        super().__init__(params)
+        self._client = redis.Redis.from_url(server)
+
+    def _key(self, key, version=None):
+        key = self.make_key(key, version=version)
+        self.validate_key(key)
+        return key
+
+    def _expiry(self, timeout):
+        if timeout == DEFAULT_TIMEOUT:
+            timeout = self.default_timeout
+        if timeout is not None:
+            return max(int(timeout), 0)
+
+    def add(self, key, value, timeout=DEFAULT_TIMEOUT, version=None):
+        return self._set(key, value, timeout, version, nx=True)
+
+    def get(self, key, default=None, version=None):
+        value = self._client.get(self._key(key, version))
+        if value is None:
+            return default
+        return pickle.loads(value)
+
+    def set(self, key, value, timeout=DEFAULT_TIMEOUT, version=None):
+        self._set(key, value, timeout, version)
+
+    def _set(self, key, value, timeout, version, nx=False):
+        key = self._key(key, version)
+        expiry = self._expiry(timeout)
+
+        if expiry == 0:
+            self._client.delete(key)
+            return False
+
+        return bool(
+            self._client.set(
+                key, pickle.dumps(value, pickle.HIGHEST_PROTOCOL), ex=expiry, nx=nx
+            )
+        )
+
+    def touch(self, key, timeout=DEFAULT_TIMEOUT, version=None):
+        key = self._key(key, version)
+        expiry = self._expiry(timeout)
+
+        if expiry is None:
+            return bool(self._client.persist(key))
+        return bool(self._client.expire(key, expiry))
+
+    def delete(self, key, version=None):
+        return bool(self._client.delete(self._key(key, version)))
+
+    def clear(self):
+        self._client.flushdb()
+
+
+class LocalLRUCache(object):
+    """
+    A bounded in-process cache that evicts the least recently used entry,
+    with an optional time to live per entry.
+    """
+
+    def __init__(self, max_size):
+        self.max_size = max_size
+        self._entries = OrderedDict()
+        self._lock = threading.Lock()
+
+    def get(self, key):
+        with self._lock:
+            if key in self._entries:
+                value, expires_at = self._entries[key]
+
+                if expires_at is not None and expires_at <= time.monotonic():
+                    del self._entries[key]
+                    return None
+
+                self._entries.move_to_end(key)
+                return value
+
+    def set(self, key, value, ttl=None):
+        expires_at = None
+        if ttl is not None:
+            expires_at = time.monotonic() + ttl
+
+        with self._lock:
+            self._entries[key] = (value, expires_at)
+            self._entries.move_to_end(key)
+
+            while len(self._entries) > self.max_size:
+                self._entries.popitem(last=False)
+
+    def delete(self, key):
+        with self._lock:
+            self._entries.pop(key, None)
+
+    def clear(self):
+        with self._lock:
+            self._entries.clear()
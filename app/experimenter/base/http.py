@@ -0,0 +1,139 @@
+import os
+import random
+import threading
+import time
+
+import requests
+from django.conf import settings
+from urllib3.util.retry import Retry
+
+from experimenter.base.locks import get_redis_client
+
+RATE_LIMIT_BACKEND_REDIS = "redis"
+RATE_LIMIT_BACKEND_LOCAL = "local"
+
+# refills and reserves a token in one step, the bucket expires once it would
+# be full again so idle limiters don't linger in Redis
+RESERVE_SCRIPT = """
+redis.replicate_commands()
+local rate = tonumber(ARGV[1])
+local capacity = tonumber(ARGV[2])
+local time = redis.call("time")
+local now = tonumber(time[1]) + tonumber(time[2]) / 1000000
+local bucket = redis.call("hmget", KEYS[1], "tokens", "updated_at")
+local tokens = tonumber(bucket[1]) or capacity
+local updated_at = tonumber(bucket[2]) or now
+tokens = math.min(capacity, tokens + math.max(now - updated_at, 0) * rate) - 1
+redis.call("hmset", KEYS[1], "tokens", tostring(tokens), "updated_at", tostring(now))
+redis.call("pexpire", KEYS[1], math.ceil((capacity - tokens) / rate * 1000))
+if tokens < 0 then
+    return tostring(-tokens / rate)
+end
+return "0"
+"""
+
+
+class ProcessLocal(object):
+    """
+    Builds a client with factory on first use and shares it within the
+    process. Celery forks its workers after import, so a forked process
+    builds its own instead of sharing the parent's sockets.
+    """
+
+    def __init__(self, factory):
+        self.factory = factory
+        self._value = None
+        self._pid = None
+        self._lock = threading.Lock()
+
+    def get(self):
+        with self._lock:
+            if self._value is None or self._pid != os.getpid():
+                self._value = self.factory()
+                self._pid = os.getpid()
+
+            return self._value
+
+
+class JitteredRetry(Retry):
+    """
+    Spreads the exponential backoff uniformly between zero and its full value
+    so workers retrying the same outage don't hit a service in lockstep.
+    """
+
+    def get_backoff_time(self):
+        backoff = super().get_backoff_time()
+        return random.uniform(0, backoff) if backoff else 0
+
+
+class TimeoutSession(requests.Session):
+    """
+    A session that applies a default timeout to every request, which
+    requests itself has no setting for.
+    """
+
+    def __init__(self, timeout):
+        super().__init__()
+        self.timeout = timeout
+
+    def request(self, *args, **kwargs):
+        kwargs.setdefault("timeout", self.timeout)
+        return super().request(*args, **kwargs)
+
+
+class TokenBucket(object):
+    """
+    Allows bursts of up to capacity calls and refills at rate tokens per
+    second, acquire blocks until a token is available.
+    """
+
+    def __init__(self, rate, capacity):
+        self.rate = rate
+        self.capacity = capacity
+        self.tokens = capacity
+        self.updated_at = time.monotonic()
+        self._lock = threading.Lock()
+
+    def acquire(self):
+        with self._lock:
+            now = time.monotonic()
+            self.tokens = min(
+                self.capacity, self.tokens + (now - self.updated_at) * self.rate
+            )
+            self.updated_at = now
+            self.tokens -= 1
+            wait = -self.tokens / self.rate if self.tokens < 0 else 0
+
+        # the token is already reserved, so waiting outside the lock keeps
+        # later callers queued behind this one
+        if wait:
+            time.sleep(wait)
+        return wait
+
+
+class RedisTokenBucket(object):
+    """
+    The same bucket kept in Redis, so every worker process calling a service
+    shares one rate limit.
+    """
+
+    def __init__(self, client, name, rate, capacity):
+        self.client = client
+        self.name = name
+        self.rate = rate
+        self.capacity = capacity
+
+    def acquire(self):
+        reserve = self.client.register_script(RESERVE_SCRIPT)
+        wait = float(reserve(keys=[self.name], args=[self.rate, self.capacity]))
+
+        if wait:
+            time.sleep(wait)
+        return wait
+
+
+def get_rate_limiter(name, rate, capacity):
+    if settings.RATE_LIMIT_BACKEND == RATE_LIMIT_BACKEND_LOCAL:
+        return TokenBucket(rate, capacity)
+
+    return RedisTokenBucket(get_redis_client(), f"rate-limit:{name}", rate, capacity)
@@ -0,0 +1,180 @@
+import functools
+import logging
+import threading
+import time
+import uuid
+
+import markus
+import redis
+from django.conf import settings
+
+
+logger = logging.getLogger(__name__)
+metrics = markus.get_metrics("base.locks")
+
+TASK_LOCK_BACKEND_REDIS = "redis"
+TASK_LOCK_BACKEND_LOCAL = "local"
+
+# only the holder of the token may extend or release a lease
+RENEW_SCRIPT = """
+if redis.call("get", KEYS[1]) == ARGV[1] then
+    return redis.call("pexpire", KEYS[1], ARGV[2])
+end
+return 0
+"""
+RELEASE_SCRIPT = """
+if redis.call("get", KEYS[1]) == ARGV[1] then
+    return redis.call("del", KEYS[1])
+end
+return 0
+"""
+
+
+class RedisLock(object):
+    """
+    A lease on a Redis key that expires on its own if the worker holding it
+    dies, so a crashed run never blocks the task for longer than its ttl.
+    """
+
+    def __init__(self, client, name, ttl):
+        self.client = client
+        self.name = name
+        self.ttl = ttl
+        self.token = uuid.uuid4().hex
+
+    def acquire(self):
+        return bool(
+            self.client.set(self.name, self.token, nx=True, px=int(self.ttl * 1000))
+        )
+
+    def renew(self):
+        renew = self.client.register_script(RENEW_SCRIPT)
+        return bool(renew(keys=[self.name], args=[self.token, int(self.ttl * 1000)]))
+
+    def release(self):
+        release = self.client.register_script(RELEASE_SCRIPT)
+        release(keys=[self.name], args=[self.token])
+
+
+class LocalLock(object):
+    """
+    The same lease held in process memory, for tests and single process
+    deployments without a Redis broker.
+    """
+
+    leases = {}
+    leases_lock = threading.Lock()
+
+    def __init__(self, name, ttl):
+        self.name = name
+        self.ttl = ttl
+        self.token = uuid.uuid4().hex
+
+    def acquire(self):
+        with self.leases_lock:
+            lease = self.leases.get(self.name)
+            if lease is not None and lease[1] > time.monotonic():
+                return False
+
+            self.leases[self.name] = (self.token, time.monotonic() + self.ttl)
+            return True
+
+    def renew(self):
+        with self.leases_lock:
+            lease = self.leases.get(self.name)
+            if lease is None or lease[0] != self.token:
+                return False
+
+            self.leases[self.name] = (self.token, time.monotonic() + self.ttl)
+            return True
+
+    def release(self):
+        with self.leases_lock:
+            lease = self.leases.get(self.name)
+            if lease is not None and lease[0] == self.token:
+                del self.leases[self.name]
+
+
+_client = None
+_client_lock = threading.Lock()
+
+
+def get_redis_client():
+    # redis-py reconnects its pool after a fork, so one client per process
+    # can be built lazily and shared
+    global _client
+
+    with _client_lock:
+        if _client is None:
+            _client = redis.Redis.from_url(settings.TASK_LOCK_URL)
+
+        return _client
+
+
+def get_lock(name, ttl):
+    if settings.TASK_LOCK_BACKEND == TASK_LOCK_BACKEND_LOCAL:
+        return LocalLock(name, ttl)
+
+    return RedisLock(get_redis_client(), name, ttl)
+
+
+def renew_lease(lock, stopped):
+    # renew well before the lease runs out, a run that outlives its lease
+    # could otherwise overlap with the next one
+    while not stopped.wait(lock.ttl / 3):
+        if not lock.renew():
+            logger.warning(f"Lost task lock {lock.name}")
+            metrics.incr("lost")
+            return
+
+
+def task_lock(key=None, ttl=None, retry=False):
+    """
+    Runs the decorated task on at most one worker at a time. A run that
+    finds the lock held is skipped and counted, and the lease is renewed in
+    the background for as long as the task runs.
+
+    key builds a suffix from the task arguments, to lock per argument
+    instead of per task.
+
+    retry is for tasks whose runs must not be dropped, a run that finds the
+    lock held is retried after TASK_LOCK_RETRY_DELAY instead of skipped.
+    The task must be bound, key is given its arguments without the task.
+    """
+
+    def decorator(func):
+        @functools.wraps(func)
+        def wrapper(*args, **kwargs):
+            task_args = args[1:] if retry else args
+
+            name = f"task-lock:{func.__module__}.{func.__name__}"
+            if key is not None:
+                name = f"{name}:{key(*task_args, **kwargs)}"
+
+            lock = get_lock(name, ttl or settings.TASK_LOCK_TTL)
+
+            if not lock.acquire():
+                if retry:
+                    logger.info(f"Retrying {func.__name__}, a previous run holds {name}")
+                    metrics.incr(f"{func.__name__}.retried")
+                    raise args[0].retry(countdown=settings.TASK_LOCK_RETRY_DELAY)
+
+                logger.info(f"Skipping {func.__name__}, a previous run holds {name}")
+                metrics.incr(f"{func.__name__}.skipped")
+                return
+
+            stopped = threading.Event()
+            renewer = threading.Thread(target=renew_lease, args=(lock, stopped))
+            renewer.daemon = True
+            renewer.start()
+
+            try:
+                return func(*args, **kwargs)
+            finally:
+                stopped.set()
+                renewer.join()
+                lock.release()
+
+        return wrapper
+
+    return decorator
@@ -0,0 +1,139 @@
+import datetime
+import time
+
+from django.contrib.auth import get_user_model
+from django.core.management.base import BaseCommand
+from django.db import connection, transaction
+from django.db.models import Max
+from django.test.utils import CaptureQueriesContext
+from django.utils import timezone
+
+from experimenter.experiments.models import Experiment, ExperimentChangeLog
+
+
+class Rollback(Exception):
+    pass
+
+
+class Command(BaseCommand):
+    help = (
+        "Compares the stored latest_change column against the Max() change log "
+        "annotation it replaced, and measures what keeping it up to date adds "
+        "to experiment and change log saves, on a generated dataset that is "
+        "rolled back"
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument("--num_of_experiments", default=50000, type=int)
+        parser.add_argument("--changes_per_experiment", default=20, type=int)
+        parser.add_argument("--repeat", default=5, type=int)
+
+    def handle(self, *args, **options):
+        try:
+            with transaction.atomic():
+                self.generate_data(options)
+                self.run_benchmarks(options)
+                self.run_write_benchmarks(options)
+                raise Rollback()
+        except Rollback:
+            pass
+
+    def generate_data(self, options):
+        user, _ = get_user_model().objects.get_or_create(
+            email="benchmark@example.com", username="benchmark@example.com"
+        )
+        now = timezone.now()
+        num_of_changes = options["changes_per_experiment"]
+
+        experiments = Experiment.objects.bulk_create(
+            [
+                Experiment(
+                    name=f"Benchmark Experiment {i}",
+                    slug=f"benchmark-experiment-{i}",
+                    latest_change=now - datetime.timedelta(minutes=i),
+                )
+                for i in range(options["num_of_experiments"])
+            ],
+            batch_size=1000,
+        )
+
+        changes = (
+            ExperimentChangeLog(
+                experiment=experiment,
+                changed_by=user,
+                changed_on=experiment.latest_change - datetime.timedelta(days=j),
+                new_status=Experiment.STATUS_DRAFT,
+            )
+            for experiment in experiments
+            for j in range(num_of_changes)
+        )
+        ExperimentChangeLog.objects.bulk_create(changes, batch_size=5000)
+
+        self.stdout.write(
+            f"Generated {len(experiments)} experiments with "
+            f"{len(experiments) * num_of_changes} change log rows"
+        )
+
+    def run_benchmarks(self, options):
+        slug = "benchmark-experiment-{}".format(options["num_of_experiments"] // 2)
+        annotated = Experiment.objects.annotate(
+            annotated_latest_change=Max("changes__changed_on")
+        )
+
+        benchmarks = (
+            (
+                "List ordering (annotated)",
+                lambda: list(annotated.order_by("-annotated_latest_change")[:50]),
+            ),
+            (
+                "List ordering (stored)",
+                lambda: list(Experiment.objects.order_by("-latest_change")[:50]),
+            ),
+            ("Slug lookup (annotated)", lambda: annotated.get(slug=slug)),
+            ("Slug lookup (stored)", lambda: Experiment.objects.get(slug=slug)),
+        )
+
+        self.report(benchmarks, options["repeat"])
+
+    def run_write_benchmarks(self, options):
+        # the stored column is refreshed on every save, the lifecycle refresh
+        # is the aggregate and filter that adds to Experiment.save(), the
+        # change log save runs them again followed by an UPDATE
+        experiment = Experiment.objects.get(
+            slug="benchmark-experiment-{}".format(options["num_of_experiments"] // 2)
+        )
+        user = get_user_model().objects.get(email="benchmark@example.com")
+
+        benchmarks = (
+            ("Lifecycle refresh", experiment._set_lifecycle_dates),
+            ("Experiment save", experiment.save),
+            (
+                "Change log save",
+                lambda: ExperimentChangeLog.objects.create(
+                    experiment=experiment,
+                    changed_by=user,
+                    new_status=Experiment.STATUS_DRAFT,
+                ),
+            ),
+        )
+
+        self.report(benchmarks, options["repeat"])
+
+    def report(self, benchmarks, repeat):
+        for name, query in benchmarks:
+            timings = []
+            with CaptureQueriesContext(connection) as queries:
+                for i in range(repeat):
+                    start = time.perf_counter()
+                    query()
+                    timings.append(time.perf_counter() - start)
+
+            self.stdout.write(
+                "{name}: best {best:.2f}ms, mean {mean:.2f}ms, {queries:.0f} "
+                "queries".format(
+                    name=name,
+                    best=min(timings) * 1000,
+                    mean=sum(timings) / len(timings) * 1000,
+                    queries=len(queries) / repeat,
+                )
+            )
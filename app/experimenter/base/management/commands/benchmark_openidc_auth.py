@@ -0,0 +1,93 @@
+import time
+
+from django.conf import settings
+from django.contrib.auth import get_user_model
+from django.core.management.base import BaseCommand
+from django.db import connection
+from django.http import HttpResponse
+from django.test import RequestFactory
+from django.test.utils import CaptureQueriesContext
+from django.urls import Resolver404, resolve
+
+from experimenter.openidc.middleware import OpenIDCAuthMiddleware, user_cache
+
+
+class Command(BaseCommand):
+    help = (
+        "Runs a synthetic request loop through OpenIDCAuthMiddleware with a "
+        "cold and a warm user cache, and compares the whitelist matcher with "
+        "resolving every path"
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument("--num_of_users", default=20, type=int)
+        parser.add_argument("--requests", default=5000, type=int)
+
+    def handle(self, *args, **options):
+        User = get_user_model()
+        emails = [f"benchmark-{i}@example.com" for i in range(options["num_of_users"])]
+        factory = RequestFactory()
+        requests = [
+            factory.get(
+                "/api/v3/experiments/",
+                **{settings.OPENIDC_EMAIL_HEADER: emails[i % len(emails)]},
+            )
+            for i in range(options["requests"])
+        ]
+        paths = [
+            "/api/v1/experiments/",
+            "/api/v1/experiments/benchmark-experiment/recipe/",
+            "/api/v3/experiments/",
+            "/experiments/benchmark-experiment/",
+        ] * (options["requests"] // 4)
+
+        middleware = OpenIDCAuthMiddleware(lambda request: HttpResponse())
+
+        try:
+            self.run_requests("Auth (cold cache)", middleware, requests, user_cache.clear)
+            self.run_requests("Auth (warm cache)", middleware, requests, lambda: None)
+        finally:
+            User.objects.filter(username__in=emails).delete()
+
+        self.run_paths("Whitelist (resolve)", paths, self.resolve_whitelisted)
+        self.run_paths("Whitelist (matcher)", paths, middleware.whitelist.match)
+
+    def run_requests(self, name, middleware, requests, before_request):
+        # one untimed pass creates the users and, for the warm run, fills
+        # the cache
+        for request in requests:
+            middleware(request)
+
+        with CaptureQueriesContext(connection) as queries:
+            start = time.perf_counter()
+            for request in requests:
+                before_request()
+                middleware(request)
+            elapsed = time.perf_counter() - start
+
+        self.stdout.write(
+            "{name}: {per_request:.3f}ms, {queries:.2f} queries per request".format(
+                name=name,
+                per_request=elapsed / len(requests) * 1000,
+                queries=len(queries) / len(requests),
+            )
+        )
+
+    def run_paths(self, name, paths, is_whitelisted):
+        start = time.perf_counter()
+        for path in paths:
+            is_whitelisted(path)
+        elapsed = time.perf_counter() - start
+
+        self.stdout.write(
+            "{name}: {per_path:.4f}ms per path".format(
+                name=name, per_path=elapsed / len(paths) * 1000
+            )
+        )
+
+    @staticmethod
+    def resolve_whitelisted(path):
+        try:
+            return resolve(path).url_name in settings.OPENIDC_AUTH_WHITELIST
+        except Resolver404:
+            return False
@@ -0,0 +1,72 @@
+import signal
+import subprocess
+import sys
+import time
+
+from django.conf import settings
+from django.core.management.base import BaseCommand, CommandError
+
+
+class Command(BaseCommand):
+    help = (
+        "Runs one Celery worker per queue, each with that queue's configured "
+        "concurrency, and stops them all when any of them exits"
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            "--queues",
+            default=",".join(settings.WORKER_QUEUE_CONCURRENCY),
+            help="Comma separated queues to consume, defaults to all of them",
+        )
+        parser.add_argument("--loglevel", default="info")
+
+    def handle(self, *args, **options):
+        queues = [
+            queue.strip() for queue in options["queues"].split(",") if queue.strip()
+        ]
+
+        unknown = set(queues) - set(settings.WORKER_QUEUE_CONCURRENCY)
+        if unknown:
+            raise CommandError(f"Unknown queues: {', '.join(sorted(unknown))}")
+
+        workers = [
+            subprocess.Popen(self.get_worker_command(queue, options["loglevel"]))
+            for queue in queues
+        ]
+
+        def stop(signum, frame):
+            for worker in workers:
+                if worker.poll() is None:
+                    worker.send_signal(signum)
+
+        signal.signal(signal.SIGTERM, stop)
+        signal.signal(signal.SIGINT, stop)
+
+        while all(worker.poll() is None for worker in workers):
+            time.sleep(1)
+
+        stop(signal.SIGTERM, None)
+        returncode = max(worker.wait() for worker in workers)
+
+        if returncode:
+            raise CommandError(f"Worker exited with {returncode}")
+
+    @staticmethod
+    def get_worker_command(queue, loglevel):
+        return [
+            sys.executable,
+            "-m",
+            "celery",
+            "-A",
+            "experimenter",
+            "worker",
+            "--queues",
+            queue,
+            "--concurrency",
+            str(settings.WORKER_QUEUE_CONCURRENCY[queue]),
+            "--hostname",
+            f"{queue}@%h",
+            "--loglevel",
+            loglevel,
+        ]
@@ -0,0 +1,29 @@
+import logging
+
+from django.core.management.base import BaseCommand
+
+from experimenter.experiments.models import Experiment
+
+
+logger = logging.getLogger()
+
+
+class Command(BaseCommand):
+    help = "Backfills the stored start, enrollment end and end dates of experiments"
+
+    def add_arguments(self, parser):
+        parser.add_argument("--chunk_size", default=500, type=int)
+
+    def handle(self, *args, **options):
+        self.update_experiment_dates(options)
+
+    @staticmethod
+    def update_experiment_dates(options):
+        experiments = Experiment.objects.all().order_by("id")
+
+        for experiment in experiments.iterator(chunk_size=options["chunk_size"]):
+            experiment.update_lifecycle_dates()
+
+        logger.info(
+            "Updated dates for {count} experiments".format(count=experiments.count())
+        )
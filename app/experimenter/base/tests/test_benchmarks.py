@@ -0,0 +1,40 @@
+from io import StringIO
+
+from django.core.management import call_command
+from django.contrib.auth import get_user_model
+from django.test import TestCase
+
+from experimenter.experiments.models import Experiment, ExperimentChangeLog
+
+
+class TestBenchmarkLatestChange(TestCase):
+    def test_benchmark_reports_timings_and_rolls_back(self):
+        out = StringIO()
+
+        call_command(
+            "benchmark_latest_change",
+            num_of_experiments=10,
+            changes_per_experiment=3,
+            repeat=1,
+            stdout=out,
+        )
+
+        output = out.getvalue()
+        self.assertIn("Generated 10 experiments with 30 change log rows", output)
+        self.assertIn("List ordering (stored)", output)
+        self.assertIn("Slug lookup (annotated)", output)
+        self.assertFalse(Experiment.objects.exists())
+        self.assertFalse(ExperimentChangeLog.objects.exists())
+
+
+class TestBenchmarkOpenIDCAuth(TestCase):
+    def test_benchmark_reports_timings_and_removes_users(self):
+        out = StringIO()
+
+        call_command("benchmark_openidc_auth", num_of_users=2, requests=8, stdout=out)
+
+        output = out.getvalue()
+        self.assertIn("Auth (cold cache)", output)
+        self.assertIn("Auth (warm cache)", output)
+        self.assertIn("Whitelist (matcher)", output)
+        self.assertFalse(get_user_model().objects.exists())
@@ -0,0 +1,98 @@
+import pickle
+
+import mock
+from django.test import TestCase
+
+from experimenter.base.cache import LocalLRUCache, RedisCache
+
+
+class TestRedisCache(TestCase):
+    def setUp(self):
+        mock_redis_patcher = mock.patch("experimenter.base.cache.redis.Redis")
+        self.mock_redis = mock_redis_patcher.start()
+        self.addCleanup(mock_redis_patcher.stop)
+        self.client = self.mock_redis.from_url.return_value
+
+        self.cache = RedisCache("redis://localhost:6379/1", {"TIMEOUT": 60})
+
+    def test_connects_to_location(self):
+        self.mock_redis.from_url.assert_called_with("redis://localhost:6379/1")
+
+    def test_get_unpickles_stored_value(self):
+        self.client.get.return_value = pickle.dumps({"a": 1})
+        self.assertEqual(self.cache.get("key"), {"a": 1})
+        self.client.get.assert_called_with(":1:key")
+
+    def test_get_returns_default_for_missing_key(self):
+        self.client.get.return_value = None
+        self.assertEqual(self.cache.get("key", "default"), "default")
+
+    def test_set_pickles_value_with_default_timeout(self):
+        self.cache.set("key", b"value")
+        self.client.set.assert_called_with(
+            ":1:key", pickle.dumps(b"value", pickle.HIGHEST_PROTOCOL), ex=60, nx=False
+        )
+
+    def test_set_without_timeout_does_not_expire(self):
+        self.cache.set("key", b"value", timeout=None)
+        self.assertIsNone(self.client.set.call_args[1]["ex"])
+
+    def test_set_with_zero_timeout_deletes_key(self):
+        self.cache.set("key", b"value", timeout=0)
+        self.client.set.assert_not_called()
+        self.client.delete.assert_called_with(":1:key")
+
+    def test_add_only_sets_missing_key(self):
+        self.client.set.return_value = None
+        self.assertFalse(self.cache.add("key", b"value"))
+        self.assertTrue(self.client.set.call_args[1]["nx"])
+
+    def test_touch_updates_expiry(self):
+        self.cache.touch("key", 30)
+        self.client.expire.assert_called_with(":1:key", 30)
+
+        self.cache.touch("key", None)
+        self.client.persist.assert_called_with(":1:key")
+
+    def test_delete_and_clear(self):
+        self.client.delete.return_value = 1
+        self.assertTrue(self.cache.delete("key"))
+        self.client.delete.assert_called_with(":1:key")
+
+        self.cache.clear()
+        self.client.flushdb.assert_called_once_with()
+
+
+class TestLocalLRUCache(TestCase):
+    def test_evicts_least_recently_used_entry(self):
+        cache = LocalLRUCache(2)
+        cache.set("a", 1)
+        cache.set("b", 2)
+        cache.get("a")
+        cache.set("c", 3)
+
+        self.assertEqual(cache.get("a"), 1)
+        self.assertIsNone(cache.get("b"))
+        self.assertEqual(cache.get("c"), 3)
+
+    @mock.patch("experimenter.base.cache.time.monotonic")
+    def test_expires_entries_after_ttl(self, mock_monotonic):
+        mock_monotonic.return_value = 100
+        cache = LocalLRUCache(2)
+        cache.set("a", False, ttl=10)
+        cache.set("b", True)
+
+        mock_monotonic.return_value = 109
+        self.assertFalse(cache.get("a"))
+
+        mock_monotonic.return_value = 110
+        self.assertIsNone(cache.get("a"))
+        self.assertTrue(cache.get("b"))
+
+    def test_delete_drops_entry(self):
+        cache = LocalLRUCache(2)
+        cache.set("a", 1)
+        cache.delete("a")
+        cache.delete("missing")
+
+        self.assertIsNone(cache.get("a"))
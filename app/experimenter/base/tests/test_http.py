@@ -0,0 +1,102 @@
+import mock
+from django.conf import settings
+from django.test import TestCase, override_settings
+
+from experimenter.base import http
+from experimenter.base.http import ProcessLocal, RedisTokenBucket, TokenBucket
+
+
+class TestProcessLocal(TestCase):
+    def test_builds_once_per_process(self):
+        factory = mock.Mock(side_effect=lambda: object())
+        local = ProcessLocal(factory)
+
+        value = local.get()
+        self.assertIs(local.get(), value)
+
+        with mock.patch("experimenter.base.http.os.getpid", return_value=-1):
+            forked_value = local.get()
+            self.assertIs(local.get(), forked_value)
+
+        self.assertIsNot(forked_value, value)
+        self.assertEqual(factory.call_count, 2)
+
+
+class TestTokenBucket(TestCase):
+    def setUp(self):
+        mock_monotonic_patcher = mock.patch("experimenter.base.http.time.monotonic")
+        self.mock_monotonic = mock_monotonic_patcher.start()
+        self.addCleanup(mock_monotonic_patcher.stop)
+        self.mock_monotonic.return_value = 100
+
+        mock_sleep_patcher = mock.patch("experimenter.base.http.time.sleep")
+        self.mock_sleep = mock_sleep_patcher.start()
+        self.addCleanup(mock_sleep_patcher.stop)
+
+    def test_allows_burst_up_to_capacity(self):
+        bucket = TokenBucket(2, 3)
+
+        for i in range(3):
+            self.assertEqual(bucket.acquire(), 0)
+
+        self.mock_sleep.assert_not_called()
+
+    def test_waits_for_refill_once_empty(self):
+        bucket = TokenBucket(2, 1)
+        bucket.acquire()
+
+        self.assertEqual(bucket.acquire(), 0.5)
+        self.assertEqual(bucket.acquire(), 1)
+        self.mock_sleep.assert_called_with(1)
+
+    def test_refills_over_time_up_to_capacity(self):
+        bucket = TokenBucket(2, 2)
+        bucket.acquire()
+        bucket.acquire()
+
+        self.mock_monotonic.return_value = 200
+        self.assertEqual(bucket.acquire(), 0)
+        self.assertEqual(bucket.acquire(), 0)
+        self.assertEqual(bucket.acquire(), 0.5)
+
+
+class TestRedisTokenBucket(TestCase):
+    def setUp(self):
+        self.client = mock.Mock()
+        self.reserve = self.client.register_script.return_value
+        self.bucket = RedisTokenBucket(self.client, "name", 2, 3)
+
+        mock_sleep_patcher = mock.patch("experimenter.base.http.time.sleep")
+        self.mock_sleep = mock_sleep_patcher.start()
+        self.addCleanup(mock_sleep_patcher.stop)
+
+    def test_reserves_token_in_redis(self):
+        self.reserve.return_value = b"0"
+
+        self.assertEqual(self.bucket.acquire(), 0)
+        self.client.register_script.assert_called_with(http.RESERVE_SCRIPT)
+        self.reserve.assert_called_with(keys=["name"], args=[2, 3])
+        self.mock_sleep.assert_not_called()
+
+    def test_waits_for_reserved_token(self):
+        self.reserve.return_value = b"0.5"
+
+        self.assertEqual(self.bucket.acquire(), 0.5)
+        self.mock_sleep.assert_called_with(0.5)
+
+
+class TestGetRateLimiter(TestCase):
+    @override_settings(RATE_LIMIT_BACKEND=http.RATE_LIMIT_BACKEND_LOCAL)
+    def test_local_backend_limits_process(self):
+        self.assertIsInstance(http.get_rate_limiter("name", 2, 3), TokenBucket)
+
+    @override_settings(RATE_LIMIT_BACKEND=http.RATE_LIMIT_BACKEND_REDIS)
+    def test_redis_backend_shares_bucket_on_task_lock_redis(self):
+        with mock.patch("experimenter.base.locks._client", None), mock.patch(
+            "experimenter.base.locks.redis.Redis"
+        ) as mock_redis:
+            limiter = http.get_rate_limiter("name", 2, 3)
+
+        mock_redis.from_url.assert_called_once_with(settings.TASK_LOCK_URL)
+        self.assertIsInstance(limiter, RedisTokenBucket)
+        self.assertEqual(limiter.name, "rate-limit:name")
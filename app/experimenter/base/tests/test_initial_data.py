@@ -22,3 +22,17 @@ class TestInitialData(TestCase):
         self.assertEqual(
             Experiment.objects.filter(status=ExperimentConstants.STATUS_DRAFT).count(), 20
         )
+
+    def test_update_experiment_dates(self):
+        call_command("load_dummy_experiments", num_of_experiments=5)
+        fields = ("id",) + Experiment.LIFECYCLE_DATE_FIELDS
+        expected_dates = list(Experiment.objects.order_by("id").values(*fields))
+        Experiment.objects.update(
+            start_date=None, enrollment_end_date=None, end_date=None
+        )
+
+        call_command("update_experiment_dates", chunk_size=2)
+
+        self.assertEqual(
+            list(Experiment.objects.order_by("id").values(*fields)), expected_dates
+        )
@@ -0,0 +1,160 @@
+import threading
+
+import mock
+from django.conf import settings
+from django.test import TestCase, override_settings
+from markus.testing import MetricsMock
+
+from experimenter.base import locks
+from experimenter.base.locks import LocalLock, RedisLock, task_lock
+
+
+class TestLocalLock(TestCase):
+    def tearDown(self):
+        LocalLock.leases.clear()
+
+    def test_only_one_holder_at_a_time(self):
+        lock = LocalLock("name", 60)
+        other = LocalLock("name", 60)
+
+        self.assertTrue(lock.acquire())
+        self.assertFalse(other.acquire())
+
+        lock.release()
+        self.assertTrue(other.acquire())
+
+    @mock.patch("experimenter.base.locks.time.monotonic")
+    def test_expired_lease_can_be_taken_over(self, mock_monotonic):
+        mock_monotonic.return_value = 100
+        lock = LocalLock("name", 60)
+        other = LocalLock("name", 60)
+        lock.acquire()
+
+        mock_monotonic.return_value = 161
+        self.assertTrue(other.acquire())
+        self.assertFalse(lock.renew())
+
+        lock.release()
+        self.assertIn("name", LocalLock.leases)
+
+    @mock.patch("experimenter.base.locks.time.monotonic")
+    def test_renew_extends_lease(self, mock_monotonic):
+        mock_monotonic.return_value = 100
+        lock = LocalLock("name", 60)
+        lock.acquire()
+
+        mock_monotonic.return_value = 150
+        self.assertTrue(lock.renew())
+
+        mock_monotonic.return_value = 200
+        self.assertFalse(LocalLock("name", 60).acquire())
+
+
+class TestRedisLock(TestCase):
+    def setUp(self):
+        self.client = mock.Mock()
+        self.lock = RedisLock(self.client, "name", 60)
+
+    def test_acquire_sets_key_with_expiry_if_missing(self):
+        self.client.set.return_value = True
+        self.assertTrue(self.lock.acquire())
+        self.client.set.assert_called_with("name", self.lock.token, nx=True, px=60000)
+
+        self.client.set.return_value = None
+        self.assertFalse(self.lock.acquire())
+
+    def test_renew_and_release_check_token(self):
+        script = self.client.register_script.return_value
+        script.return_value = 1
+
+        self.assertTrue(self.lock.renew())
+        self.client.register_script.assert_called_with(locks.RENEW_SCRIPT)
+        script.assert_called_with(keys=["name"], args=[self.lock.token, 60000])
+
+        self.lock.release()
+        self.client.register_script.assert_called_with(locks.RELEASE_SCRIPT)
+        script.assert_called_with(keys=["name"], args=[self.lock.token])
+
+
+@override_settings(TASK_LOCK_BACKEND=locks.TASK_LOCK_BACKEND_LOCAL, TASK_LOCK_TTL=60)
+class TestTaskLock(TestCase):
+    def tearDown(self):
+        LocalLock.leases.clear()
+
+    def test_overlapping_run_is_skipped(self):
+        started = threading.Event()
+        finish = threading.Event()
+        calls = []
+
+        @task_lock()
+        def task(value):
+            calls.append(value)
+            started.set()
+            finish.wait(5)
+            return value
+
+        thread = threading.Thread(target=task, args=(1,))
+        thread.start()
+        started.wait(5)
+
+        with MetricsMock() as mm:
+            self.assertIsNone(task(2))
+            mm.assert_incr_once("base.locks.task.skipped")
+
+        finish.set()
+        thread.join()
+
+        self.assertEqual(calls, [1])
+        self.assertEqual(task(3), 3)
+
+    def test_lock_is_released_when_task_fails(self):
+        @task_lock()
+        def task():
+            raise ValueError()
+
+        with self.assertRaises(ValueError):
+            task()
+
+        self.assertEqual(LocalLock.leases, {})
+
+    def test_key_locks_per_argument(self):
+        names = []
+
+        @task_lock(key=lambda experiment_id: experiment_id)
+        def task(experiment_id):
+            names.extend(LocalLock.leases)
+
+        task(1)
+        task(2)
+
+        self.assertEqual(
+            names,
+            [
+                f"task-lock:{__name__}.task:1",
+                f"task-lock:{__name__}.task:2",
+            ],
+        )
+
+    def test_lease_is_renewed_while_task_runs(self):
+        with mock.patch.object(LocalLock, "renew", return_value=True) as mock_renew:
+
+            @task_lock(ttl=0.03)
+            def task():
+                for i in range(100):
+                    if mock_renew.call_count >= 2:
+                        break
+                    threading.Event().wait(0.01)
+
+            task()
+
+        self.assertGreaterEqual(mock_renew.call_count, 2)
+
+    @override_settings(TASK_LOCK_BACKEND=locks.TASK_LOCK_BACKEND_REDIS)
+    def test_redis_backend_uses_task_lock_url(self):
+        with mock.patch("experimenter.base.locks._client", None), mock.patch(
+            "experimenter.base.locks.redis.Redis"
+        ) as mock_redis:
+            lock = locks.get_lock("name", 60)
+
+        mock_redis.from_url.assert_called_once_with(settings.TASK_LOCK_URL)
+        self.assertIsInstance(lock, RedisLock)
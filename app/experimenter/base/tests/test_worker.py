@@ -0,0 +1,125 @@
+import signal
+import sys
+
+import mock
+from django.conf import settings
+from django.core.management import call_command
+from django.core.management.base import CommandError
+from django.test import TestCase, override_settings
+
+from experimenter.bugzilla import tasks as bugzilla_tasks
+from experimenter.celery import app
+
+
+class TestTaskRoutes(TestCase):
+    def get_queue(self, task_name):
+        return app.amqp.router.route({}, task_name)["queue"].name
+
+    def test_integration_tasks_are_routed_to_their_own_queues(self):
+        self.assertEqual(
+            self.get_queue("experimenter.bugzilla.tasks.create_experiment_bug_task"),
+            "bugzilla",
+        )
+        self.assertEqual(
+            self.get_queue("experimenter.normandy.tasks.update_launched_experiments"),
+            "normandy",
+        )
+        self.assertEqual(
+            self.get_queue("experimenter.kinto.tasks.check_kinto_push_queue"), "kinto"
+        )
+        self.assertEqual(
+            self.get_queue(
+                "experimenter.experiments.tasks.send_period_ending_emails_task"
+            ),
+            "email",
+        )
+        self.assertEqual(self.get_queue("celery.backend_cleanup"), "celery")
+
+    def test_every_routed_queue_has_a_concurrency(self):
+        for route in settings.CELERY_TASK_ROUTES.values():
+            self.assertIn(route["queue"], settings.WORKER_QUEUE_CONCURRENCY)
+
+    def test_user_triggered_tasks_run_ahead_of_background_tasks(self):
+        for task in (
+            bugzilla_tasks.create_experiment_bug_task,
+            bugzilla_tasks.update_experiment_bug_task,
+            bugzilla_tasks.update_bug_resolution_task,
+        ):
+            self.assertEqual(task.priority, settings.TASK_PRIORITY_USER)
+
+        self.assertLess(settings.TASK_PRIORITY_USER, app.conf.task_default_priority)
+
+
+@override_settings(WORKER_QUEUE_CONCURRENCY={"bugzilla": 2, "kinto": 1})
+class TestRunWorker(TestCase):
+    def setUp(self):
+        popen_patcher = mock.patch(
+            "experimenter.base.management.commands.run_worker.subprocess.Popen"
+        )
+        self.mock_popen = popen_patcher.start()
+        self.addCleanup(popen_patcher.stop)
+
+        self.mock_worker = self.mock_popen.return_value
+        self.mock_worker.poll.return_value = 0
+        self.mock_worker.wait.return_value = 0
+
+        signal_patcher = mock.patch(
+            "experimenter.base.management.commands.run_worker.signal.signal"
+        )
+        signal_patcher.start()
+        self.addCleanup(signal_patcher.stop)
+
+    def get_worker_command(self, queue, concurrency):
+        return [
+            sys.executable,
+            "-m",
+            "celery",
+            "-A",
+            "experimenter",
+            "worker",
+            "--queues",
+            queue,
+            "--concurrency",
+            str(concurrency),
+            "--hostname",
+            f"{queue}@%h",
+            "--loglevel",
+            "info",
+        ]
+
+    def test_starts_a_capped_worker_per_chosen_queue(self):
+        call_command("run_worker", queues="kinto")
+
+        self.mock_popen.assert_called_once_with(self.get_worker_command("kinto", 1))
+
+    def test_starts_a_worker_for_every_queue_by_default(self):
+        call_command("run_worker")
+
+        self.assertEqual(
+            [call[0][0] for call in self.mock_popen.call_args_list],
+            [
+                self.get_worker_command("bugzilla", 2),
+                self.get_worker_command("kinto", 1),
+            ],
+        )
+
+    def test_unknown_queue_raises(self):
+        with self.assertRaises(CommandError):
+            call_command("run_worker", queues="bugzilla,unknown")
+
+        self.mock_popen.assert_not_called()
+
+    def test_remaining_workers_are_stopped_when_one_fails(self):
+        running = mock.Mock()
+        running.poll.return_value = None
+        running.wait.return_value = 0
+        failed = mock.Mock()
+        failed.poll.return_value = 1
+        failed.wait.return_value = 1
+        self.mock_popen.side_effect = [running, failed]
+
+        with self.assertRaises(CommandError):
+            call_command("run_worker", queues="bugzilla,kinto")
+
+        running.send_signal.assert_called_once_with(signal.SIGTERM)
+        failed.send_signal.assert_not_called()
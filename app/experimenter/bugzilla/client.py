@@ -3,6 +3,11 @@ import requests
 from urllib.parse import urlparse, parse_qs
 
 from django.conf import settings
+from requests.adapters import HTTPAdapter
+
+from experimenter.base.cache import LocalLRUCache
+from experimenter.base import http
+from experimenter.base.http import JitteredRetry, ProcessLocal, TimeoutSession
 
 INVALID_USER_ERROR_CODE = 51
 INVALID_PARAMETER_ERROR_CODE = 53
@@ -14,6 +19,69 @@ class BugzillaError(Exception):
     pass
 
 
+def build_session():
+    # only lookups are retried on server and read errors, writes are retried
+    # when the connection could not be established, so a bug or comment is
+    # never posted twice, and failed updates are retried by the update queue
+    retry = JitteredRetry(
+        total=settings.BUGZILLA_API_MAX_RETRIES,
+        backoff_factor=settings.BUGZILLA_API_BACKOFF_FACTOR,
+        status_forcelist=(500, 502, 503, 504),
+        method_whitelist=frozenset(["GET"]),
+        raise_on_status=False,
+    )
+    adapter = HTTPAdapter(
+        pool_connections=settings.BUGZILLA_API_POOL_SIZE,
+        pool_maxsize=settings.BUGZILLA_API_POOL_SIZE,
+        max_retries=retry,
+    )
+
+    session = TimeoutSession(
+        timeout=(
+            settings.BUGZILLA_API_CONNECT_TIMEOUT,
+            settings.BUGZILLA_API_READ_TIMEOUT,
+        )
+    )
+    session.mount("http://", adapter)
+    session.mount("https://", adapter)
+    return session
+
+
+_session = ProcessLocal(build_session)
+
+
+def get_session():
+    return _session.get()
+
+
+_rate_limiter = None
+
+
+def get_rate_limiter():
+    # calls from every worker process share one bucket, so the Bugzilla API
+    # sees the configured rate however many workers are running
+    global _rate_limiter
+
+    if _rate_limiter is None:
+        _rate_limiter = http.get_rate_limiter(
+            "bugzilla", settings.BUGZILLA_API_RATE_LIMIT, settings.BUGZILLA_API_RATE_BURST
+        )
+
+    return _rate_limiter
+
+
+# Existence answers for owners and feature bugs, negative ones are kept for
+# a shorter time so a newly created account or bug is picked up quickly
+user_cache = LocalLRUCache(settings.BUGZILLA_CACHE_SIZE)
+bug_cache = LocalLRUCache(settings.BUGZILLA_CACHE_SIZE)
+
+
+def cache_exists(cache, key, exists):
+    ttl = settings.BUGZILLA_CACHE_TTL if exists else settings.BUGZILLA_CACHE_NEGATIVE_TTL
+    cache.set(key, exists, ttl=ttl)
+    return exists
+
+
 def format_bug_body(experiment):
     bug_body = ""
     countries = "all"
@@ -73,24 +141,30 @@ def format_update_body(experiment):
 
 
 def update_experiment_bug(experiment):
-    body = format_update_body(experiment)
+    update_bug(experiment.bugzilla_id, format_update_body(experiment))
+
+
+def update_bug(bugzilla_id, data):
     make_bugzilla_call(
-        settings.BUGZILLA_UPDATE_URL.format(id=experiment.bugzilla_id),
-        requests.put,
-        data=body,
+        settings.BUGZILLA_UPDATE_URL.format(id=bugzilla_id), get_session().put, data=data
     )
 
 
 def user_exists(user):
+    exists = user_cache.get(user)
+    if exists is not None:
+        return exists
+
     try:
         response = make_bugzilla_call(
-            settings.BUGZILLA_USER_URL.format(email=user), requests.get
+            settings.BUGZILLA_USER_URL.format(email=user), get_session().get
         )
-        users = response["users"]
-        return len(users) == 1
-    except (BugzillaError, KeyError):
+    except BugzillaError:
         return False
 
+    users = response.get("users", [])
+    return cache_exists(user_cache, user, len(users) == 1)
+
 
 def format_resolution_body(experiment):
     if experiment.status == experiment.STATUS_COMPLETE:
@@ -102,15 +176,20 @@ def format_resolution_body(experiment):
 
 
 def bug_exists(bug_id):
+    exists = bug_cache.get(bug_id)
+    if exists is not None:
+        return exists
+
     try:
         response = make_bugzilla_call(
-            settings.BUGZILLA_BUG_URL.format(bug_id=bug_id), requests.get
+            settings.BUGZILLA_BUG_URL.format(bug_id=bug_id), get_session().get
         )
-        bugs = response["bugs"]
-        return len(bugs) == 1
-    except (BugzillaError, KeyError):
+    except BugzillaError:
         return False
 
+    bugs = response.get("bugs", [])
+    return cache_exists(bug_cache, bug_id, len(bugs) == 1)
+
 
 def update_bug_resolution(experiment):
     if experiment.bugzilla_id:
@@ -118,14 +197,19 @@ def update_bug_resolution(experiment):
         status_body = format_resolution_body(experiment)
         make_bugzilla_call(
             settings.BUGZILLA_UPDATE_URL.format(id=experiment.bugzilla_id),
-            requests.put,
+            get_session().put,
             status_body,
         )
 
 
 def make_bugzilla_call(url, method, data=None):
     try:
-        response = method(url, data)
+        get_rate_limiter().acquire()
+
+        if data is None:
+            response = method(url)
+        else:
+            response = method(url, data)
         return response.json()
     except requests.exceptions.RequestException as e:
         logging.exception("Error calling Bugzilla API: {}".format(e))
@@ -173,7 +257,7 @@ def create_experiment_bug(experiment):
         bug_data = format_normandy_experiment_request(experiment)
 
     response_data = make_bugzilla_call(
-        settings.BUGZILLA_CREATE_URL, requests.post, data=bug_data
+        settings.BUGZILLA_CREATE_URL, get_session().post, data=bug_data
     )
 
     if "id" not in response_data:
@@ -230,7 +314,9 @@ def set_bugzilla_id_value(bug_url):
 def add_experiment_comment(bugzilla_id, comment):
     comment_data = {"comment": comment}
     response_data = make_bugzilla_call(
-        settings.BUGZILLA_COMMENT_URL.format(id=bugzilla_id), requests.post, comment_data
+        settings.BUGZILLA_COMMENT_URL.format(id=bugzilla_id),
+        get_session().post,
+        comment_data,
     )
 
     return response_data["id"]
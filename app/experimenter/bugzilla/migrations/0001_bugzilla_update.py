@@ -0,0 +1,71 @@
+# Generated by Django 3.0.7 on 2026-10-18 04:06
+
+from django.conf import settings
+import django.contrib.postgres.fields.jsonb
+from django.db import migrations, models
+import django.db.models.deletion
+
+
+class Migration(migrations.Migration):
+
+    initial = True
+
+    dependencies = [
+        ("experiments", "0113_experiment_recipe_version"),
+        migrations.swappable_dependency(settings.AUTH_USER_MODEL),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name="BugzillaUpdate",
+            fields=[
+                (
+                    "id",
+                    models.AutoField(
+                        auto_created=True,
+                        primary_key=True,
+                        serialize=False,
+                        verbose_name="ID",
+                    ),
+                ),
+                ("bugzilla_id", models.CharField(db_index=True, max_length=255)),
+                (
+                    "action",
+                    models.CharField(
+                        choices=[
+                            ("update", "Update"),
+                            ("resolution", "Resolution"),
+                            ("complete_resolution", "Complete Resolution"),
+                            ("start_date_comment", "Start Date Comment"),
+                        ],
+                        max_length=255,
+                    ),
+                ),
+                ("fields", django.contrib.postgres.fields.jsonb.JSONField(default=dict)),
+                ("comment", models.TextField(blank=True)),
+                ("created_on", models.DateTimeField(auto_now_add=True)),
+                (
+                    "experiment",
+                    models.ForeignKey(
+                        on_delete=django.db.models.deletion.CASCADE,
+                        related_name="bugzilla_updates",
+                        to="experiments.Experiment",
+                    ),
+                ),
+                (
+                    "user",
+                    models.ForeignKey(
+                        blank=True,
+                        null=True,
+                        on_delete=django.db.models.deletion.CASCADE,
+                        to=settings.AUTH_USER_MODEL,
+                    ),
+                ),
+            ],
+            options={
+                "verbose_name": "Bugzilla Update",
+                "verbose_name_plural": "Bugzilla Updates",
+                "ordering": ("id",),
+            },
+        ),
+    ]
@@ -0,0 +1,18 @@
+# Generated by Django 3.0.7 on 2026-10-18 04:59
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ("bugzilla", "0001_bugzilla_update"),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name="bugzillaupdate",
+            name="attempts",
+            field=models.PositiveIntegerField(default=0),
+        ),
+    ]
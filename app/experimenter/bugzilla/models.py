@@ -0,0 +1,42 @@
+from django.conf import settings
+from django.contrib.postgres.fields import JSONField
+from django.db import models
+
+
+class BugzillaUpdate(models.Model):
+    ACTION_UPDATE = "update"
+    ACTION_RESOLUTION = "resolution"
+    ACTION_COMPLETE_RESOLUTION = "complete_resolution"
+    ACTION_START_DATE_COMMENT = "start_date_comment"
+    ACTION_CHOICES = (
+        (ACTION_UPDATE, "Update"),
+        (ACTION_RESOLUTION, "Resolution"),
+        (ACTION_COMPLETE_RESOLUTION, "Complete Resolution"),
+        (ACTION_START_DATE_COMMENT, "Start Date Comment"),
+    )
+
+    bugzilla_id = models.CharField(max_length=255, db_index=True)
+    experiment = models.ForeignKey(
+        "experiments.Experiment",
+        on_delete=models.CASCADE,
+        related_name="bugzilla_updates",
+    )
+    user = models.ForeignKey(
+        settings.AUTH_USER_MODEL, blank=True, null=True, on_delete=models.CASCADE
+    )
+    action = models.CharField(max_length=255, choices=ACTION_CHOICES)
+    fields = JSONField(default=dict)
+    comment = models.TextField(blank=True)
+    attempts = models.PositiveIntegerField(default=0)
+    created_on = models.DateTimeField(auto_now_add=True)
+
+    class Meta:
+        ordering = ("id",)
+        verbose_name = "Bugzilla Update"
+        verbose_name_plural = "Bugzilla Updates"
+
+    def __repr__(self):  # pragma: no cover
+        return f"<{self.__class__.__name__} {self.bugzilla_id} {self.action}>"
+
+    def __str__(self):
+        return f"{self.bugzilla_id}: {self.get_action_display()}"
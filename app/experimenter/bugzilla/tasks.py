@@ -1,8 +1,11 @@
 import markus
 from celery.utils.log import get_task_logger
+from django.conf import settings
+from django.db import transaction
 
 from experimenter.celery import app
 from experimenter.bugzilla import client as bugzilla
+from experimenter.bugzilla.models import BugzillaUpdate
 from experimenter.experiments.models import Experiment
 from experimenter.notifications.models import Notification
 
@@ -40,7 +43,7 @@ NOTIFICATION_MESSAGE_ARCHIVE_ERROR_MESSAGE = (
 )
 
 
-@app.task
+@app.task(priority=settings.TASK_PRIORITY_USER)
 @metrics.timer_decorator("create_experiment_bug.timing")
 def create_experiment_bug_task(user_id, experiment_id):
     metrics.incr("create_experiment_bug.started")
@@ -73,7 +76,159 @@ def create_experiment_bug_task(user_id, experiment_id):
         raise e
 
 
+# metric prefix, success and failure notification for each queued action
+BUGZILLA_UPDATE_ACTIONS = {
+    BugzillaUpdate.ACTION_UPDATE: (
+        "update_experiment_bug",
+        NOTIFICATION_MESSAGE_UPDATE_BUG,
+        NOTIFICATION_MESSAGE_UPDATE_BUG_FAILED,
+    ),
+    BugzillaUpdate.ACTION_RESOLUTION: (
+        "update_bug_resolution",
+        NOTIFICATION_MESSAGE_ARCHIVE_COMMENT,
+        NOTIFICATION_MESSAGE_ARCHIVE_ERROR_MESSAGE,
+    ),
+    BugzillaUpdate.ACTION_COMPLETE_RESOLUTION: (
+        "comp_experiment_update_res_task",
+        None,
+        None,
+    ),
+    BugzillaUpdate.ACTION_START_DATE_COMMENT: ("add_start_date_comment", None, None),
+}
+
+
+def queue_bugzilla_update(experiment, action, user_id=None, fields=None, comment=""):
+    BugzillaUpdate.objects.create(
+        bugzilla_id=experiment.bugzilla_id,
+        experiment=experiment,
+        user_id=user_id,
+        action=action,
+        fields=fields or {},
+        comment=comment,
+    )
+
+    if settings.BUGZILLA_COALESCE_WINDOW:
+        # every action schedules a flush, the first one to run after the
+        # window sends them all and the others find nothing left to send
+        flush_bugzilla_updates_task.apply_async(
+            (experiment.bugzilla_id,),
+            countdown=settings.BUGZILLA_COALESCE_WINDOW,
+            priority=settings.TASK_PRIORITY_USER if user_id else None,
+        )
+    else:
+        flush_bugzilla_updates_task(experiment.bugzilla_id)
+
+
 @app.task
+@metrics.timer_decorator("flush_bugzilla_updates.timing")
+def flush_bugzilla_updates_task(bugzilla_id):
+    metrics.incr("flush_bugzilla_updates.started")
+
+    # the rows stay locked until Bugzilla has answered, and only what was
+    # sent successfully is removed from the queue
+    with transaction.atomic():
+        updates = list(
+            BugzillaUpdate.objects.select_for_update(skip_locked=True)
+            .filter(bugzilla_id=bugzilla_id)
+            .select_related("experiment")
+        )
+
+        if not updates:
+            return
+
+        fields_error, comment_error = send_bugzilla_updates(bugzilla_id, updates)
+        retried = record_bugzilla_updates(updates, fields_error, comment_error)
+
+    if retried:
+        metrics.incr("flush_bugzilla_updates.retried", value=len(retried))
+        flush_bugzilla_updates_task.apply_async(
+            (bugzilla_id,), countdown=settings.BUGZILLA_UPDATE_RETRY_DELAY
+        )
+
+    metrics.incr("flush_bugzilla_updates.completed")
+
+    if fields_error or comment_error:
+        raise fields_error or comment_error
+
+
+def send_bugzilla_updates(bugzilla_id, updates):
+    # later field values win, comments are posted together
+    fields = {}
+    comments = []
+    for update in updates:
+        fields.update(update.fields)
+        if update.comment:
+            comments.append(update.comment)
+
+    metrics.incr("flush_bugzilla_updates.coalesced", value=len(updates) - 1)
+    logger.info(f"Sending {len(updates)} queued updates to Bugzilla bug {bugzilla_id}")
+
+    fields_error = None
+    if fields:
+        try:
+            bugzilla.update_bug(bugzilla_id, fields)
+            logger.info("Bugzilla Ticket updated")
+        except bugzilla.BugzillaError as e:
+            logger.info("Failed bugzilla update")
+            fields_error = e
+
+    comment_error = None
+    if comments:
+        try:
+            bugzilla.add_experiment_comment(bugzilla_id, "\n\n".join(comments))
+            logger.info("Bugzilla Comment Added")
+        except bugzilla.BugzillaError as e:
+            logger.info("Bugzilla comment failed to be added")
+            comment_error = e
+
+    return fields_error, comment_error
+
+
+def record_bugzilla_updates(updates, fields_error, comment_error):
+    retried = []
+    finished = []
+
+    for update in updates:
+        # drop the parts that were sent, so a retry doesn't post a comment
+        # twice when only the field update failed
+        if fields_error is None:
+            update.fields = {}
+        if comment_error is None:
+            update.comment = ""
+
+        if update.fields or update.comment:
+            update.attempts += 1
+
+            if update.attempts < settings.BUGZILLA_UPDATE_MAX_ATTEMPTS:
+                retried.append(update)
+                continue
+
+        finished.append(update)
+
+    BugzillaUpdate.objects.bulk_update(retried, ["fields", "comment", "attempts"])
+    BugzillaUpdate.objects.filter(id__in=[update.id for update in finished]).delete()
+
+    # users hear about an update once it was sent or given up on
+    for update in finished:
+        metric, success_message, failure_message = BUGZILLA_UPDATE_ACTIONS[update.action]
+
+        if update.fields or update.comment:
+            metrics.incr(f"{metric}.failed")
+            message = failure_message
+        else:
+            metrics.incr(f"{metric}.completed")
+            message = success_message
+
+        if update.user_id and message:
+            Notification.objects.create(
+                user_id=update.user_id,
+                message=message.format(bug_url=update.experiment.bugzilla_url),
+            )
+
+    return retried
+
+
+@app.task(priority=settings.TASK_PRIORITY_USER)
 @metrics.timer_decorator("update_experiment_bug.timing")
 def update_experiment_bug_task(user_id, experiment_id):
     metrics.incr("update_experiment_bug.started")
@@ -84,26 +239,17 @@ def update_experiment_bug_task(user_id, experiment_id):
         logger.info("Skipping Bugzilla update for internal only experiment")
         return
 
-    logger.info("Updating Bugzilla Ticket")
+    if not experiment.bugzilla_id:
+        logger.info("Skipping Bugzilla update for experiment without a ticket")
+        return
 
-    try:
-        bugzilla.update_experiment_bug(experiment)
-        logger.info("Bugzilla Ticket updated")
-        Notification.objects.create(
-            user_id=user_id,
-            message=NOTIFICATION_MESSAGE_UPDATE_BUG.format(
-                bug_url=experiment.bugzilla_url
-            ),
-        )
-        metrics.incr("update_experiment_bug.completed")
-        logger.info("Bugzilla Update notification sent")
-    except bugzilla.BugzillaError as e:
-        Notification.objects.create(
-            user_id=user_id, message=NOTIFICATION_MESSAGE_UPDATE_BUG_FAILED
-        )
-        metrics.incr("update_experiment_bug.failed")
-        logger.info("Failed bugzilla update")
-        raise e
+    logger.info("Queueing Bugzilla Ticket update")
+    queue_bugzilla_update(
+        experiment,
+        BugzillaUpdate.ACTION_UPDATE,
+        user_id=user_id,
+        fields=bugzilla.format_update_body(experiment),
+    )
 
 
 @app.task
@@ -111,15 +257,17 @@ def update_experiment_bug_task(user_id, experiment_id):
 def comp_experiment_update_res_task(experiment_id):
     experiment = Experiment.objects.get(id=experiment_id)
     metrics.incr("comp_experiment_update_res_task.started")
-    logger.info("Updating Bugzilla Resolution")
-    try:
-        bugzilla.update_bug_resolution(experiment)
-        logger.info("Bugzilla Resolution Updated")
-        metrics.incr("comp_experiment_update_res_task.completed")
-    except bugzilla.BugzillaError as e:
-        metrics.incr("comp_experiment_update_res_task.failed")
-        logger.info("update bug resolution failed")
-        raise e
+
+    if not experiment.bugzilla_id:
+        logger.info("Skipping Bugzilla resolution for experiment without a ticket")
+        return
+
+    logger.info("Queueing Bugzilla Resolution update")
+    queue_bugzilla_update(
+        experiment,
+        BugzillaUpdate.ACTION_COMPLETE_RESOLUTION,
+        fields=bugzilla.format_resolution_body(experiment),
+    )
 
 
 @app.task
@@ -127,22 +275,21 @@ def comp_experiment_update_res_task(experiment_id):
 def add_start_date_comment_task(experiment_id):
     experiment = Experiment.objects.get(id=experiment_id)
     metrics.incr("add_start_data_comment.started")
-    logger.info("Adding Bugzilla Start Date Comment")
+
+    if not experiment.bugzilla_id:
+        logger.info("Skipping Bugzilla comment for experiment without a ticket")
+        return
+
+    logger.info("Queueing Bugzilla Start Date Comment")
     comment = "Start Date: {} End Date: {}".format(
         experiment.start_date, experiment.end_date
     )
-    try:
-        bugzilla_id = experiment.bugzilla_id
-        bugzilla.add_experiment_comment(bugzilla_id, comment)
-        logger.info("Bugzilla Comment Added")
-        metrics.incr("add_start_date_comment.completed")
-    except bugzilla.BugzillaError as e:
-        logger.info("Comment start date failed to be added")
-        metrics.incr("add_start_date_comment.failed")
-        raise e
+    queue_bugzilla_update(
+        experiment, BugzillaUpdate.ACTION_START_DATE_COMMENT, comment=comment
+    )
 
 
-@app.task
+@app.task(priority=settings.TASK_PRIORITY_USER)
 @metrics.timer_decorator("update_bug_resolution.timing")
 def update_bug_resolution_task(user_id, experiment_id):
     metrics.incr("update_bug_resolution.started")
@@ -152,26 +299,10 @@ def update_bug_resolution_task(user_id, experiment_id):
         logger.info("Skipping update either experiment complete or no bugzilla ticket")
         return
 
-    logger.info("Updating Bugzilla Resolution")
-
-    try:
-        bugzilla.update_bug_resolution(experiment)
-        logger.info("Bugzilla resolution updated")
-        Notification.objects.create(
-            user_id=user_id,
-            message=NOTIFICATION_MESSAGE_ARCHIVE_COMMENT.format(
-                bug_url=experiment.bugzilla_url
-            ),
-        )
-        metrics.incr("update_bug_resolution.completed")
-        logger.info("Bugzilla resolution update sent")
-    except bugzilla.BugzillaError as e:
-        metrics.incr("update_bug_resolution.failed")
-        logger.info("Failed to update resolution of bugzilla ticket")
-        Notification.objects.create(
-            user_id=user_id,
-            message=NOTIFICATION_MESSAGE_ARCHIVE_ERROR_MESSAGE.format(
-                bug_url=experiment.bugzilla_url
-            ),
-        )
-        raise e
+    logger.info("Queueing Bugzilla Resolution update")
+    queue_bugzilla_update(
+        experiment,
+        BugzillaUpdate.ACTION_RESOLUTION,
+        user_id=user_id,
+        fields=bugzilla.format_resolution_body(experiment),
+    )
@@ -1,33 +1,43 @@
 import mock
+from django.conf import settings
 
 from experimenter import bugzilla
+from experimenter.base.http import TokenBucket
 
 
 class MockBugzillaMixin(object):
     def setUp(self):
         super().setUp()
 
-        mock_bugzilla_requests_post_patcher = mock.patch(
-            "experimenter.bugzilla.client.requests.post"
-        )
-        self.mock_bugzilla_requests_post = mock_bugzilla_requests_post_patcher.start()
-        self.addCleanup(mock_bugzilla_requests_post_patcher.stop)
-        self.bugzilla_id = "12345"
-        self.mock_bugzilla_requests_post.return_value = self.buildMockSuccessResponse()
-        mock_bugzilla_requests_put_patcher = mock.patch(
-            "experimenter.bugzilla.client.requests.put"
-        )
+        bugzilla.client.user_cache.clear()
+        bugzilla.client.bug_cache.clear()
 
-        self.mock_bugzilla_requests_put = mock_bugzilla_requests_put_patcher.start()
-        self.addCleanup(mock_bugzilla_requests_put_patcher.stop)
-        self.mock_bugzilla_requests_put.return_value = self.buildMockSuccessResponse()
+        mock_rate_limiter_patcher = mock.patch(
+            "experimenter.bugzilla.client.get_rate_limiter",
+            return_value=TokenBucket(
+                settings.BUGZILLA_API_RATE_LIMIT, settings.BUGZILLA_API_RATE_BURST
+            ),
+        )
+        mock_rate_limiter_patcher.start()
+        self.addCleanup(mock_rate_limiter_patcher.stop)
 
-        mock_bugzilla_requests_get_patcher = mock.patch(
-            "experimenter.bugzilla.client.requests.get"
+        mock_flush_apply_async_patcher = mock.patch(
+            "experimenter.bugzilla.tasks.flush_bugzilla_updates_task.apply_async"
         )
+        self.mock_flush_apply_async = mock_flush_apply_async_patcher.start()
+        self.addCleanup(mock_flush_apply_async_patcher.stop)
+
+        mock_get_session_patcher = mock.patch("experimenter.bugzilla.client.get_session")
+        mock_get_session = mock_get_session_patcher.start()
+        self.addCleanup(mock_get_session_patcher.stop)
+        mock_session = mock_get_session.return_value
 
-        self.mock_bugzilla_requests_get = mock_bugzilla_requests_get_patcher.start()
-        self.addCleanup(mock_bugzilla_requests_get_patcher.stop)
+        self.bugzilla_id = "12345"
+        self.mock_bugzilla_requests_post = mock_session.post
+        self.mock_bugzilla_requests_post.return_value = self.buildMockSuccessResponse()
+        self.mock_bugzilla_requests_put = mock_session.put
+        self.mock_bugzilla_requests_put.return_value = self.buildMockSuccessResponse()
+        self.mock_bugzilla_requests_get = mock_session.get
         responses = [
             self.buildMockSuccessUserResponse(),
             self.buildMockSuccessBugResponse(),
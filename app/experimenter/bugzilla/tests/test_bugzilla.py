@@ -3,9 +3,11 @@ import requests
 from django.test import TestCase
 from django.conf import settings
 
+from experimenter.base.http import ProcessLocal
 from experimenter.base.tests.factories import CountryFactory, LocaleFactory
 from experimenter.bugzilla import (
     add_experiment_comment,
+    bug_exists,
     BugzillaError,
     create_experiment_bug,
     format_bug_body,
@@ -15,7 +17,9 @@ from experimenter.bugzilla import (
     set_bugzilla_id_value,
     update_bug_resolution,
     update_experiment_bug,
+    user_exists,
 )
+from experimenter.bugzilla import client
 from experimenter.experiments.models import Experiment
 from experimenter.experiments.tests.factories import ExperimentFactory
 from experimenter.bugzilla.tests.mixins import MockBugzillaMixin
@@ -330,14 +334,16 @@ class TestMakeBugzillaCall(MockBugzillaMixin, TestCase):
         mock_response.status_code = 400
         self.mock_bugzilla_requests_post.return_value = mock_response
 
-        response_data = make_bugzilla_call("/url/", requests.post, data={})
+        response_data = make_bugzilla_call(
+            "/url/", self.mock_bugzilla_requests_post, data={}
+        )
         self.assertEqual(response_data, mock_response_data)
 
     def test_json_parse_error_raises_bugzilla_error(self):
         self.mock_bugzilla_requests_post.side_effect = ValueError()
 
         with self.assertRaises(BugzillaError):
-            make_bugzilla_call("/url/", requests.post, data={})
+            make_bugzilla_call("/url/", self.mock_bugzilla_requests_post, data={})
 
 
 class TestMakePutBugzillaCall(MockBugzillaMixin, TestCase):
@@ -349,10 +355,97 @@ class TestMakePutBugzillaCall(MockBugzillaMixin, TestCase):
         mock_response.status_code = 400
         self.mock_bugzilla_requests_put.return_value = mock_response
 
-        response_data = make_bugzilla_call("/url/", requests.put, data={})
+        response_data = make_bugzilla_call(
+            "/url/", self.mock_bugzilla_requests_put, data={}
+        )
         self.assertEqual(response_data, mock_response_data)
 
     def test_json_parse_error_raises_bugzilla_error(self):
         self.mock_bugzilla_requests_put.side_effect = ValueError()
         with self.assertRaises(BugzillaError):
-            make_bugzilla_call("/url/", requests.put, data={})
+            make_bugzilla_call("/url/", self.mock_bugzilla_requests_put, data={})
+
+
+class TestBugzillaSession(TestCase):
+    def setUp(self):
+        super().setUp()
+        mock_session_patcher = mock.patch(
+            "experimenter.bugzilla.client._session", ProcessLocal(client.build_session)
+        )
+        mock_session_patcher.start()
+        self.addCleanup(mock_session_patcher.stop)
+
+    def test_session_is_reused_within_a_process(self):
+        self.assertIs(client.get_session(), client.get_session())
+
+    def test_session_is_rebuilt_after_fork(self):
+        session = client.get_session()
+
+        with mock.patch("experimenter.base.http.os.getpid", return_value=-1):
+            self.assertIsNot(client.get_session(), session)
+
+    def test_requests_default_to_configured_timeouts(self):
+        session = client.build_session()
+
+        with mock.patch("requests.Session.request") as mock_request:
+            session.get("/url/")
+            session.post("/url/", {}, timeout=1)
+
+        self.assertEqual(
+            mock_request.call_args_list[0][1]["timeout"],
+            (settings.BUGZILLA_API_CONNECT_TIMEOUT, settings.BUGZILLA_API_READ_TIMEOUT),
+        )
+        self.assertEqual(mock_request.call_args_list[1][1]["timeout"], 1)
+
+    def test_only_lookups_are_retried_on_server_errors(self):
+        retry = client.build_session().get_adapter("https://").max_retries
+
+        self.assertEqual(retry.total, settings.BUGZILLA_API_MAX_RETRIES)
+        self.assertTrue(retry.is_retry("GET", 503))
+        self.assertFalse(retry.is_retry("PUT", 503))
+        self.assertFalse(retry.is_retry("POST", 503))
+
+
+class TestExistenceCache(MockBugzillaMixin, TestCase):
+    def test_user_exists_is_cached(self):
+        self.mock_bugzilla_requests_get.side_effect = None
+        self.mock_bugzilla_requests_get.return_value = self.buildMockSuccessUserResponse()
+
+        self.assertTrue(user_exists("dev@example.com"))
+        self.assertTrue(user_exists("dev@example.com"))
+
+        self.mock_bugzilla_requests_get.assert_called_once_with(
+            settings.BUGZILLA_USER_URL.format(email="dev@example.com")
+        )
+
+    def test_unknown_user_is_cached_with_negative_ttl(self):
+        self.mock_bugzilla_requests_get.side_effect = None
+        self.mock_bugzilla_requests_get.return_value = self.buildMockFailureResponse()
+
+        with mock.patch.object(client.user_cache, "set") as mock_set:
+            self.assertFalse(user_exists("dev@example.com"))
+
+        mock_set.assert_called_once_with(
+            "dev@example.com", False, ttl=settings.BUGZILLA_CACHE_NEGATIVE_TTL
+        )
+
+    def test_bug_exists_is_cached(self):
+        self.mock_bugzilla_requests_get.side_effect = None
+        self.mock_bugzilla_requests_get.return_value = self.buildMockFailureResponse()
+
+        self.assertFalse(bug_exists(1234))
+        self.assertFalse(bug_exists(1234))
+
+        self.mock_bugzilla_requests_get.assert_called_once_with(
+            settings.BUGZILLA_BUG_URL.format(bug_id=1234)
+        )
+
+    def test_errors_are_not_cached(self):
+        self.mock_bugzilla_requests_get.side_effect = [
+            requests.exceptions.ConnectionError(),
+            self.buildMockSuccessBugResponse(),
+        ]
+
+        self.assertFalse(bug_exists(1234))
+        self.assertTrue(bug_exists(1234))
+        self.assertEqual(self.mock_bugzilla_requests_get.call_count, 2)
@@ -1,17 +1,20 @@
 import markus
+import mock
 from django.conf import settings
-from django.test import TestCase
+from django.test import TestCase, override_settings
 from markus.testing import MetricsMock
 from requests import RequestException
 
 from experimenter.base.tests.mixins import MockRequestMixin
 from experimenter.bugzilla import tasks
 from experimenter.bugzilla import client as bugzilla
+from experimenter.bugzilla.models import BugzillaUpdate
 from experimenter.bugzilla.tests.mixins import MockBugzillaMixin
 from experimenter.experiments.models import Experiment
 from experimenter.experiments.tests.factories import ExperimentFactory
 from experimenter.normandy.tests.mixins import MockNormandyMixin
 from experimenter.notifications.models import Notification
+from experimenter.openidc.tests.factories import UserFactory
 
 
 class TestCreateBugTask(MockRequestMixin, MockBugzillaMixin, TestCase):
@@ -221,6 +224,7 @@ class TestUpdateTask(MockRequestMixin, MockBugzillaMixin, TestCase):
             ),
         )
 
+    @override_settings(BUGZILLA_UPDATE_MAX_ATTEMPTS=1)
     def test_bugzilla_error_creates_notifications(self):
         self.assertEqual(Notification.objects.count(), 0)
 
@@ -339,3 +343,148 @@ class TestUpdateExperimentSubTask(MockNormandyMixin, MockBugzillaMixin, TestCase
 
         with self.assertRaises(bugzilla.BugzillaError):
             tasks.comp_experiment_update_res_task(experiment.id)
+
+
+@override_settings(BUGZILLA_COALESCE_WINDOW=10)
+class TestCoalescedBugzillaUpdates(MockRequestMixin, MockBugzillaMixin, TestCase):
+    def setUp(self):
+        super().setUp()
+
+        self.experiment = ExperimentFactory.create_with_status(Experiment.STATUS_COMPLETE)
+        self.experiment.bugzilla_id = self.bugzilla_id
+        self.experiment.save()
+
+    def test_actions_are_queued_and_flushed_after_window(self):
+        tasks.update_experiment_bug_task(self.user.id, self.experiment.id)
+        tasks.comp_experiment_update_res_task(self.experiment.id)
+        tasks.add_start_date_comment_task(self.experiment.id)
+
+        self.mock_bugzilla_requests_put.assert_not_called()
+        self.mock_bugzilla_requests_post.assert_not_called()
+        self.assertEqual(BugzillaUpdate.objects.count(), 3)
+        self.assertEqual(
+            self.mock_flush_apply_async.call_args_list,
+            [
+                mock.call(
+                    (self.bugzilla_id,),
+                    countdown=10,
+                    priority=settings.TASK_PRIORITY_USER,
+                ),
+                mock.call((self.bugzilla_id,), countdown=10, priority=None),
+                mock.call((self.bugzilla_id,), countdown=10, priority=None),
+            ],
+        )
+
+    def test_flush_sends_one_update_and_one_comment(self):
+        tasks.update_experiment_bug_task(self.user.id, self.experiment.id)
+        tasks.comp_experiment_update_res_task(self.experiment.id)
+        BugzillaUpdate.objects.create(
+            bugzilla_id=self.bugzilla_id,
+            experiment=self.experiment,
+            action=BugzillaUpdate.ACTION_START_DATE_COMMENT,
+            comment="first",
+        )
+        BugzillaUpdate.objects.create(
+            bugzilla_id=self.bugzilla_id,
+            experiment=self.experiment,
+            action=BugzillaUpdate.ACTION_START_DATE_COMMENT,
+            comment="second",
+        )
+
+        with MetricsMock() as mm:
+            tasks.flush_bugzilla_updates_task(self.bugzilla_id)
+            tasks.flush_bugzilla_updates_task(self.bugzilla_id)
+
+            mm.assert_incr_once(
+                "experiments.tasks.flush_bugzilla_updates.coalesced", value=3
+            )
+            mm.assert_incr_once("experiments.tasks.update_experiment_bug.completed")
+
+        expected_fields = bugzilla.format_update_body(self.experiment)
+        expected_fields.update({"status": "RESOLVED", "resolution": "FIXED"})
+        self.mock_bugzilla_requests_put.assert_called_once_with(
+            settings.BUGZILLA_UPDATE_URL.format(id=self.bugzilla_id), expected_fields
+        )
+        self.mock_bugzilla_requests_post.assert_called_once_with(
+            settings.BUGZILLA_COMMENT_URL.format(id=self.bugzilla_id),
+            {"comment": "first\n\nsecond"},
+        )
+        self.assertFalse(BugzillaUpdate.objects.exists())
+
+        notification = Notification.objects.get()
+        self.assertEqual(notification.user, self.user)
+        self.assertEqual(
+            notification.message,
+            tasks.NOTIFICATION_MESSAGE_UPDATE_BUG.format(
+                bug_url=self.experiment.bugzilla_url
+            ),
+        )
+
+    def test_failed_parts_are_kept_and_retried(self):
+        other_user = UserFactory.create()
+        tasks.update_experiment_bug_task(self.user.id, self.experiment.id)
+        tasks.update_experiment_bug_task(other_user.id, self.experiment.id)
+        tasks.add_start_date_comment_task(self.experiment.id)
+        self.mock_flush_apply_async.reset_mock()
+
+        self.mock_bugzilla_requests_put.side_effect = RequestException()
+
+        with MetricsMock() as mm:
+            with self.assertRaises(bugzilla.BugzillaError):
+                tasks.flush_bugzilla_updates_task(self.bugzilla_id)
+
+            mm.assert_incr_once("experiments.tasks.flush_bugzilla_updates.retried", 2)
+
+        self.mock_bugzilla_requests_post.assert_called_once()
+        self.mock_flush_apply_async.assert_called_once_with(
+            (self.bugzilla_id,), countdown=settings.BUGZILLA_UPDATE_RETRY_DELAY
+        )
+        self.assertEqual(
+            list(BugzillaUpdate.objects.values_list("action", "attempts", "comment")),
+            [
+                (BugzillaUpdate.ACTION_UPDATE, 1, ""),
+                (BugzillaUpdate.ACTION_UPDATE, 1, ""),
+            ],
+        )
+        self.assertFalse(Notification.objects.exists())
+
+        self.mock_bugzilla_requests_put.side_effect = None
+        tasks.flush_bugzilla_updates_task(self.bugzilla_id)
+
+        self.assertEqual(self.mock_bugzilla_requests_put.call_count, 2)
+        self.mock_bugzilla_requests_post.assert_called_once()
+        self.assertFalse(BugzillaUpdate.objects.exists())
+        self.assertEqual(
+            set(
+                Notification.objects.filter(
+                    message=tasks.NOTIFICATION_MESSAGE_UPDATE_BUG.format(
+                        bug_url=self.experiment.bugzilla_url
+                    )
+                ).values_list("user", flat=True)
+            ),
+            {self.user.id, other_user.id},
+        )
+
+    @override_settings(BUGZILLA_UPDATE_MAX_ATTEMPTS=2)
+    def test_flush_notifies_every_user_once_attempts_run_out(self):
+        other_user = UserFactory.create()
+        tasks.update_experiment_bug_task(self.user.id, self.experiment.id)
+        tasks.update_experiment_bug_task(other_user.id, self.experiment.id)
+        self.mock_flush_apply_async.reset_mock()
+
+        self.mock_bugzilla_requests_put.side_effect = RequestException()
+
+        for i in range(2):
+            with self.assertRaises(bugzilla.BugzillaError):
+                tasks.flush_bugzilla_updates_task(self.bugzilla_id)
+
+        self.mock_flush_apply_async.assert_called_once()
+        self.assertFalse(BugzillaUpdate.objects.exists())
+        self.assertEqual(
+            set(
+                Notification.objects.filter(
+                    message=tasks.NOTIFICATION_MESSAGE_UPDATE_BUG_FAILED
+                ).values_list("user", flat=True)
+            ),
+            {self.user.id, other_user.id},
+        )
@@ -5,6 +5,7 @@ from rest_framework.generics import (
 
 from experimenter.experiments.constants import ExperimentConstants
 from experimenter.experiments.models import Experiment
+from experimenter.experiments.recipe_cache import RecipeCacheMixin
 from experimenter.normandy.serializers import ExperimentRecipeSerializer
 from experimenter.experiments.api.v1.serializers import ExperimentSerializer
 
@@ -21,7 +22,7 @@ class ExperimentDetailView(RetrieveAPIView):
     serializer_class = ExperimentSerializer
 
 
-class ExperimentRecipeView(RetrieveAPIView):
+class ExperimentRecipeView(RecipeCacheMixin, RetrieveAPIView):
     lookup_field = "slug"
     queryset = Experiment.objects.get_prefetched().filter(
         status__in=(
@@ -32,3 +33,11 @@ class ExperimentRecipeView(RetrieveAPIView):
         )
     )
     serializer_class = ExperimentRecipeSerializer
+
+    def retrieve(self, request, *args, **kwargs):
+        return self.get_cached_recipe_response(
+            request,
+            "recipe",
+            self.get_object_recipe_version(),
+            lambda: self.get_serializer(self.get_object()).data,
+        )
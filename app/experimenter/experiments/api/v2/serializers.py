@@ -739,6 +739,7 @@ class ExperimentCSVSerializer(serializers.ModelSerializer):
     description = serializers.CharField(source="public_description")
     hypothesis = serializers.CharField(source="objectives")
     leading_indicators = serializers.CharField(source="analysis")
+    start_date = serializers.ReadOnlyField()
     length = serializers.SerializerMethodField()
     channel = serializers.CharField(source="firefox_channel")
     enrolled_target = serializers.IntegerField(source="total_enrolled_clients")
@@ -768,13 +769,13 @@ class ExperimentCSVSerializer(serializers.ModelSerializer):
         )
 
     def get_projects(self, obj):
-        return ", ".join([p.name for p in obj.projects.order_by("name")])
+        return ", ".join(sorted(p.name for p in obj.projects.all()))
 
     def get_locales(self, obj):
-        return ", ".join([locale.name for locale in obj.locales.order_by("name")])
+        return ", ".join(sorted(locale.name for locale in obj.locales.all()))
 
     def get_countries(self, obj):
-        return ", ".join([country.name for country in obj.countries.order_by("name")])
+        return ", ".join(sorted(country.name for country in obj.countries.all()))
 
     def get_length(self, obj):
         if obj.end_date:
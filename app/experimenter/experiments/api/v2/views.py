@@ -1,3 +1,4 @@
+from django.http import StreamingHttpResponse
 from rest_framework.generics import (
     UpdateAPIView,
     RetrieveUpdateAPIView,
@@ -5,7 +6,7 @@ from rest_framework.generics import (
 )
 from rest_framework.response import Response
 from rest_framework import status
-from rest_framework_csv.renderers import CSVRenderer
+from rest_framework_csv.renderers import CSVRenderer, CSVStreamingRenderer
 
 
 from experimenter.experiments.constants import ExperimentConstants
@@ -114,10 +115,20 @@ class ExperimentCSVRenderer(CSVRenderer):
     labels = dict(((field, field.replace("_", " ").title()) for field in header))
 
 
+class ExperimentCSVStreamingRenderer(CSVStreamingRenderer):
+    header = ExperimentCSVRenderer.header
+    labels = ExperimentCSVRenderer.labels
+
+
 class ExperimentCSVListView(ListAPIView):
-    queryset = Experiment.objects.get_prefetched().order_by("status", "name")
+    queryset = (
+        Experiment.objects.select_related("owner", "analysis_owner")
+        .prefetch_related("projects", "locales", "countries")
+        .order_by("status", "name")
+    )
     serializer_class = ExperimentCSVSerializer
     renderer_classes = (ExperimentCSVRenderer,)
+    chunk_size = 500
 
     def get_queryset(self):
         return ExperimentFilterset(
@@ -130,3 +141,28 @@ class ExperimentCSVListView(ListAPIView):
         context = super().get_renderer_context()
         context["header"] = self.serializer_class.Meta.fields
         return context
+
+    def list(self, request, *args, **kwargs):
+        rows = (
+            self.get_serializer(experiment).data
+            for experiment in self.iter_experiments(self.get_queryset())
+        )
+        return StreamingHttpResponse(
+            ExperimentCSVStreamingRenderer().render(
+                rows, renderer_context=self.get_renderer_context()
+            ),
+            content_type=ExperimentCSVRenderer.media_type,
+        )
+
+    def iter_experiments(self, queryset):
+        # QuerySet.iterator() skips prefetch_related, so load the ordered ids
+        # once and fetch each chunk with its prefetches
+        experiment_ids = list(queryset.values_list("id", flat=True))
+
+        for start in range(0, len(experiment_ids), self.chunk_size):
+            end = start + self.chunk_size
+            chunk_ids = experiment_ids[start:end]
+            experiments = queryset.in_bulk(chunk_ids)
+
+            for experiment_id in chunk_ids:
+                yield experiments[experiment_id]
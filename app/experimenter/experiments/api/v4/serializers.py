@@ -76,9 +76,9 @@ class ExperimentRapidArgumentSerializer(serializers.ModelSerializer):
             return ExperimentBucketRangeSerializer(obj.bucket).data
 
     def get_referenceBranch(self, obj):
-        if obj.variants.count():
-            control_branch = obj.variants.get(is_control=True)
-            return control_branch.slug
+        for variant in obj.variants.all():
+            if variant.is_control:
+                return variant.slug
 
     def get_startDate(self, obj):
         # placeholder value
@@ -126,8 +126,8 @@ class ExperimentRapidRecipeSerializer(serializers.ModelSerializer):
         ].format(minFirefoxVersion=f"{obj.firefox_min_version_integer}.!")
 
     def get_targeting(self, obj):
-        if ExperimentBucketRange.objects.filter(experiment=obj).exists():
-            bucket_range = ExperimentBucketRange.objects.get(experiment=obj)
+        if hasattr(obj, "bucket"):
+            bucket_range = obj.bucket
             bucket_namespace = bucket_range.namespace.name
             bucket_start = bucket_range.start
 
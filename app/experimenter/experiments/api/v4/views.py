@@ -1,18 +1,39 @@
 from rest_framework import viewsets, mixins
 
 from experimenter.experiments.models import Experiment
+from experimenter.experiments.recipe_cache import RecipeCacheMixin
 from experimenter.experiments.api.v4.serializers import ExperimentRapidRecipeSerializer
 
 
 class ExperimentRapidViewSet(
+    RecipeCacheMixin,
     mixins.RetrieveModelMixin,
     mixins.ListModelMixin,
     viewsets.GenericViewSet,
 ):
     lookup_field = "recipe_slug"
     queryset = (
-        Experiment.objects.get_prefetched()
+        Experiment.objects.select_related("bucket__namespace")
+        .prefetch_related("variants")
         .filter(type=Experiment.TYPE_RAPID)
         .exclude(status__in=[Experiment.STATUS_DRAFT, Experiment.STATUS_REVIEW])
     )
     serializer_class = ExperimentRapidRecipeSerializer
+
+    def retrieve(self, request, *args, **kwargs):
+        return self.get_cached_recipe_response(
+            request,
+            "rapid_recipe",
+            self.get_object_recipe_version(),
+            lambda: self.get_serializer(self.get_object()).data,
+        )
+
+    def list(self, request, *args, **kwargs):
+        return self.get_cached_recipe_response(
+            request,
+            "rapid_recipe_list",
+            self.get_list_recipe_version(),
+            lambda: self.get_serializer(
+                self.filter_queryset(self.get_queryset()), many=True
+            ).data,
+        )
@@ -1,4 +1,5 @@
 from django.contrib.auth import get_user_model
+from django.db import transaction
 from rest_framework import serializers
 
 from experimenter.base.serializers import CountrySerializer, LocaleSerializer
@@ -7,6 +8,10 @@ from experimenter.experiments.models import (
     ExperimentChangeLog,
 )
 from experimenter.experiments.api.v1.serializers import ExperimentVariantSerializer
+from experimenter.experiments.signals import (
+    handle_status_changes,
+    update_recipe_version,
+)
 from experimenter.projects.serializers import ProjectSerializer
 
 
@@ -15,12 +20,16 @@ class ChangelogSerializerMixin(object):
         super().__init__(*args, **kwargs)
         self.old_serialized_vals = {}
         if self.instance and self.instance.id:
-            self.old_serialized_vals = ChangeLogSerializer(self.instance).data
+            self.old_serialized_vals = ChangeLogSerializer(
+                self.instance, fields=self.fields.keys()
+            ).data
 
     def update_changelog(self, instance, validated_data):
-        new_serialized_vals = ChangeLogSerializer(instance).data
-        user = self.context["request"].user
         changed_data = validated_data.copy()
+        new_serialized_vals = ChangeLogSerializer(
+            instance, fields=set(self.fields.keys()) | set(changed_data)
+        ).data
+        user = self.context["request"].user
         generate_change_log(
             self.old_serialized_vals, new_serialized_vals, instance, changed_data, user
         )
@@ -34,6 +43,16 @@ class ChangeLogSerializer(serializers.ModelSerializer):
     countries = CountrySerializer(many=True, required=False)
     projects = ProjectSerializer(many=True, required=False)
 
+    def __init__(self, *args, **kwargs):
+        # Snapshots can be limited to the fields a form or serializer is able
+        # to change, variants are always kept since every change log diffs them
+        fields = kwargs.pop("fields", None)
+        super().__init__(*args, **kwargs)
+
+        if fields is not None:
+            for field_name in set(self.fields) - set(fields) - {"variants"}:
+                self.fields.pop(field_name)
+
     class Meta:
         model = Experiment
         fields = (
@@ -139,10 +158,14 @@ class ChangeLogSerializer(serializers.ModelSerializer):
 def update_experiment_with_change_log(
     old_experiment, changed_data, user_email, message=None
 ):
-    old_serialized_exp = ChangeLogSerializer(old_experiment).data
-    Experiment.objects.filter(id=old_experiment.id).update(**changed_data)
+    old_serialized_exp = ChangeLogSerializer(old_experiment, fields=changed_data).data
+    Experiment.objects.filter(id=old_experiment.id).update(
+        **Experiment.with_version_integers(changed_data)
+    )
     new_experiment = Experiment.objects.get(slug=old_experiment.slug)
-    new_serialized_exp = ChangeLogSerializer(new_experiment).data
+    if set(changed_data) & set(Experiment.SEARCH_FIELDS):
+        new_experiment.update_search_document()
+    new_serialized_exp = ChangeLogSerializer(new_experiment, fields=changed_data).data
 
     default_user, _ = get_user_model().objects.get_or_create(
         email=user_email, username=user_email
@@ -157,6 +180,98 @@ def update_experiment_with_change_log(
         message,
     )
 
+    return new_experiment
+
+
+def bulk_update_experiments_with_change_log(experiment_changes, user_email, message=None):
+    """
+    The batch version of update_experiment_with_change_log: takes a list of
+    (experiment, changed_data) pairs, applies the updates and writes their
+    change logs in one transaction, returning the updated experiments.
+    """
+    experiment_changes = [
+        (experiment.id, changed_data) for experiment, changed_data in experiment_changes
+    ]
+    if not experiment_changes:
+        return []
+
+    experiment_ids = [experiment_id for experiment_id, _ in experiment_changes]
+    changed_fields = set().union(
+        *[changed_data for _, changed_data in experiment_changes]
+    )
+    experiments = Experiment.objects.filter(id__in=experiment_ids).prefetch_related(
+        "variants__preferences"
+    )
+
+    default_user, _ = get_user_model().objects.get_or_create(
+        email=user_email, username=user_email
+    )
+
+    # experiments sharing the same changes are updated together
+    updates = []
+    for experiment_id, changed_data in experiment_changes:
+        for update_ids, update_data in updates:
+            if update_data == changed_data:
+                update_ids.append(experiment_id)
+                break
+        else:
+            updates.append(([experiment_id], changed_data))
+
+    with transaction.atomic():
+        old_serialized_exps = {
+            experiment.id: ChangeLogSerializer(experiment, fields=changed_fields).data
+            for experiment in experiments
+        }
+
+        for update_ids, update_data in updates:
+            Experiment.objects.filter(id__in=update_ids).update(
+                **Experiment.with_version_integers(update_data)
+            )
+
+        if changed_fields & set(Experiment.SEARCH_FIELDS):
+            Experiment.objects.filter(id__in=experiment_ids).update(
+                search_document=Experiment.search_vector()
+            )
+
+        new_experiments = experiments.all().in_bulk(experiment_ids)
+        latest_statuses = dict(
+            ExperimentChangeLog.objects.filter(experiment_id__in=experiment_ids)
+            .order_by("experiment_id", "-changed_on")
+            .distinct("experiment_id")
+            .values_list("experiment_id", "new_status")
+        )
+
+        change_logs = []
+        for experiment_id, changed_data in experiment_changes:
+            new_experiment = new_experiments[experiment_id]
+            old_status = latest_statuses.get(experiment_id)
+            changed_values = get_changed_values(
+                old_serialized_exps[experiment_id],
+                ChangeLogSerializer(new_experiment, fields=changed_fields).data,
+                experiment_id in latest_statuses,
+                changed_data,
+            )
+
+            if _has_changed(old_status, changed_values, new_experiment, message):
+                change_logs.append(
+                    ExperimentChangeLog(
+                        experiment=new_experiment,
+                        changed_by=default_user,
+                        old_status=old_status,
+                        new_status=new_experiment.status,
+                        changed_values=changed_values,
+                        message=message,
+                    )
+                )
+
+        # bulk_create skips ExperimentChangeLog.save() and its signals
+        ExperimentChangeLog.objects.bulk_create(change_logs)
+        Experiment.bulk_update_lifecycle_dates(experiment_ids)
+        update_recipe_version(id__in=experiment_ids)
+        handle_status_changes(change_logs)
+
+    return [new_experiments[experiment_id] for experiment_id in experiment_ids]
+
 
 def generate_change_log(
     old_serialized_vals,
@@ -167,15 +282,42 @@ def generate_change_log(
     message=None,
     form_fields=None,
 ):
-
-    changed_values = {}
     old_status = None
 
     latest_change = instance.changes.latest()
-
-    # account for changes in variant values
     if latest_change:
         old_status = latest_change.new_status
+
+    changed_values = get_changed_values(
+        old_serialized_vals,
+        new_serialized_vals,
+        bool(latest_change),
+        changed_data,
+        form_fields,
+    )
+
+    if _has_changed(old_status, changed_values, instance, message):
+        ExperimentChangeLog.objects.create(
+            experiment=instance,
+            changed_by=user,
+            old_status=old_status,
+            new_status=instance.status,
+            changed_values=changed_values,
+            message=message,
+        )
+
+
+def get_changed_values(
+    old_serialized_vals,
+    new_serialized_vals,
+    has_latest_change,
+    changed_data,
+    form_fields=None,
+):
+    changed_values = {}
+
+    # account for changes in variant values
+    if has_latest_change:
         if old_serialized_vals["variants"] != new_serialized_vals["variants"]:
             old_value = old_serialized_vals["variants"]
             new_value = new_serialized_vals["variants"]
@@ -197,9 +339,7 @@ def generate_change_log(
         }
 
     if changed_data:
-        if latest_change:
-            old_status = latest_change.new_status
-
+        if has_latest_change:
             for field in changed_data:
                 old_val = None
                 new_val = None
@@ -245,15 +385,7 @@ def generate_change_log(
                         "new_value": new_val,
                         "display_name": display_name,
                     }
-    if _has_changed(old_status, changed_values, instance, message):
-        ExperimentChangeLog.objects.create(
-            experiment=instance,
-            changed_by=user,
-            old_status=old_status,
-            new_status=instance.status,
-            changed_values=changed_values,
-            message=message,
-        )
+    return changed_values
 
 
 def _has_changed(old_status, changed_values, experiment, message):
@@ -88,6 +88,38 @@ class ExperimentConstants(object):
     EXPERIMENT_STARTS = "starting"
     EXPERIMENT_PAUSES = "pausing"
     EXPERIMENT_ENDS = "ending"
+    LIFECYCLE_DATE_FIELDS = ("start_date", "enrollment_end_date", "end_date")
+    # columns recomputed from the change log whenever it is written to
+    CHANGE_LOG_DERIVED_FIELDS = LIFECYCLE_DATE_FIELDS + ("latest_change",)
+    ENROLLMENT_COMPLETE_MESSAGE = "Enrollment Complete"
+
+    # search stuff
+    SEARCH_FIELD_WEIGHTS = (
+        ("A", ("name",)),
+        ("B", ("slug", "recipe_slug")),
+        ("C", ("short_description", "public_description")),
+        (
+            "D",
+            (
+                "owner__email",
+                "analysis_owner__email",
+                "related_work",
+                "addon_experiment_id",
+                "pref_name",
+                "objectives",
+                "analysis",
+                "engineering_owner",
+                "bugzilla_id",
+                "data_science_issue_url",
+                "feature_bugzilla_url",
+            ),
+        ),
+    )
+    SEARCH_FIELDS = tuple(
+        field.split("__")[0]
+        for weight, fields in SEARCH_FIELD_WEIGHTS
+        for field in fields
+    )
 
     # extra email-type stuff
     INTENT_TO_SHIP_EMAIL_LABEL = "intent to ship"
@@ -195,6 +227,7 @@ class ExperimentConstants(object):
     )
 
     VERSION_REGEX = re.compile(r"[\d]+")
+    VERSION_INTEGER_FIELDS = ("firefox_min_version_int", "firefox_max_version_int")
 
     # Channel stuff
     CHANNEL_NIGHTLY = "Nightly"
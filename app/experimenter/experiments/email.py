@@ -1,6 +1,9 @@
+import datetime
 import logging
 from django.conf import settings
+from django.core.mail import get_connection
 from django.core.mail.message import EmailMessage
+from django.db.models import Exists, OuterRef, Q
 from django.template.loader import render_to_string
 
 from experimenter.experiments.models import Experiment, ExperimentEmail
@@ -44,8 +47,7 @@ def send_experiment_launch_email(experiment):
     )
 
 
-def send_experiment_ending_email(experiment):
-
+def send_experiment_ending_email(experiment, connection=None):
     format_and_send_html_email(
         experiment,
         "experiments/emails/experiment_ending_email.html",
@@ -55,11 +57,11 @@ def send_experiment_ending_email(experiment):
         },
         Experiment.ENDING_EMAIL_SUBJECT,
         Experiment.EXPERIMENT_ENDS,
+        connection=connection,
     )
 
 
-def send_enrollment_pause_email(experiment):
-
+def send_enrollment_pause_email(experiment, connection=None):
     format_and_send_html_email(
         experiment,
         "experiments/emails/enrollment_pause_email.html",
@@ -69,20 +71,38 @@ def send_enrollment_pause_email(experiment):
         },
         Experiment.PAUSE_EMAIL_SUBJECT,
         Experiment.EXPERIMENT_PAUSES,
+        connection=connection,
     )
 
 
 def format_and_send_html_email(
-    experiment, file_string, template_vars, subject, email_type, cc_recipients=None
+    experiment,
+    file_string,
+    template_vars,
+    subject,
+    email_type,
+    cc_recipients=None,
+    connection=None,
+):
+    send_html_email(
+        experiment,
+        format_html_email(experiment, file_string, template_vars, subject, cc_recipients),
+        email_type,
+        connection=connection,
+    )
+
+
+def format_html_email(
+    experiment, file_string, template_vars, subject, cc_recipients=None
 ):
     content = render_to_string(file_string, template_vars)
 
     version = experiment.format_firefox_versions
     channel = experiment.firefox_channel
 
-    recipients = [experiment.owner.email] + list(
-        experiment.subscribers.values_list("email", flat=True)
-    )
+    recipients = [experiment.owner.email] + [
+        subscriber.email for subscriber in experiment.subscribers.all()
+    ]
 
     if experiment.analysis_owner:
         recipients.append(experiment.analysis_owner)
@@ -96,26 +116,83 @@ def format_and_send_html_email(
     )
     email.content_subtype = "html"
 
+    return email
+
+
+def send_html_email(experiment, email, email_type, connection=None):
+    # a shared connection sends several emails over one SMTP session
+    email.connection = connection
     email.send(fail_silently=False)
 
     ExperimentEmail.objects.create(experiment=experiment, type=email_type)
 
 
-def send_period_ending_emails_task(experiment):
-    # send experiment ending soon emails if end date is 5 days out
-    if experiment.ending_soon:
-        if not ExperimentEmail.objects.filter(
-            experiment=experiment, type=ExperimentConstants.EXPERIMENT_ENDS
-        ).exists():
-            send_experiment_ending_email(experiment)
-            logging.info("Sent ending email for Experiment: {}".format(experiment))
-    # send enrollment ending emails if enrollment end
-    # date is 5 days out
-    if experiment.enrollment_end_date and experiment.enrollment_ending_soon:
-        if not ExperimentEmail.objects.filter(
-            experiment=experiment, type=ExperimentConstants.EXPERIMENT_PAUSES
-        ).exists():
-            send_enrollment_pause_email(experiment)
-            logging.info(
-                "Sent enrollment pause email for Experiment: {}".format(experiment)
+def get_period_ending_experiments():
+    # one query for every live experiment due an ending or pause email that
+    # hasn't been sent yet, the sent flags come from anti-joins on the emails
+    soon = datetime.date.today() + datetime.timedelta(days=5)
+
+    def email_sent(email_type):
+        return Exists(
+            ExperimentEmail.objects.filter(experiment=OuterRef("pk"), type=email_type)
+        )
+
+    return (
+        Experiment.objects.filter(status=Experiment.STATUS_LIVE)
+        .exclude(type=Experiment.TYPE_RAPID)
+        .annotate(
+            ending_email_sent=email_sent(ExperimentConstants.EXPERIMENT_ENDS),
+            pause_email_sent=email_sent(ExperimentConstants.EXPERIMENT_PAUSES),
+        )
+        .filter(
+            Q(end_date__lte=soon, ending_email_sent=False)
+            | Q(enrollment_end_date__lte=soon, pause_email_sent=False)
+        )
+        .select_related("owner", "analysis_owner")
+        .prefetch_related("subscribers")
+        .order_by("id")
+    )
+
+
+def send_period_ending_emails():
+    soon = datetime.date.today() + datetime.timedelta(days=5)
+    emails = []
+
+    for experiment in get_period_ending_experiments():
+        if (
+            experiment.end_date
+            and experiment.end_date <= soon
+            and not experiment.ending_email_sent
+        ):
+            emails.append(
+                (
+                    experiment,
+                    ExperimentConstants.EXPERIMENT_ENDS,
+                    send_experiment_ending_email,
+                )
             )
+
+        if (
+            experiment.enrollment_end_date
+            and experiment.enrollment_end_date <= soon
+            and not experiment.pause_email_sent
+        ):
+            emails.append(
+                (
+                    experiment,
+                    ExperimentConstants.EXPERIMENT_PAUSES,
+                    send_enrollment_pause_email,
+                )
+            )
+
+    if not emails:
+        return 0
+
+    # each email is recorded as soon as it is sent, so a failure partway
+    # through doesn't send the earlier ones again on the next run
+    with get_connection(fail_silently=False) as connection:
+        for experiment, email_type, send_email in emails:
+            send_email(experiment, connection=connection)
+            logging.info(f"Sent {email_type} email for Experiment: {experiment}")
+
+    return len(emails)
@@ -2,14 +2,10 @@ import django_filters as filters
 from django import forms
 
 from django.contrib.auth import get_user_model
-from django.db.models import Q, F, IntegerField
-from django.db.models.functions import Cast
-from django.db.models.expressions import Func, Value
-from django.contrib.postgres.search import SearchQuery, SearchRank, SearchVector
+from django.db.models import Q, F
+from django.contrib.postgres.search import SearchQuery, SearchRank
 import django_filters.widgets as widgets
 
-from experimenter.experiments.constants import ExperimentConstants
-
 from experimenter.experiments.models import Experiment
 from experimenter.projects.models import Project
 
@@ -151,30 +147,11 @@ class ExperimentFilterset(filters.FilterSet):
         )
 
     def filter_search(self, queryset, name, value):
-        vector = SearchVector(
-            "name",
-            "short_description",
-            "owner__email",
-            "analysis_owner__email",
-            "slug",
-            "related_work",
-            "addon_experiment_id",
-            "pref_name",
-            "public_description",
-            "objectives",
-            "analysis",
-            "engineering_owner",
-            "bugzilla_id",
-            "recipe_slug",
-            "data_science_issue_url",
-            "feature_bugzilla_url",
-        )
-
         query = SearchQuery(value)
 
         return (
-            queryset.annotate(rank=SearchRank(vector, query), search=vector)
-            .filter(search=value)
+            queryset.annotate(rank=SearchRank(F("search_document"), query))
+            .filter(search_document=query)
             .order_by("-rank")
         )
 
@@ -190,9 +167,10 @@ class ExperimentFilterset(filters.FilterSet):
         return queryset
 
     def version_filter(self, queryset, name, value):
+        version = Experiment.version_integer(value)
         return queryset.filter(
-            Q(firefox_min_version__lte=value, firefox_max_version__gte=value)
-            | Q(firefox_min_version=value)
+            Q(firefox_min_version_int__lte=version, firefox_max_version_int__gte=version)
+            | Q(firefox_min_version_int=version)
         )
 
     def date_range_filter(self, queryset, name, value):
@@ -204,21 +182,19 @@ class ExperimentFilterset(filters.FilterSet):
                 Experiment.EXPERIMENT_ENDS: "end_date",
             }[date_type]
 
-            results = []
-
-            for experiment in queryset.all():
-                date = getattr(experiment, experiment_date_field)
+            # enrollment end dates are optional, so there won't always
+            # be a pause date for an experiment
+            queryset = queryset.filter(**{f"{experiment_date_field}__isnull": False})
 
-                # enrollment end dates are optional, so there won't always
-                # be a pause date for an experiment
-                if date:
-                    if value.start and date < value.start.date():
-                        continue
-                    if value.stop and date > value.stop.date():
-                        continue
-                    results.append(experiment.id)
+            if value.start:
+                queryset = queryset.filter(
+                    **{f"{experiment_date_field}__gte": value.start.date()}
+                )
+            if value.stop:
+                queryset = queryset.filter(
+                    **{f"{experiment_date_field}__lte": value.stop.date()}
+                )
 
-            return queryset.filter(pk__in=results)
         return queryset
 
     def in_qa_filter(self, queryset, name, value):
@@ -241,28 +217,8 @@ class ExperimentFilterset(filters.FilterSet):
 
     def longrunning_filter(self, queryset, name, value):
         if value:
-            return (
-                queryset.exclude(firefox_max_version__exact="")
-                .annotate(
-                    firefox_min_int=Cast(
-                        Func(
-                            F("firefox_min_version"),
-                            Value(ExperimentConstants.VERSION_REGEX.pattern),
-                            function="substring",
-                        ),
-                        IntegerField(),
-                    ),
-                    firefox_max_int=Cast(
-                        Func(
-                            F("firefox_max_version"),
-                            Value(ExperimentConstants.VERSION_REGEX.pattern),
-                            function="substring",
-                        ),
-                        IntegerField(),
-                    ),
-                    version_count=F("firefox_max_int") - F("firefox_min_int"),
-                )
-                .filter(version_count__gte=3)
+            return queryset.filter(
+                firefox_max_version_int__gte=F("firefox_min_version_int") + 3
             )
 
         return queryset
@@ -76,7 +76,9 @@ class ChangeLogMixin(object):
         self.request = request
         super().__init__(*args, **kwargs)
         if self.instance.id:
-            self.old_serialized_vals = ChangeLogSerializer(self.instance).data
+            self.old_serialized_vals = ChangeLogSerializer(
+                self.instance, fields=self.fields
+            ).data
         else:
             self.old_serialized_vals = None
 
@@ -86,7 +88,7 @@ class ChangeLogMixin(object):
     def save(self, *args, **kwargs):
 
         experiment = super().save(*args, **kwargs)
-        new_serialized_vals = ChangeLogSerializer(self.instance).data
+        new_serialized_vals = ChangeLogSerializer(self.instance, fields=self.fields).data
         message = self.get_changelog_message()
         generate_change_log(
             self.old_serialized_vals,
@@ -1005,8 +1007,8 @@ class ExperimentOrderingForm(forms.Form):
     ORDERING_CHOICES = (
         ("-latest_change", "Most Recently Updated"),
         ("latest_change", "Least Recently Updated"),
-        ("firefox_min_version", "Firefox Min Version Ascending"),
-        ("-firefox_min_version", "Firefox Min Version Descending"),
+        ("firefox_min_version_int", "Firefox Min Version Ascending"),
+        ("-firefox_min_version_int", "Firefox Min Version Descending"),
         ("firefox_channel_sort", "Firefox Channel Ascending"),
         ("-firefox_channel_sort", "Firefox Channel Descending"),
     )
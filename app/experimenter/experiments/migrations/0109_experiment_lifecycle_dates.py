@@ -0,0 +1,28 @@
+# Generated by Django 3.0.7 on 2026-10-18 02:15
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ("experiments", "0108_auto_20200817_1534"),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name="experiment",
+            name="end_date",
+            field=models.DateField(blank=True, db_index=True, null=True),
+        ),
+        migrations.AddField(
+            model_name="experiment",
+            name="enrollment_end_date",
+            field=models.DateField(blank=True, db_index=True, null=True),
+        ),
+        migrations.AddField(
+            model_name="experiment",
+            name="start_date",
+            field=models.DateField(blank=True, db_index=True, null=True),
+        ),
+    ]
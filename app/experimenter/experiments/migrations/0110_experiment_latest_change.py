@@ -0,0 +1,31 @@
+from django.db import migrations, models
+from django.db.models import OuterRef, Subquery
+
+
+def forward_latest_change(apps, schema_editor):
+    Experiment = apps.get_model("experiments", "Experiment")
+    ExperimentChangeLog = apps.get_model("experiments", "ExperimentChangeLog")
+
+    Experiment.objects.update(
+        latest_change=Subquery(
+            ExperimentChangeLog.objects.filter(experiment=OuterRef("id"))
+            .order_by("-changed_on")
+            .values("changed_on")[:1]
+        )
+    )
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ("experiments", "0109_experiment_lifecycle_dates"),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name="experiment",
+            name="latest_change",
+            field=models.DateTimeField(blank=True, db_index=True, null=True),
+        ),
+        migrations.RunPython(forward_latest_change, migrations.RunPython.noop),
+    ]
@@ -0,0 +1,85 @@
+import django.contrib.postgres.indexes
+import django.contrib.postgres.search
+from django.contrib.postgres.search import SearchVector
+from django.db import migrations
+from django.db.models import OuterRef, Subquery
+
+
+BACKFILL_BATCH_SIZE = 1000
+
+# a frozen copy of ExperimentConstants.SEARCH_FIELD_WEIGHTS at the time of
+# this migration, later changes to the search fields must not alter it
+SEARCH_FIELD_WEIGHTS = (
+    ("A", ("name",)),
+    ("B", ("slug", "recipe_slug")),
+    ("C", ("short_description", "public_description")),
+    (
+        "D",
+        (
+            "owner__email",
+            "analysis_owner__email",
+            "related_work",
+            "addon_experiment_id",
+            "pref_name",
+            "objectives",
+            "analysis",
+            "engineering_owner",
+            "bugzilla_id",
+            "data_science_issue_url",
+            "feature_bugzilla_url",
+        ),
+    ),
+)
+
+
+def forward_search_document(apps, schema_editor):
+    Experiment = apps.get_model("experiments", "Experiment")
+
+    vector = None
+    for weight, fields in SEARCH_FIELD_WEIGHTS:
+        expressions = []
+        for field in fields:
+            if "__" in field:
+                relation, related_field = field.split("__")
+                related_model = Experiment._meta.get_field(relation).related_model
+                field = Subquery(
+                    related_model.objects.filter(id=OuterRef(f"{relation}_id")).values(
+                        related_field
+                    )[:1]
+                )
+            expressions.append(field)
+
+        weighted_vector = SearchVector(*expressions, weight=weight)
+        vector = weighted_vector if vector is None else vector + weighted_vector
+
+    experiment_ids = list(Experiment.objects.order_by("id").values_list("id", flat=True))
+    for i in range(0, len(experiment_ids), BACKFILL_BATCH_SIZE):
+        Experiment.objects.filter(
+            id__in=experiment_ids[i : i + BACKFILL_BATCH_SIZE]
+        ).update(search_document=vector)
+
+
+class Migration(migrations.Migration):
+
+    # each backfill batch commits on its own instead of holding locks on
+    # every experiment row until the whole table is done
+    atomic = False
+
+    dependencies = [
+        ("experiments", "0110_experiment_latest_change"),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name="experiment",
+            name="search_document",
+            field=django.contrib.postgres.search.SearchVectorField(blank=True, null=True),
+        ),
+        migrations.AddIndex(
+            model_name="experiment",
+            index=django.contrib.postgres.indexes.GinIndex(
+                fields=["search_document"], name="experiments_search__55917b_gin"
+            ),
+        ),
+        migrations.RunPython(forward_search_document, migrations.RunPython.noop),
+    ]
@@ -0,0 +1,43 @@
+import re
+
+from django.db import migrations, models
+
+
+VERSION_REGEX = re.compile(r"[\d]+")
+
+
+def forward_version_ints(apps, schema_editor):
+    Experiment = apps.get_model("experiments", "Experiment")
+
+    for field in ("firefox_min_version", "firefox_max_version"):
+        versions = (
+            Experiment.objects.exclude(**{field: None})
+            .exclude(**{field: ""})
+            .values_list(field, flat=True)
+            .distinct()
+        )
+        for version in versions:
+            Experiment.objects.filter(**{field: version}).update(
+                **{f"{field}_int": int(VERSION_REGEX.match(version).group(0))}
+            )
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ("experiments", "0111_experiment_search_document"),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name="experiment",
+            name="firefox_max_version_int",
+            field=models.PositiveIntegerField(blank=True, db_index=True, null=True),
+        ),
+        migrations.AddField(
+            model_name="experiment",
+            name="firefox_min_version_int",
+            field=models.PositiveIntegerField(blank=True, db_index=True, null=True),
+        ),
+        migrations.RunPython(forward_version_ints, migrations.RunPython.noop),
+    ]
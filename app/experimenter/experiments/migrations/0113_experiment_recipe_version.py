@@ -0,0 +1,19 @@
+# Generated by Django 3.0.7 on 2026-10-18 02:51
+
+from django.db import migrations, models
+import uuid
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ("experiments", "0112_experiment_version_ints"),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name="experiment",
+            name="recipe_version",
+            field=models.UUIDField(default=uuid.uuid4, editable=False),
+        ),
+    ]
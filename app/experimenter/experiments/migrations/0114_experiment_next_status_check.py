@@ -0,0 +1,18 @@
+# Generated by Django 3.0.7 on 2026-10-18 04:21
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ("experiments", "0113_experiment_recipe_version"),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name="experiment",
+            name="next_status_check",
+            field=models.DateTimeField(blank=True, db_index=True, null=True),
+        ),
+    ]
@@ -4,15 +4,18 @@ import copy
 import datetime
 import json
 import time
+import uuid
 
 from django.conf import settings
 from django.contrib.auth import get_user_model
 from django.contrib.postgres.fields import ArrayField
 from django.contrib.postgres.fields import JSONField
+from django.contrib.postgres.indexes import GinIndex
+from django.contrib.postgres.search import SearchVector, SearchVectorField
 from django.core.serializers.json import DjangoJSONEncoder
 from django.core.validators import MaxValueValidator
-from django.db import models
-from django.db.models import Case, Max, Value, When
+from django.db import models, transaction
+from django.db.models import Case, Max, OuterRef, Q, Subquery, Value, When
 from django.urls import reverse
 from django.utils import timezone
 from django.utils.functional import cached_property
@@ -28,9 +31,6 @@ def default_all_platforms():
 
 
 class ExperimentManager(models.Manager):
-    def get_queryset(self):
-        return super().get_queryset().annotate(latest_change=Max("changes__changed_on"))
-
     def get_prefetched(self):
         return self.get_queryset().prefetch_related(
             "changes__changed_by",
@@ -45,6 +45,11 @@ class ExperimentManager(models.Manager):
             "variants",
         )
 
+    def status_check_due(self):
+        return self.get_queryset().filter(
+            Q(next_status_check__isnull=True) | Q(next_status_check__lte=timezone.now())
+        )
+
 
 class Experiment(ExperimentConstants, models.Model):
     type = models.CharField(
@@ -185,6 +190,12 @@ class Experiment(ExperimentConstants, models.Model):
         blank=True,
         null=True,
     )
+    firefox_min_version_int = models.PositiveIntegerField(
+        blank=True, null=True, db_index=True
+    )
+    firefox_max_version_int = models.PositiveIntegerField(
+        blank=True, null=True, db_index=True
+    )
     firefox_channel = models.CharField(
         max_length=255,
         choices=ExperimentConstants.CHANNEL_CHOICES,
@@ -287,6 +298,18 @@ class Experiment(ExperimentConstants, models.Model):
 
     is_paused = models.BooleanField(default=False)
 
+    # Dates materialized from the change log and proposed dates
+    start_date = models.DateField(blank=True, null=True, db_index=True)
+    enrollment_end_date = models.DateField(blank=True, null=True, db_index=True)
+    end_date = models.DateField(blank=True, null=True, db_index=True)
+    latest_change = models.DateTimeField(blank=True, null=True, db_index=True)
+
+    # When the status tasks next poll Normandy or Kinto for this experiment
+    next_status_check = models.DateTimeField(blank=True, null=True, db_index=True)
+
+    search_document = SearchVectorField(blank=True, null=True)
+    recipe_version = models.UUIDField(default=uuid.uuid4, editable=False)
+
     # results fields
     results_url = models.URLField(blank=True, null=True)
     results_initial = models.TextField(blank=True, null=True)
@@ -315,6 +338,7 @@ class Experiment(ExperimentConstants, models.Model):
     class Meta:
         verbose_name = "Experiment"
         verbose_name_plural = "Experiments"
+        indexes = (GinIndex(fields=("search_document",)),)
 
     def get_absolute_url(self):
         return reverse("experiments-detail", kwargs={"slug": self.slug})
@@ -456,28 +480,138 @@ class Experiment(ExperimentConstants, models.Model):
             or self.feature_bugzilla_url
         )
 
-    def _transition_date(self, old_status, new_status):
-        for change in self.changes.all():
-            if change.old_status == old_status and change.new_status == new_status:
-                return change.changed_on.date()
+    def save(self, *args, **kwargs):
+        self._set_lifecycle_dates()
+        self.firefox_min_version_int = self.version_integer(self.firefox_min_version)
+        self.firefox_max_version_int = self.version_integer(self.firefox_max_version)
+        self.recipe_version = uuid.uuid4()
+
+        update_fields = kwargs.get("update_fields")
+        if update_fields is not None:
+            kwargs["update_fields"] = (
+                set(update_fields)
+                | set(self.CHANGE_LOG_DERIVED_FIELDS)
+                | set(self.VERSION_INTEGER_FIELDS)
+                | {"recipe_version"}
+            )
 
-    @property
-    def start_date(self):
+        super().save(*args, **kwargs)
+        self.update_search_document()
+
+    def update_search_document(self):
+        Experiment.objects.filter(id=self.id).update(
+            search_document=Experiment.search_vector()
+        )
+
+    @classmethod
+    def lifecycle_changes_filter(cls):
         return (
-            self._transition_date(self.STATUS_ACCEPTED, self.STATUS_LIVE)
-            or self.proposed_start_date
+            Q(old_status=cls.STATUS_ACCEPTED, new_status=cls.STATUS_LIVE)
+            | Q(old_status=cls.STATUS_LIVE, new_status=cls.STATUS_COMPLETE)
+            | Q(message=cls.ENROLLMENT_COMPLETE_MESSAGE)
+        )
+
+    def _set_lifecycle_dates(self):
+        latest_change = None
+        changes = []
+
+        if self.pk:
+            latest_change = self.changes.aggregate(latest_change=Max("changed_on"))[
+                "latest_change"
+            ]
+            changes = self.changes.filter(self.lifecycle_changes_filter())
+
+        self._apply_lifecycle_dates(latest_change, changes)
+
+    def _apply_lifecycle_dates(self, latest_change, changes):
+        launched_on = paused_on = completed_on = None
+
+        # walk newest to oldest so the earliest matching change wins
+        for change in sorted(changes, key=lambda c: c.changed_on, reverse=True):
+            changed_on = change.changed_on.date()
+
+            if change.message == self.ENROLLMENT_COMPLETE_MESSAGE:
+                paused_on = changed_on
+
+            transition = (change.old_status, change.new_status)
+            if transition == (self.STATUS_ACCEPTED, self.STATUS_LIVE):
+                launched_on = changed_on
+            elif transition == (self.STATUS_LIVE, self.STATUS_COMPLETE):
+                completed_on = changed_on
+
+        self.latest_change = latest_change
+        self.start_date = launched_on or self.proposed_start_date
+        self.enrollment_end_date = paused_on or self._compute_end_date(
+            self.proposed_enrollment
         )
+        self.end_date = completed_on or self._compute_end_date(self.proposed_duration)
+
+    def update_lifecycle_dates(self):
+        self._set_lifecycle_dates()
+        Experiment.objects.filter(id=self.id).update(
+            **{field: getattr(self, field) for field in self.CHANGE_LOG_DERIVED_FIELDS}
+        )
+
+    @classmethod
+    def bulk_update_lifecycle_dates(cls, experiment_ids):
+        experiments = (
+            cls.objects.filter(id__in=experiment_ids)
+            .annotate(latest_changed_on=Max("changes__changed_on"))
+            .prefetch_related(
+                models.Prefetch(
+                    "changes",
+                    queryset=ExperimentChangeLog.objects.filter(
+                        cls.lifecycle_changes_filter()
+                    ),
+                    to_attr="lifecycle_changes",
+                )
+            )
+        )
+
+        for experiment in experiments:
+            experiment._apply_lifecycle_dates(
+                experiment.latest_changed_on, experiment.lifecycle_changes
+            )
+
+        cls.objects.bulk_update(experiments, cls.CHANGE_LOG_DERIVED_FIELDS)
+
+    def get_next_status_check(self, now=None):
+        # experiments close to a status change are polled often, the rest
+        # rarely, and statuses nothing polls for are never scheduled
+        now = now or timezone.now()
+
+        if self.status in (self.STATUS_SHIP, self.STATUS_ACCEPTED):
+            interval = settings.STATUS_CHECK_ACTIVE_INTERVAL
+        elif self.status == self.STATUS_LIVE:
+            transition_window = now.date() + datetime.timedelta(
+                days=settings.STATUS_CHECK_TRANSITION_DAYS
+            )
+            near_transition = any(
+                date and date <= transition_window
+                for date in (self.enrollment_end_date, self.end_date)
+            )
+            interval = (
+                settings.STATUS_CHECK_ACTIVE_INTERVAL
+                if near_transition
+                else settings.STATUS_CHECK_DORMANT_INTERVAL
+            )
+        else:
+            return None
+
+        return now + datetime.timedelta(seconds=interval)
+
+    @classmethod
+    def schedule_status_checks(cls, experiments):
+        now = timezone.now()
+        for experiment in experiments:
+            experiment.next_status_check = experiment.get_next_status_check(now)
+
+        cls.objects.bulk_update(experiments, ["next_status_check"])
 
     def _compute_end_date(self, duration):
         if self.start_date and duration and 0 <= duration <= self.MAX_DURATION:
             return self.start_date + datetime.timedelta(days=duration)
 
-    @property
-    def end_date(self):
-        return self._transition_date(
-            self.STATUS_LIVE, self.STATUS_COMPLETE
-        ) or self._compute_end_date(self.proposed_duration)
-
     @property
     def total_duration(self):
         return (self.end_date - self.start_date).days
@@ -492,14 +626,6 @@ class Experiment(ExperimentConstants, models.Model):
     def ending_soon(self):
         return (self.end_date - datetime.date.today()) <= datetime.timedelta(days=5)
 
-    @property
-    def enrollment_end_date(self):
-        changes = self.changes.filter(message="Enrollment Complete")
-        if changes:
-            return changes[0].changed_on.date()
-        if self.proposed_enrollment:
-            return self._compute_end_date(self.proposed_enrollment)
-
     @property
     def enrollment_duration(self):
         return (self.enrollment_end_date - self.start_date).days
@@ -904,18 +1030,18 @@ class Experiment(ExperimentConstants, models.Model):
         else:
             return self.firefox_min_version
 
+    @staticmethod
+    def version_integer(version):
+        if version:
+            return int(ExperimentConstants.VERSION_REGEX.match(version).group(0))
+
     @property
     def firefox_max_version_integer(self):
-        if self.firefox_max_version:
-            return int(
-                ExperimentConstants.VERSION_REGEX.match(self.firefox_max_version).group(0)
-            )
+        return self.version_integer(self.firefox_max_version)
 
     @property
     def firefox_min_version_integer(self):
-        return int(
-            ExperimentConstants.VERSION_REGEX.match(self.firefox_min_version).group(0)
-        )
+        return self.version_integer(self.firefox_min_version)
 
     @property
     def use_branched_addon_serializer(self):
@@ -935,8 +1061,30 @@ class Experiment(ExperimentConstants, models.Model):
 
     @property
     def versions_integer_list(self):
-        max = self.firefox_max_version_integer or self.firefox_min_version_integer
-        return list(range(self.firefox_min_version_integer, max + 1))
+        # the stored integers are only unset before the first save
+        min_version = self.firefox_min_version_int
+        if min_version is None:
+            min_version = self.firefox_min_version_integer
+
+        max_version = self.firefox_max_version_int
+        if max_version is None:
+            max_version = self.firefox_max_version_integer
+
+        return list(range(min_version, (max_version or min_version) + 1))
+
+    @classmethod
+    def with_version_integers(cls, changed_data):
+        # the stored integers only mirror the version strings for filtering
+        # and ordering, .update() skips save() so they are derived here
+        changed_data = dict(changed_data)
+        for field, int_field in (
+            ("firefox_min_version", "firefox_min_version_int"),
+            ("firefox_max_version", "firefox_max_version_int"),
+        ):
+            if field in changed_data:
+                changed_data[int_field] = cls.version_integer(changed_data[field])
+
+        return changed_data
 
     @property
     def population(self):
@@ -971,6 +1119,30 @@ class Experiment(ExperimentConstants, models.Model):
             output_field=models.IntegerField(),
         )
 
+    @staticmethod
+    def search_vector():
+        """A weighted SearchVector that can be stored in Experiment.search_document."""
+        vector = None
+
+        for weight, fields in ExperimentConstants.SEARCH_FIELD_WEIGHTS:
+            expressions = []
+            for field in fields:
+                if "__" in field:
+                    # Joins aren't allowed in an UPDATE so use a subquery
+                    relation, related_field = field.split("__")
+                    related_model = Experiment._meta.get_field(relation).related_model
+                    field = Subquery(
+                        related_model.objects.filter(
+                            id=OuterRef(f"{relation}_id")
+                        ).values(related_field)[:1]
+                    )
+                expressions.append(field)
+
+            weighted_vector = SearchVector(*expressions, weight=weight)
+            vector = weighted_vector if vector is None else vector + weighted_vector
+
+        return vector
+
     @property
     def is_archivable(self):
         not_archivable = (self.STATUS_LIVE, self.STATUS_ACCEPTED)
@@ -1249,6 +1421,11 @@ class ExperimentChangeLog(models.Model):
         else:
             return self.pretty_status
 
+    def save(self, *args, **kwargs):
+        with transaction.atomic():
+            super().save(*args, **kwargs)
+            self.experiment.update_lifecycle_dates()
+
     @property
     def pretty_status(self):
         return self.PRETTY_STATUS_LABELS.get(self.old_status, {}).get(self.new_status, "")
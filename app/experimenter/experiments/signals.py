@@ -0,0 +1,122 @@
+import uuid
+
+from django.contrib.auth import get_user_model
+from django.db import transaction
+from django.db.models import Q
+from django.db.models.signals import m2m_changed, post_delete, post_save
+from django.dispatch import receiver
+from django.utils import timezone
+
+from experimenter.celery import app
+
+from experimenter.experiments.models import (
+    Experiment,
+    ExperimentBucketRange,
+    ExperimentChangeLog,
+    ExperimentVariant,
+    RolloutPreference,
+    VariantPreferences,
+)
+
+
+# (is rapid, status) to the task that polls for the next transition
+STATUS_CHECK_TASKS = {
+    (False, Experiment.STATUS_SHIP): (
+        "experimenter.normandy.tasks.update_recipe_ids_to_experiments"
+    ),
+    (False, Experiment.STATUS_ACCEPTED): (
+        "experimenter.normandy.tasks.update_launched_experiments"
+    ),
+    (False, Experiment.STATUS_LIVE): (
+        "experimenter.normandy.tasks.update_launched_experiments"
+    ),
+    (True, Experiment.STATUS_REVIEW): "experimenter.kinto.tasks.check_kinto_push_queue",
+    (True, Experiment.STATUS_ACCEPTED): (
+        "experimenter.kinto.tasks.check_experiment_is_live"
+    ),
+    (
+        True,
+        Experiment.STATUS_LIVE,
+    ): "experimenter.kinto.tasks.check_experiment_is_complete",
+}
+
+
+def update_recipe_version(**filters):
+    # Experiment.save() sets its own recipe_version, this covers writes to
+    # related rows that end up in a serialized recipe
+    Experiment.objects.filter(**filters).update(recipe_version=uuid.uuid4())
+
+
+@receiver(post_save, sender=ExperimentVariant)
+@receiver(post_delete, sender=ExperimentVariant)
+@receiver(post_save, sender=RolloutPreference)
+@receiver(post_delete, sender=RolloutPreference)
+@receiver(post_save, sender=ExperimentBucketRange)
+@receiver(post_delete, sender=ExperimentBucketRange)
+@receiver(post_save, sender=ExperimentChangeLog)
+def experiment_child_changed(sender, instance, **kwargs):
+    update_recipe_version(id=instance.experiment_id)
+
+
+@receiver(post_save, sender=VariantPreferences)
+@receiver(post_delete, sender=VariantPreferences)
+def variant_preference_changed(sender, instance, **kwargs):
+    update_recipe_version(variants=instance.variant_id)
+
+
+@receiver(m2m_changed, sender=Experiment.countries.through)
+@receiver(m2m_changed, sender=Experiment.locales.through)
+def experiment_targeting_changed(sender, instance, action, reverse, pk_set, **kwargs):
+    if action not in ("post_add", "post_remove", "post_clear"):
+        return
+
+    if not reverse:
+        update_recipe_version(id=instance.id)
+    elif pk_set:
+        update_recipe_version(id__in=pk_set)
+
+
+@receiver(post_save, sender=get_user_model())
+def user_changed(sender, instance, created, update_fields, **kwargs):
+    # owner emails are part of the search document of every experiment the
+    # user owns, logins only touch last_login so they are skipped
+    if created or (update_fields is not None and "email" not in update_fields):
+        return
+
+    Experiment.objects.filter(Q(owner=instance) | Q(analysis_owner=instance)).update(
+        search_document=Experiment.search_vector()
+    )
+
+
+def handle_status_changes(change_logs):
+    """
+    Marks experiments whose status changed as due for a status check and
+    wakes the tasks that poll for their next transition, for change logs
+    saved one by one as well as those written with bulk_create.
+    """
+    changed = [
+        change_log
+        for change_log in change_logs
+        if change_log.old_status != change_log.new_status
+    ]
+    if not changed:
+        return
+
+    Experiment.objects.filter(
+        id__in={change_log.experiment_id for change_log in changed}
+    ).update(next_status_check=timezone.now())
+
+    task_names = {
+        STATUS_CHECK_TASKS.get(
+            (change_log.experiment.is_rapid_experiment, change_log.new_status)
+        )
+        for change_log in changed
+    }
+    for task_name in sorted(task_names - {None}):
+        transaction.on_commit(lambda task_name=task_name: app.send_task(task_name))
+
+
+@receiver(post_save, sender=ExperimentChangeLog)
+def experiment_status_changed(sender, instance, created, **kwargs):
+    if created:
+        handle_status_changes([instance])
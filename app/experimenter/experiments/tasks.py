@@ -0,0 +1,21 @@
+import markus
+from celery.utils.log import get_task_logger
+
+from experimenter.celery import app
+from experimenter.experiments.email import send_period_ending_emails
+
+
+logger = get_task_logger(__name__)
+metrics = markus.get_metrics("experiments.tasks")
+
+
+@app.task
+@metrics.timer_decorator("send_period_ending_emails.timing")
+def send_period_ending_emails_task():
+    metrics.incr("send_period_ending_emails.started")
+    logger.info("Sending period ending emails")
+
+    sent = send_period_ending_emails()
+
+    metrics.incr("send_period_ending_emails.sent", value=sent)
+    metrics.incr("send_period_ending_emails.completed")
@@ -1,5 +1,7 @@
 import json
 
+import mock
+
 from django.conf import settings
 from django.test import TestCase
 from django.urls import reverse
@@ -8,7 +10,13 @@ from parameterized import parameterized
 from experimenter.experiments.constants import ExperimentConstants
 from experimenter.experiments.models import Experiment
 from experimenter.experiments.api.v1.serializers import ExperimentSerializer
-from experimenter.experiments.tests.factories import ExperimentFactory
+from experimenter.experiments.api.v1.views import ExperimentRecipeView
+from experimenter.base.tests.factories import CountryFactory, LocaleFactory
+from experimenter.experiments.tests.factories import (
+    ExperimentFactory,
+    VariantPreferencesFactory,
+)
+from experimenter.openidc.tests.factories import UserFactory
 from experimenter.normandy.serializers import ExperimentRecipeSerializer
 
 
@@ -113,3 +121,105 @@ class TestExperimentRecipeView(TestCase):
             **{settings.OPENIDC_EMAIL_HEADER: user_email},
         )
         self.assertEqual(response.status_code, 404)
+
+    @parameterized.expand([(1, 1), (5, 10)])
+    def test_get_experiment_recipe_uses_fixed_number_of_queries(
+        self, num_variants, num_preferences
+    ):
+        user_email = "user@example.com"
+        UserFactory.create(email=user_email, username=user_email)
+        experiment = ExperimentFactory.create_with_status(
+            ExperimentConstants.STATUS_LIVE,
+            num_variants=num_variants,
+            type=ExperimentConstants.TYPE_PREF,
+            is_multi_pref=True,
+            pref_type=ExperimentConstants.PREF_TYPE_INT,
+            firefox_min_version="80.0",
+            locales=[LocaleFactory.create()],
+            countries=[CountryFactory.create()],
+        )
+        for variant in experiment.variants.all():
+            VariantPreferencesFactory.create_batch(
+                num_preferences,
+                variant=variant,
+                pref_type=ExperimentConstants.PREF_TYPE_INT,
+                pref_value="1",
+            )
+
+        with self.assertNumQueries(11):
+            response = self.client.get(
+                reverse("experiments-api-recipe", kwargs={"slug": experiment.slug}),
+                **{settings.OPENIDC_EMAIL_HEADER: user_email},
+            )
+
+        self.assertEqual(response.status_code, 200)
+        branches = json.loads(response.content)["arguments"]["branches"]
+        self.assertEqual(len(branches), num_variants)
+        for branch in branches:
+            self.assertEqual(len(branch["preferences"]), num_preferences)
+
+    def test_get_experiment_recipe_returns_304_for_matching_etag(self):
+        user_email = "user@example.com"
+        UserFactory.create(email=user_email, username=user_email)
+        experiment = ExperimentFactory.create_with_status(ExperimentConstants.STATUS_LIVE)
+        url = reverse("experiments-api-recipe", kwargs={"slug": experiment.slug})
+
+        response = self.client.get(url, **{settings.OPENIDC_EMAIL_HEADER: user_email})
+        self.assertEqual(response.status_code, 200)
+        etag = response["ETag"]
+
+        with self.assertNumQueries(1):
+            response = self.client.get(
+                url,
+                HTTP_IF_NONE_MATCH=etag,
+                **{settings.OPENIDC_EMAIL_HEADER: user_email},
+            )
+
+        self.assertEqual(response.status_code, 304)
+        self.assertEqual(response["ETag"], etag)
+
+    def test_get_experiment_recipe_serves_cached_recipe(self):
+        user_email = "user@example.com"
+        experiment = ExperimentFactory.create_with_status(ExperimentConstants.STATUS_LIVE)
+        url = reverse("experiments-api-recipe", kwargs={"slug": experiment.slug})
+
+        response = self.client.get(url, **{settings.OPENIDC_EMAIL_HEADER: user_email})
+
+        with mock.patch.object(ExperimentRecipeView, "get_serializer") as get_serializer:
+            cached_response = self.client.get(
+                url, **{settings.OPENIDC_EMAIL_HEADER: user_email}
+            )
+            get_serializer.assert_not_called()
+
+        self.assertEqual(cached_response.status_code, 200)
+        self.assertEqual(cached_response.content, response.content)
+        self.assertEqual(cached_response["ETag"], response["ETag"])
+
+    def test_get_experiment_recipe_changes_etag_after_variant_update(self):
+        user_email = "user@example.com"
+        experiment = ExperimentFactory.create_with_status(ExperimentConstants.STATUS_LIVE)
+        url = reverse("experiments-api-recipe", kwargs={"slug": experiment.slug})
+
+        response = self.client.get(url, **{settings.OPENIDC_EMAIL_HEADER: user_email})
+
+        variant = experiment.variants.first()
+        variant.slug = "updated-slug"
+        variant.save()
+
+        updated_response = self.client.get(
+            url,
+            HTTP_IF_NONE_MATCH=response["ETag"],
+            **{settings.OPENIDC_EMAIL_HEADER: user_email},
+        )
+
+        self.assertEqual(updated_response.status_code, 200)
+        self.assertNotEqual(updated_response["ETag"], response["ETag"])
+        self.assertIn(
+            "updated-slug",
+            [
+                branch["slug"]
+                for branch in json.loads(updated_response.content)["arguments"][
+                    "branches"
+                ]
+            ],
+        )
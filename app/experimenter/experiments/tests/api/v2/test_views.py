@@ -1,5 +1,6 @@
 import json
 
+import mock
 from django.conf import settings
 from django.core import mail
 from django.test import TestCase
@@ -18,7 +19,11 @@ from experimenter.experiments.api.v2.serializers import (
     ExperimentTimelinePopSerializer,
 )
 
-from experimenter.experiments.api.v2.views import ExperimentCSVRenderer
+from experimenter.base.tests.factories import LocaleFactory
+from experimenter.experiments.api.v2.views import (
+    ExperimentCSVListView,
+    ExperimentCSVRenderer,
+)
 from experimenter.experiments.tests.factories import (
     ExperimentFactory,
     ExperimentVariantFactory,
@@ -630,7 +635,7 @@ class TestExperimentCSVListView(TestCase):
 
         self.assertEqual(response.status_code, 200)
 
-        csv_data = response.content
+        csv_data = b"".join(response.streaming_content)
         expected_csv_data = ExperimentCSVRenderer().render(
             ExperimentCSVSerializer([experiment1, experiment2], many=True).data,
             renderer_context={"header": ExperimentCSVSerializer.Meta.fields},
@@ -655,7 +660,7 @@ class TestExperimentCSVListView(TestCase):
 
         self.assertEqual(response.status_code, 200)
 
-        csv_data = response.content
+        csv_data = b"".join(response.streaming_content)
         expected_csv_data = ExperimentCSVRenderer().render(
             ExperimentCSVSerializer([experiment1, experiment2], many=True).data,
             renderer_context={"header": ExperimentCSVSerializer.Meta.fields},
@@ -681,9 +686,39 @@ class TestExperimentCSVListView(TestCase):
 
         self.assertEqual(response.status_code, 200)
 
-        csv_data = response.content
+        csv_data = b"".join(response.streaming_content)
         expected_csv_data = ExperimentCSVRenderer().render(
             ExperimentCSVSerializer([experiment1, experiment2], many=True).data,
             renderer_context={"header": ExperimentCSVSerializer.Meta.fields},
         )
         self.assertEqual(csv_data, expected_csv_data)
+
+    def test_streams_chunks_with_a_fixed_number_of_queries_per_chunk(self):
+        user_email = "user@example.com"
+        UserFactory.create(email=user_email)
+        locales = [LocaleFactory.create(name=name) for name in ("German", "English")]
+        experiments = [
+            ExperimentFactory.create_with_status(
+                Experiment.STATUS_DRAFT, name=name, locales=locales
+            )
+            for name in ("a", "b", "c", "d", "e")
+        ]
+
+        with mock.patch.object(ExperimentCSVListView, "chunk_size", 2):
+            response = self.client.get(
+                reverse("experiments-api-csv"),
+                **{settings.OPENIDC_EMAIL_HEADER: user_email},
+            )
+            # 1 id query, then per chunk of 2: experiments, projects, locales
+            # and countries
+            with self.assertNumQueries(1 + 3 * 4):
+                csv_data = b"".join(response.streaming_content)
+
+        self.assertEqual(response.status_code, 200)
+        self.assertEqual(response["Content-Type"], "text/csv")
+        expected_csv_data = ExperimentCSVRenderer().render(
+            ExperimentCSVSerializer(experiments, many=True).data,
+            renderer_context={"header": ExperimentCSVSerializer.Meta.fields},
+        )
+        self.assertEqual(csv_data, expected_csv_data)
+        self.assertIn(b'"English, German"', csv_data)
@@ -2,6 +2,7 @@ import json
 
 from django.test import TestCase
 from django.urls import reverse
+from parameterized import parameterized
 
 from experimenter.experiments.models import Experiment
 from experimenter.experiments.api.v4.serializers import ExperimentRapidRecipeSerializer
@@ -32,6 +33,39 @@ class TestExperimentListView(TestCase):
         expected_names = set(e.name for e in experiments)
         self.assertEqual(json_data_names, expected_names)
 
+    @parameterized.expand([(1,), (10,)])
+    def test_list_view_uses_fixed_number_of_queries(self, num_of_experiments):
+        for i in range(num_of_experiments):
+            ExperimentRapidFactory.create_with_status(Experiment.STATUS_LIVE)
+
+        with self.assertNumQueries(3):
+            response = self.client.get(reverse("experiment-rapid-recipe-list"))
+
+        self.assertEqual(response.status_code, 200)
+        self.assertEqual(len(json.loads(response.content)), num_of_experiments)
+
+    def test_list_view_returns_304_until_an_experiment_changes(self):
+        experiment = ExperimentRapidFactory.create_with_status(Experiment.STATUS_LIVE)
+        url = reverse("experiment-rapid-recipe-list")
+
+        response = self.client.get(url)
+        etag = response["ETag"]
+
+        with self.assertNumQueries(1):
+            response = self.client.get(url, HTTP_IF_NONE_MATCH=etag)
+        self.assertEqual(response.status_code, 304)
+
+        experiment.name = "Updated Name"
+        experiment.save()
+
+        response = self.client.get(url, HTTP_IF_NONE_MATCH=etag)
+        self.assertEqual(response.status_code, 200)
+        self.assertNotEqual(response["ETag"], etag)
+        self.assertEqual(
+            json.loads(response.content)[0]["arguments"]["userFacingName"],
+            "Updated Name",
+        )
+
 
 class TestExperimentRapidRecipeView(TestCase):
     def test_get_rapid_experiment_recipe_returns_recipe_info_for_experiment(self):
@@ -62,3 +96,16 @@ class TestExperimentRapidRecipeView(TestCase):
         )
 
         self.assertEqual(response.status_code, 404)
+
+    def test_get_rapid_experiment_recipe_returns_304_for_matching_etag(self):
+        experiment = ExperimentRapidFactory.create_with_status(Experiment.STATUS_LIVE)
+        url = reverse(
+            "experiment-rapid-recipe-detail",
+            kwargs={"recipe_slug": experiment.recipe_slug},
+        )
+
+        etag = self.client.get(url)["ETag"]
+        response = self.client.get(url, HTTP_IF_NONE_MATCH=etag)
+
+        self.assertEqual(response.status_code, 304)
+        self.assertEqual(response["ETag"], etag)
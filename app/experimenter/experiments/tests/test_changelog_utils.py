@@ -1,4 +1,5 @@
 from django.test import TestCase
+from parameterized import parameterized
 
 from experimenter.base.tests.factories import CountryFactory, LocaleFactory
 from experimenter.experiments.models import Experiment
@@ -9,7 +10,9 @@ from experimenter.experiments.tests.factories import (
     VariantPreferencesFactory,
 )
 from experimenter.experiments.changelog_utils import (
+    bulk_update_experiments_with_change_log,
     generate_change_log,
+    update_experiment_with_change_log,
     ChangeLogSerializer,
 )
 from experimenter.projects.tests.factories import ProjectFactory
@@ -157,6 +160,24 @@ class TestChangeLogSerializer(TestCase):
 
         self.assertEqual(serializer.data, expected_data)
 
+    def test_serializer_limits_output_to_given_fields_and_variants(self):
+        experiment = ExperimentFactory.create_with_variants(
+            num_variants=2,
+            locales=[LocaleFactory.create()],
+            countries=[CountryFactory.create()],
+            projects=[ProjectFactory.create()],
+        )
+        full_data = ChangeLogSerializer(experiment).data
+
+        # variants, each variant's preferences and countries, but no locales,
+        # projects or related experiments
+        with self.assertNumQueries(4):
+            data = ChangeLogSerializer(experiment, fields=["name", "countries"]).data
+
+        self.assertEqual(set(data.keys()), set(["name", "countries", "variants"]))
+        for field, value in data.items():
+            self.assertEqual(value, full_data[field])
+
 
 class TestChangeLogUtils(TestCase):
     def test_generate_change_log_gives_correct_output(self):
@@ -293,3 +314,99 @@ class TestChangeLogUtils(TestCase):
         )
         changed_values = experiment.changes.latest().changed_values
         self.assertEqual(changed_values, {})
+
+    def test_update_experiment_with_change_log_stores_version_integers(self):
+        experiment = ExperimentFactory.create(
+            firefox_min_version="57.0", firefox_max_version="59.0"
+        )
+
+        update_experiment_with_change_log(
+            experiment,
+            {"firefox_min_version": "58.0", "firefox_max_version": ""},
+            "dev@example.com",
+        )
+
+        experiment = Experiment.objects.get(id=experiment.id)
+        self.assertEqual(experiment.firefox_min_version_int, 58)
+        self.assertIsNone(experiment.firefox_max_version_int)
+
+
+class TestBulkUpdateExperimentsWithChangeLog(TestCase):
+    def test_updates_experiments_and_writes_change_logs(self):
+        experiment1 = ExperimentFactory.create_with_status(Experiment.STATUS_ACCEPTED)
+        experiment2 = ExperimentFactory.create_with_status(Experiment.STATUS_ACCEPTED)
+        old_recipe_version = experiment1.recipe_version
+
+        updated = bulk_update_experiments_with_change_log(
+            [
+                (experiment1, {"status": Experiment.STATUS_LIVE, "normandy_id": 1}),
+                (experiment2, {"normandy_id": 2}),
+            ],
+            "dev@example.com",
+        )
+
+        self.assertEqual([e.id for e in updated], [experiment1.id, experiment2.id])
+
+        experiment1 = Experiment.objects.get(id=experiment1.id)
+        self.assertEqual(experiment1.status, Experiment.STATUS_LIVE)
+        self.assertEqual(experiment1.normandy_id, 1)
+        self.assertNotEqual(experiment1.recipe_version, old_recipe_version)
+
+        change1 = experiment1.changes.latest()
+        self.assertEqual(change1.changed_by.email, "dev@example.com")
+        self.assertEqual(change1.old_status, Experiment.STATUS_ACCEPTED)
+        self.assertEqual(change1.new_status, Experiment.STATUS_LIVE)
+        self.assertEqual(
+            change1.changed_values["normandy_id"],
+            {"old_value": None, "new_value": 1, "display_name": "Normandy Id"},
+        )
+        self.assertEqual(experiment1.latest_change, change1.changed_on)
+        self.assertEqual(experiment1.start_date, change1.changed_on.date())
+
+        experiment2 = Experiment.objects.get(id=experiment2.id)
+        change2 = experiment2.changes.latest()
+        self.assertEqual(experiment2.normandy_id, 2)
+        self.assertEqual(change2.old_status, Experiment.STATUS_ACCEPTED)
+        self.assertEqual(change2.new_status, Experiment.STATUS_ACCEPTED)
+        self.assertEqual(list(change2.changed_values), ["normandy_id"])
+        self.assertEqual(experiment2.latest_change, change2.changed_on)
+        self.assertEqual(experiment2.start_date, experiment2.proposed_start_date)
+
+    def test_matches_single_experiment_change_log(self):
+        experiment1 = ExperimentFactory.create_with_status(Experiment.STATUS_ACCEPTED)
+        experiment2 = ExperimentFactory.create_with_status(Experiment.STATUS_ACCEPTED)
+        changed_data = {"status": Experiment.STATUS_LIVE, "normandy_id": 1}
+
+        update_experiment_with_change_log(experiment1, changed_data, "dev@example.com")
+        bulk_update_experiments_with_change_log(
+            [(experiment2, changed_data)], "dev@example.com"
+        )
+
+        self.assertEqual(
+            experiment1.changes.latest().changed_values,
+            experiment2.changes.latest().changed_values,
+        )
+
+    def test_no_changes_does_nothing(self):
+        with self.assertNumQueries(0):
+            self.assertEqual(
+                bulk_update_experiments_with_change_log([], "dev@example.com"), []
+            )
+
+    @parameterized.expand([(1,), (10,)])
+    def test_uses_fixed_number_of_queries(self, num_of_experiments):
+        experiments = [
+            ExperimentFactory.create_with_status(Experiment.STATUS_ACCEPTED)
+            for i in range(num_of_experiments)
+        ]
+        UserFactory.create(email="dev@example.com", username="dev@example.com")
+
+        # one more to mark the experiments due for a status check
+        with self.assertNumQueries(17):
+            bulk_update_experiments_with_change_log(
+                [
+                    (experiment, {"status": Experiment.STATUS_LIVE})
+                    for experiment in experiments
+                ],
+                "dev@example.com",
+            )
@@ -7,6 +7,7 @@ from django.http.request import QueryDict
 from django.test import TestCase
 from django.urls import reverse
 
+from experimenter.experiments.changelog_utils import update_experiment_with_change_log
 from experimenter.experiments.filtersets import ExperimentFilterset
 from experimenter.experiments.models import Experiment
 from experimenter.experiments.tests.factories import ExperimentFactory
@@ -138,6 +139,22 @@ class TestExperimentFilterset(MockRequestMixin, TestCase):
         )
         self.assertEqual(set(filter.qs), set([exp_1, exp_2, exp_3]))
 
+    def test_filters_by_three_digit_firefox_version(self):
+        exp_1 = ExperimentFactory.create_with_variants(
+            firefox_min_version="99.0", firefox_max_version="101.0"
+        )
+        exp_2 = ExperimentFactory.create_with_variants(
+            firefox_min_version="100.0", firefox_max_version=""
+        )
+        ExperimentFactory.create_with_variants(
+            firefox_min_version="55.0", firefox_max_version="56.0"
+        )
+
+        filter = ExperimentFilterset(
+            {"firefox_version": "100.0"}, queryset=Experiment.objects.all()
+        )
+        self.assertEqual(set(filter.qs), set([exp_1, exp_2]))
+
     def test_filters_by_firefox_channel(self):
         include_channel = Experiment.CHANNEL_CHOICES[1][0]
         exclude_channel = Experiment.CHANNEL_CHOICES[2][0]
@@ -222,6 +239,62 @@ class TestExperimentFilterset(MockRequestMixin, TestCase):
         self.assertEqual(set(first_response_context["experiments"]), set([exp_1, exp_2]))
         self.assertEqual(set(second_response_context["experiments"]), set([exp_3]))
 
+    def test_search_ranks_name_matches_above_description_matches(self):
+        exp_1 = ExperimentFactory.create(
+            name="An experiment", short_description="Something about zebras"
+        )
+        exp_2 = ExperimentFactory.create(name="Zebra experiment")
+        ExperimentFactory.create(name="Another experiment")
+
+        filter = ExperimentFilterset(
+            {"search": "zebra"}, queryset=Experiment.objects.all()
+        )
+
+        self.assertEqual(list(filter.qs), [exp_2, exp_1])
+
+    def test_search_matches_owner_email(self):
+        owner = UserFactory.create(email="giraffe@example.com")
+        experiment = ExperimentFactory.create(owner=owner)
+        ExperimentFactory.create()
+
+        filter = ExperimentFilterset(
+            {"search": "giraffe@example.com"}, queryset=Experiment.objects.all()
+        )
+
+        self.assertEqual(list(filter.qs), [experiment])
+
+    def test_search_matches_changed_owner_email(self):
+        owner = UserFactory.create(email="giraffe@example.com")
+        analysis_owner = UserFactory.create(email="zebra@example.com")
+        experiment = ExperimentFactory.create(owner=owner, analysis_owner=analysis_owner)
+
+        owner.email = "okapi@example.com"
+        owner.save()
+        analysis_owner.email = "tapir@example.com"
+        analysis_owner.save(update_fields=["email"])
+
+        for email, expected in (
+            ("giraffe@example.com", []),
+            ("okapi@example.com", [experiment]),
+            ("tapir@example.com", [experiment]),
+        ):
+            filter = ExperimentFilterset(
+                {"search": email}, queryset=Experiment.objects.all()
+            )
+            self.assertEqual(list(filter.qs), expected)
+
+    def test_search_matches_fields_changed_by_change_log_update(self):
+        experiment = ExperimentFactory.create()
+        update_experiment_with_change_log(
+            experiment, {"recipe_slug": "okapi-recipe"}, "user@example.com"
+        )
+
+        filter = ExperimentFilterset(
+            {"search": "okapi-recipe"}, queryset=Experiment.objects.all()
+        )
+
+        self.assertEqual(list(filter.qs), [experiment])
+
     def test_filters_by_review_in_qa(self):
         exp_1 = ExperimentFactory.create_with_variants(
             review_qa_requested=True, review_qa=False
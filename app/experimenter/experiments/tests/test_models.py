@@ -64,6 +64,40 @@ class TestExperimentManager(TestCase):
             [experiment1, experiment2],
         )
 
+    def test_latest_change_is_stored_on_change_log_create(self):
+        now = timezone.now()
+        experiment = ExperimentFactory.create_with_variants()
+        self.assertIsNone(Experiment.objects.get(id=experiment.id).latest_change)
+
+        ExperimentChangeLogFactory.create(
+            experiment=experiment,
+            old_status=None,
+            new_status=Experiment.STATUS_DRAFT,
+            changed_on=now,
+        )
+        ExperimentChangeLogFactory.create(
+            experiment=experiment,
+            old_status=None,
+            new_status=Experiment.STATUS_DRAFT,
+            changed_on=(now - datetime.timedelta(days=1)),
+        )
+
+        self.assertEqual(experiment.latest_change, now)
+        self.assertEqual(Experiment.objects.get(id=experiment.id).latest_change, now)
+
+    def test_save_does_not_overwrite_latest_change_with_stale_value(self):
+        experiment = ExperimentFactory.create_with_variants()
+        stale_experiment = Experiment.objects.get(id=experiment.id)
+        change = ExperimentChangeLogFactory.create(
+            experiment=experiment, old_status=None, new_status=Experiment.STATUS_DRAFT
+        )
+
+        stale_experiment.save()
+
+        self.assertEqual(
+            Experiment.objects.get(id=experiment.id).latest_change, change.changed_on
+        )
+
 
 class TestExperimentModel(TestCase):
     def test_get_absolute_url(self):
@@ -526,6 +560,56 @@ class TestExperimentModel(TestCase):
         )
         self.assertFalse(experiment_2.enrollment_ending_soon)
 
+    @override_settings(
+        STATUS_CHECK_ACTIVE_INTERVAL=60,
+        STATUS_CHECK_DORMANT_INTERVAL=1800,
+        STATUS_CHECK_TRANSITION_DAYS=1,
+    )
+    def test_get_next_status_check(self):
+        now = timezone.now()
+        today = now.date()
+
+        shipped = ExperimentFactory.build(status=Experiment.STATUS_SHIP)
+        self.assertEqual(
+            shipped.get_next_status_check(now), now + datetime.timedelta(seconds=60)
+        )
+
+        pausing = ExperimentFactory.build(
+            status=Experiment.STATUS_LIVE,
+            enrollment_end_date=today + datetime.timedelta(days=1),
+            end_date=today + datetime.timedelta(days=20),
+        )
+        self.assertEqual(
+            pausing.get_next_status_check(now), now + datetime.timedelta(seconds=60)
+        )
+
+        dormant = ExperimentFactory.build(
+            status=Experiment.STATUS_LIVE,
+            enrollment_end_date=None,
+            end_date=today + datetime.timedelta(days=20),
+        )
+        self.assertEqual(
+            dormant.get_next_status_check(now), now + datetime.timedelta(seconds=1800)
+        )
+
+        draft = ExperimentFactory.build(status=Experiment.STATUS_DRAFT)
+        self.assertIsNone(draft.get_next_status_check(now))
+
+    def test_status_check_due_includes_unscheduled_and_overdue(self):
+        unscheduled = ExperimentFactory.create()
+        overdue = ExperimentFactory.create()
+        scheduled = ExperimentFactory.create()
+        Experiment.objects.filter(id=overdue.id).update(
+            next_status_check=timezone.now() - datetime.timedelta(seconds=1)
+        )
+        Experiment.objects.filter(id=scheduled.id).update(
+            next_status_check=timezone.now() + datetime.timedelta(minutes=5)
+        )
+
+        self.assertEqual(
+            set(Experiment.objects.status_check_due()), {unscheduled, overdue}
+        )
+
     def test_experiment_ending_soon(self):
         experiment_1 = ExperimentFactory.create_with_variants(
             proposed_start_date=datetime.date.today(),
@@ -627,6 +711,57 @@ class TestExperimentModel(TestCase):
         self.assertEqual(experiment.enrollment_duration, 1)
         self.assertEqual(experiment.observation_duration, 3)
 
+    def test_change_log_updates_stored_lifecycle_dates(self):
+        experiment = ExperimentFactory.create_with_status(
+            target_status=Experiment.STATUS_ACCEPTED,
+            proposed_start_date=datetime.date(2019, 1, 1),
+            proposed_duration=20,
+            proposed_enrollment=10,
+        )
+        stored = Experiment.objects.get(id=experiment.id)
+        self.assertEqual(stored.start_date, datetime.date(2019, 1, 1))
+        self.assertEqual(stored.enrollment_end_date, datetime.date(2019, 1, 11))
+        self.assertEqual(stored.end_date, datetime.date(2019, 1, 21))
+
+        launched_on = timezone.now() - datetime.timedelta(days=2)
+        ExperimentChangeLogFactory.create(
+            experiment=stored,
+            old_status=Experiment.STATUS_ACCEPTED,
+            new_status=Experiment.STATUS_LIVE,
+            changed_on=launched_on,
+        )
+
+        stored = Experiment.objects.get(id=experiment.id)
+        self.assertEqual(stored.start_date, launched_on.date())
+        self.assertEqual(
+            stored.enrollment_end_date, launched_on.date() + datetime.timedelta(days=10)
+        )
+        self.assertEqual(
+            stored.end_date, launched_on.date() + datetime.timedelta(days=20)
+        )
+
+    def test_save_updates_stored_lifecycle_dates(self):
+        experiment = ExperimentFactory.create_with_variants(
+            proposed_start_date=datetime.date(2019, 1, 1),
+            proposed_duration=20,
+            proposed_enrollment=None,
+        )
+        Experiment.objects.filter(id=experiment.id).update(
+            proposed_start_date=datetime.date(2019, 2, 1)
+        )
+        experiment = Experiment.objects.get(id=experiment.id)
+        experiment.proposed_enrollment = 5
+        experiment.save(update_fields=["proposed_enrollment"])
+
+        self.assertTrue(
+            Experiment.objects.filter(
+                id=experiment.id,
+                start_date=datetime.date(2019, 2, 1),
+                enrollment_end_date=datetime.date(2019, 2, 6),
+                end_date=datetime.date(2019, 2, 21),
+            ).exists()
+        )
+
     def test_rollout_dates_low_risk_playbook(self):
         experiment = ExperimentFactory.create(
             type=Experiment.TYPE_ROLLOUT,
@@ -1392,6 +1527,14 @@ class TestExperimentModel(TestCase):
 
         self.assertEqual(experiment.versions_integer_list, [57, 58, 59])
 
+    def test_versions_integer_list_on_unsaved_experiment(self):
+        experiment = ExperimentFactory.build(
+            firefox_min_version="57.0", firefox_max_version="58.0"
+        )
+
+        self.assertIsNone(experiment.firefox_min_version_int)
+        self.assertEqual(experiment.versions_integer_list, [57, 58])
+
     def test_firefox_max_version_integer_returns_correct_integer(self):
         experiment = ExperimentFactory(
             firefox_min_version="57.0", firefox_max_version="59.0"
@@ -1406,6 +1549,19 @@ class TestExperimentModel(TestCase):
 
         self.assertEqual(experiment.firefox_min_version_integer, 57)
 
+    def test_save_stores_firefox_version_integers(self):
+        experiment = ExperimentFactory(
+            firefox_min_version="99.0", firefox_max_version="100.0"
+        )
+        self.assertEqual(experiment.firefox_min_version_int, 99)
+        self.assertEqual(experiment.firefox_max_version_int, 100)
+
+        experiment.firefox_max_version = ""
+        experiment.save(update_fields=["firefox_max_version"])
+        experiment = Experiment.objects.get(id=experiment.id)
+        self.assertEqual(experiment.firefox_min_version_int, 99)
+        self.assertIsNone(experiment.firefox_max_version_int)
+
     def test_use_branched_addon_serializer_returns_true_for_addon_and_greater_version(
         self,
     ):
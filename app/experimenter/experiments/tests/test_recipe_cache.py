@@ -0,0 +1,26 @@
+from django.core.cache import caches
+from django.test import TestCase
+
+from experimenter.experiments.recipe_cache import RecipeCache
+
+
+class TestRecipeCache(TestCase):
+    def setUp(self):
+        self.cache = RecipeCache("recipes", 10)
+        self.cache.shared.clear()
+
+    def test_set_stores_in_both_tiers(self):
+        self.cache.set("key", b"content")
+
+        self.assertEqual(self.cache.local.get("key"), b"content")
+        self.assertEqual(caches["recipes"].get("key"), b"content")
+
+    def test_get_promotes_shared_entry_to_local_tier(self):
+        caches["recipes"].set("key", b"content")
+
+        self.assertIsNone(self.cache.local.get("key"))
+        self.assertEqual(self.cache.get("key"), b"content")
+        self.assertEqual(self.cache.local.get("key"), b"content")
+
+    def test_get_returns_none_for_missing_key(self):
+        self.assertIsNone(self.cache.get("missing"))
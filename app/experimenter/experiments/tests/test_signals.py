@@ -0,0 +1,199 @@
+import datetime
+
+import mock
+from django.test import TestCase
+from django.utils import timezone
+
+from experimenter.base.tests.factories import CountryFactory, LocaleFactory
+from experimenter.experiments.changelog_utils import (
+    bulk_update_experiments_with_change_log,
+)
+from experimenter.experiments.models import (
+    Experiment,
+    ExperimentBucketNamespace,
+    RolloutPreference,
+)
+from experimenter.experiments.tests.factories import (
+    ExperimentChangeLogFactory,
+    ExperimentFactory,
+    ExperimentVariantFactory,
+    VariantPreferencesFactory,
+)
+
+
+class TestRecipeVersionSignals(TestCase):
+    def setUp(self):
+        self.experiment = ExperimentFactory.create_with_variants()
+        self.version = self.get_version()
+
+    def get_version(self):
+        return Experiment.objects.get(id=self.experiment.id).recipe_version
+
+    def assertVersionChanged(self):
+        version = self.get_version()
+        self.assertNotEqual(version, self.version)
+        self.version = version
+
+    def test_experiment_save_changes_recipe_version(self):
+        self.experiment.name = "New Name"
+        self.experiment.save(update_fields=["name"])
+        self.assertEqual(self.experiment.recipe_version, self.get_version())
+        self.assertVersionChanged()
+
+    def test_variant_save_and_delete_change_recipe_version(self):
+        variant = ExperimentVariantFactory.create(experiment=self.experiment)
+        self.assertVersionChanged()
+
+        variant.ratio = 10
+        variant.save()
+        self.assertVersionChanged()
+
+        self.experiment.variants.filter(id=variant.id).delete()
+        self.assertVersionChanged()
+
+    def test_variant_preference_save_and_delete_change_recipe_version(self):
+        variant = self.experiment.variants.first()
+        preference = VariantPreferencesFactory.create(variant=variant)
+        self.assertVersionChanged()
+
+        preference.delete()
+        self.assertVersionChanged()
+
+    def test_rollout_preference_save_and_delete_change_recipe_version(self):
+        preference = RolloutPreference.objects.create(
+            experiment=self.experiment,
+            pref_name="browser.pref",
+            pref_type=Experiment.PREF_TYPE_INT,
+            pref_value="1",
+        )
+        self.assertVersionChanged()
+
+        RolloutPreference.objects.filter(id=preference.id).delete()
+        self.assertVersionChanged()
+
+    def test_bucket_range_changes_recipe_version(self):
+        ExperimentBucketNamespace.request_namespace_buckets(
+            "namespace", self.experiment, 100
+        )
+        self.assertVersionChanged()
+
+    def test_change_log_changes_recipe_version(self):
+        ExperimentChangeLogFactory.create(experiment=self.experiment)
+        self.assertVersionChanged()
+
+    def test_locales_and_countries_change_recipe_version(self):
+        locale = LocaleFactory.create()
+        self.experiment.locales.set([locale])
+        self.assertVersionChanged()
+
+        self.experiment.countries.add(CountryFactory.create())
+        self.assertVersionChanged()
+
+        self.experiment.locales.clear()
+        self.assertVersionChanged()
+
+        locale.experiment_set.add(self.experiment)
+        self.assertVersionChanged()
+
+    def test_unrelated_experiment_keeps_recipe_version(self):
+        other_experiment = ExperimentFactory.create_with_variants()
+        other_experiment.refresh_from_db()
+        other_version = other_experiment.recipe_version
+
+        ExperimentVariantFactory.create(experiment=self.experiment)
+        other_experiment.refresh_from_db()
+
+        self.assertEqual(other_experiment.recipe_version, other_version)
+
+
+class TestStatusChangeSignals(TestCase):
+    def setUp(self):
+        mock_on_commit_patcher = mock.patch(
+            "experimenter.experiments.signals.transaction.on_commit",
+            side_effect=lambda callback: callback(),
+        )
+        mock_on_commit_patcher.start()
+        self.addCleanup(mock_on_commit_patcher.stop)
+
+        mock_send_task_patcher = mock.patch(
+            "experimenter.experiments.signals.app.send_task"
+        )
+        self.mock_send_task = mock_send_task_patcher.start()
+        self.addCleanup(mock_send_task_patcher.stop)
+
+    def test_status_change_marks_experiment_due_and_wakes_task(self):
+        experiment = ExperimentFactory.create(type=Experiment.TYPE_PREF)
+        Experiment.objects.filter(id=experiment.id).update(
+            next_status_check=timezone.now() + datetime.timedelta(days=1)
+        )
+
+        ExperimentChangeLogFactory.create(
+            experiment=experiment,
+            old_status=Experiment.STATUS_REVIEW,
+            new_status=Experiment.STATUS_SHIP,
+        )
+
+        self.assertLessEqual(
+            Experiment.objects.get(id=experiment.id).next_status_check, timezone.now()
+        )
+        self.mock_send_task.assert_called_once_with(
+            "experimenter.normandy.tasks.update_recipe_ids_to_experiments"
+        )
+
+    def test_rapid_review_wakes_kinto_push_queue(self):
+        experiment = ExperimentFactory.create(type=Experiment.TYPE_RAPID)
+
+        ExperimentChangeLogFactory.create(
+            experiment=experiment,
+            old_status=Experiment.STATUS_DRAFT,
+            new_status=Experiment.STATUS_REVIEW,
+        )
+
+        self.mock_send_task.assert_called_once_with(
+            "experimenter.kinto.tasks.check_kinto_push_queue"
+        )
+
+    def test_change_without_status_change_does_not_wake_task(self):
+        experiment = ExperimentFactory.create(type=Experiment.TYPE_PREF)
+
+        ExperimentChangeLogFactory.create(
+            experiment=experiment,
+            old_status=Experiment.STATUS_SHIP,
+            new_status=Experiment.STATUS_SHIP,
+        )
+        ExperimentChangeLogFactory.create(
+            experiment=experiment,
+            old_status=Experiment.STATUS_SHIP,
+            new_status=Experiment.STATUS_REJECTED,
+        )
+
+        self.mock_send_task.assert_not_called()
+
+    def test_bulk_status_change_marks_experiments_due_and_wakes_task(self):
+        experiments = [
+            ExperimentFactory.create_with_status(
+                Experiment.STATUS_ACCEPTED, type=Experiment.TYPE_RAPID
+            )
+            for i in range(2)
+        ]
+        Experiment.objects.update(
+            next_status_check=timezone.now() + datetime.timedelta(days=1)
+        )
+        self.mock_send_task.reset_mock()
+
+        bulk_update_experiments_with_change_log(
+            [
+                (experiment, {"status": Experiment.STATUS_LIVE})
+                for experiment in experiments
+            ],
+            "dev@example.com",
+        )
+
+        for experiment in experiments:
+            self.assertLessEqual(
+                Experiment.objects.get(id=experiment.id).next_status_check,
+                timezone.now(),
+            )
+        self.mock_send_task.assert_called_once_with(
+            "experimenter.kinto.tasks.check_experiment_is_complete"
+        )
@@ -0,0 +1,123 @@
+from datetime import date
+
+import mock
+from django.core import mail
+from django.test import TestCase
+from markus.testing import MetricsMock
+
+from experimenter.experiments import tasks
+from experimenter.experiments.constants import ExperimentConstants
+from experimenter.experiments.models import Experiment, ExperimentEmail
+from experimenter.experiments.tests.factories import ExperimentFactory, UserFactory
+
+
+class TestSendPeriodEndingEmailsTask(TestCase):
+    def create_live_experiment(self, **kwargs):
+        experiment = ExperimentFactory.create(
+            status=Experiment.STATUS_LIVE,
+            proposed_start_date=date.today(),
+            **kwargs,
+        )
+        experiment.update_lifecycle_dates()
+        experiment.save()
+        return experiment
+
+    def test_sends_ending_and_pause_emails_that_are_due(self):
+        ending = self.create_live_experiment(proposed_duration=5, proposed_enrollment=0)
+        pausing = self.create_live_experiment(proposed_duration=30, proposed_enrollment=3)
+        self.create_live_experiment(proposed_duration=30, proposed_enrollment=0)
+
+        with MetricsMock() as mm:
+            tasks.send_period_ending_emails_task()
+
+            mm.assert_incr_once("experiments.tasks.send_period_ending_emails.sent", 2)
+
+        self.assertEqual(len(mail.outbox), 2)
+        self.assertEqual(
+            mail.outbox[1].recipients(), [pausing.owner.email, pausing.analysis_owner]
+        )
+        self.assertEqual(
+            set(ExperimentEmail.objects.values_list("experiment", "type")),
+            {
+                (ending.id, ExperimentConstants.EXPERIMENT_ENDS),
+                (pausing.id, ExperimentConstants.EXPERIMENT_PAUSES),
+            },
+        )
+
+    def test_skips_emails_already_sent(self):
+        experiment = self.create_live_experiment(
+            proposed_duration=4, proposed_enrollment=2
+        )
+        ExperimentEmail.objects.create(
+            experiment=experiment, type=ExperimentConstants.EXPERIMENT_ENDS
+        )
+
+        tasks.send_period_ending_emails_task()
+        tasks.send_period_ending_emails_task()
+
+        self.assertEqual(len(mail.outbox), 1)
+        self.assertEqual(
+            mail.outbox[0].subject,
+            Experiment.PAUSE_EMAIL_SUBJECT.format(
+                name=experiment.name,
+                version=experiment.format_firefox_versions,
+                channel=experiment.firefox_channel,
+            ),
+        )
+        self.assertEqual(
+            experiment.emails.filter(type=ExperimentConstants.EXPERIMENT_PAUSES).count(),
+            1,
+        )
+
+    def test_skips_rapid_and_not_live_experiments(self):
+        self.create_live_experiment(
+            type=Experiment.TYPE_RAPID, proposed_duration=5, proposed_enrollment=0
+        )
+        ExperimentFactory.create_with_status(
+            Experiment.STATUS_ACCEPTED,
+            proposed_start_date=date.today(),
+            proposed_duration=5,
+        )
+
+        tasks.send_period_ending_emails_task()
+
+        self.assertEqual(len(mail.outbox), 0)
+        self.assertFalse(ExperimentEmail.objects.exists())
+
+    def test_sends_all_emails_over_one_connection(self):
+        for i in range(3):
+            experiment = self.create_live_experiment(
+                proposed_duration=5, proposed_enrollment=0
+            )
+            experiment.subscribers.add(UserFactory.create())
+
+        with mock.patch(
+            "experimenter.experiments.email.get_connection",
+            wraps=mail.get_connection,
+        ) as mock_get_connection:
+            with self.assertNumQueries(5):
+                tasks.send_period_ending_emails_task()
+
+        mock_get_connection.assert_called_once_with(fail_silently=False)
+        self.assertEqual(len(mail.outbox), 3)
+        self.assertEqual(ExperimentEmail.objects.count(), 3)
+
+    def test_emails_sent_before_a_failure_are_recorded(self):
+        experiments = [
+            self.create_live_experiment(proposed_duration=5, proposed_enrollment=0)
+            for i in range(2)
+        ]
+        connection = mock.MagicMock()
+        connection.__enter__.return_value = connection
+        connection.send_messages.side_effect = [1, ConnectionError()]
+
+        with mock.patch(
+            "experimenter.experiments.email.get_connection", return_value=connection
+        ):
+            with self.assertRaises(ConnectionError):
+                tasks.send_period_ending_emails_task()
+
+        self.assertEqual(
+            list(ExperimentEmail.objects.values_list("experiment", "type")),
+            [(experiments[0].id, ExperimentConstants.EXPERIMENT_ENDS)],
+        )
@@ -1,15 +1,139 @@
+import threading
+import time
+
 import kinto_http
 from django.conf import settings
+from django.db import transaction
+
+from experimenter.base.http import ProcessLocal
+from experimenter.kinto.models import KintoCollectionSync
 
 KINTO_REVIEW_STATUS = "to-review"
 KINTO_REJECTED_STATUS = "work-in-progress"
 
 
-def push_to_kinto(data):
-    client = kinto_http.Client(
+def build_client():
+    return kinto_http.Client(
         server_url=settings.KINTO_HOST,
         auth=(settings.KINTO_USER, settings.KINTO_PASS),
     )
+
+
+_client = ProcessLocal(build_client)
+
+
+def get_client():
+    return _client.get()
+
+
+class KintoSnapshot(object):
+    """
+    The workspace collection metadata and the workspace and main record
+    ids, each fetched at most once per beat cycle and shared by the Kinto
+    tasks. Record ids are synced incrementally from a persisted watermark,
+    so a cycle only downloads records changed or deleted since the last
+    one, and nothing at all when the collection hasn't changed.
+    """
+
+    def __init__(self):
+        self._collection = None
+        self._collection_fetched_at = None
+        self.records = {settings.KINTO_BUCKET_MAIN: set(), settings.KINTO_BUCKET: set()}
+        self.records_synced_at = {}
+        self.lock = threading.RLock()
+
+    @staticmethod
+    def is_stale(fetched_at):
+        return (
+            fetched_at is None
+            or time.monotonic() - fetched_at > settings.KINTO_SNAPSHOT_TTL
+        )
+
+    @property
+    def collection(self):
+        with self.lock:
+            if self._collection is None or self.is_stale(self._collection_fetched_at):
+                self._collection = get_client().get_collection(
+                    id=settings.KINTO_COLLECTION, bucket=settings.KINTO_BUCKET
+                )["data"]
+                self._collection_fetched_at = time.monotonic()
+
+            return self._collection
+
+    @property
+    def main_records(self):
+        return self.get_records(settings.KINTO_BUCKET_MAIN)
+
+    @property
+    def workspace_records(self):
+        return self.get_records(settings.KINTO_BUCKET)
+
+    def get_records(self, bucket):
+        with self.lock:
+            if self.is_stale(self.records_synced_at.get(bucket)):
+                self.records[bucket] = self.sync_records(bucket)
+                self.records_synced_at[bucket] = time.monotonic()
+
+            return self.records[bucket]
+
+    @staticmethod
+    def sync_records(bucket):
+        with transaction.atomic():
+            sync, _ = KintoCollectionSync.objects.select_for_update().get_or_create(
+                bucket=bucket, collection=settings.KINTO_COLLECTION
+            )
+
+            params = {}
+            if sync.last_modified is not None:
+                # answered with a 304 and no records if nothing changed
+                params = {
+                    "_since": sync.last_modified,
+                    "if_none_match": sync.last_modified,
+                }
+
+            records = get_client().get_records(
+                bucket=bucket, collection=settings.KINTO_COLLECTION, **params
+            )
+
+            record_ids = set(sync.record_ids)
+            for record in records:
+                if record.get("deleted"):
+                    record_ids.discard(record["id"])
+                else:
+                    record_ids.add(record["id"])
+
+                if record.get("last_modified"):
+                    sync.last_modified = max(
+                        sync.last_modified or 0, record["last_modified"]
+                    )
+
+            if records:
+                sync.record_ids = sorted(record_ids)
+                sync.save()
+
+        return record_ids
+
+    def invalidate_collection(self):
+        # our own writes change the collection status, so it is fetched
+        # again on next use
+        with self.lock:
+            self._collection = None
+
+    def record_deleted(self, record_id):
+        with self.lock:
+            self.records[settings.KINTO_BUCKET].discard(record_id)
+            self._collection = None
+
+
+snapshot = KintoSnapshot()
+
+
+def get_snapshot():
+    return snapshot
+
+
+def push_to_kinto(data):
+    client = get_client()
     client.create_record(
         data=data,
         collection=settings.KINTO_COLLECTION,
@@ -21,67 +145,51 @@ def push_to_kinto(data):
         data={"status": KINTO_REVIEW_STATUS},
         bucket=settings.KINTO_BUCKET,
     )
+    snapshot.invalidate_collection()
+
+
+def push_records_to_kinto(records):
+    # one batch request writes the records and requests a single review,
+    # records are PUT so one that already exists is replaced instead of
+    # failing the whole batch with a 412
+    with get_client().batch() as batch:
+        for data in records:
+            batch.update_record(
+                data=data,
+                collection=settings.KINTO_COLLECTION,
+                bucket=settings.KINTO_BUCKET,
+            )
+        batch.patch_collection(
+            id=settings.KINTO_COLLECTION,
+            data={"status": KINTO_REVIEW_STATUS},
+            bucket=settings.KINTO_BUCKET,
+        )
+    snapshot.invalidate_collection()
 
 
 def has_pending_review():
-    client = kinto_http.Client(
-        server_url=settings.KINTO_HOST,
-        auth=(settings.KINTO_USER, settings.KINTO_PASS),
-    )
-    collection = client.get_collection(
-        id=settings.KINTO_COLLECTION, bucket=settings.KINTO_BUCKET
-    )
-    return collection["data"]["status"] == KINTO_REVIEW_STATUS
+    return get_snapshot().collection["status"] == KINTO_REVIEW_STATUS
 
 
 def get_rejected_collection_data():
-    client = kinto_http.Client(
-        server_url=settings.KINTO_HOST,
-        auth=(settings.KINTO_USER, settings.KINTO_PASS),
-    )
-    collection = client.get_collection(
-        id=settings.KINTO_COLLECTION, bucket=settings.KINTO_BUCKET
-    )
+    collection = get_snapshot().collection
 
-    if collection["data"]["status"] == KINTO_REJECTED_STATUS:
-        return collection["data"]
+    if collection["status"] == KINTO_REJECTED_STATUS:
+        return collection
 
 
 def get_rejected_record():
-    client = kinto_http.Client(
-        server_url=settings.KINTO_HOST,
-        auth=(settings.KINTO_USER, settings.KINTO_PASS),
-    )
-
-    main_records = client.get_records(
-        bucket=settings.KINTO_BUCKET_MAIN, collection=settings.KINTO_COLLECTION
-    )
-
-    workspace_records = client.get_records(
-        bucket=settings.KINTO_BUCKET, collection=settings.KINTO_COLLECTION
-    )
-
-    main_record_ids = [record["id"] for record in main_records]
-
-    workspace_record_ids = [record["id"] for record in workspace_records]
-    return list(set(workspace_record_ids) - set(main_record_ids))
+    current_snapshot = get_snapshot()
+    main_record_ids = set(current_snapshot.main_records)
+    return list(set(current_snapshot.workspace_records) - main_record_ids)
 
 
 def delete_rejected_record(record_id):
-    client = kinto_http.Client(
-        server_url=settings.KINTO_HOST,
-        auth=(settings.KINTO_USER, settings.KINTO_PASS),
-    )
-    client.delete_record(
+    get_client().delete_record(
         id=record_id, bucket=settings.KINTO_BUCKET, collection=settings.KINTO_COLLECTION
     )
+    snapshot.record_deleted(record_id)
 
 
-def get_main_records():
-    client = kinto_http.Client(
-        server_url=settings.KINTO_HOST,
-        auth=(settings.KINTO_USER, settings.KINTO_PASS),
-    )
-    return client.get_records(
-        bucket=settings.KINTO_BUCKET_MAIN, collection=settings.KINTO_COLLECTION
-    )
+def get_main_record_ids():
+    return get_snapshot().main_records
@@ -0,0 +1,44 @@
+# Generated by Django 3.0.7 on 2026-10-18 03:42
+
+import django.contrib.postgres.fields
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    initial = True
+
+    dependencies = []
+
+    operations = [
+        migrations.CreateModel(
+            name="KintoCollectionSync",
+            fields=[
+                (
+                    "id",
+                    models.AutoField(
+                        auto_created=True,
+                        primary_key=True,
+                        serialize=False,
+                        verbose_name="ID",
+                    ),
+                ),
+                ("bucket", models.CharField(max_length=255)),
+                ("collection", models.CharField(max_length=255)),
+                ("last_modified", models.BigIntegerField(blank=True, null=True)),
+                (
+                    "record_ids",
+                    django.contrib.postgres.fields.ArrayField(
+                        base_field=models.CharField(max_length=255),
+                        default=list,
+                        size=None,
+                    ),
+                ),
+            ],
+            options={
+                "verbose_name": "Kinto Collection Sync",
+                "verbose_name_plural": "Kinto Collection Syncs",
+                "unique_together": {("bucket", "collection")},
+            },
+        ),
+    ]
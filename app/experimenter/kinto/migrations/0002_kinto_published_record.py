@@ -0,0 +1,43 @@
+# Generated by Django 3.0.7 on 2026-10-18 03:51
+
+from django.db import migrations, models
+import django.db.models.deletion
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ("experiments", "0113_experiment_recipe_version"),
+        ("kinto", "0001_kinto_collection_sync"),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name="KintoPublishedRecord",
+            fields=[
+                (
+                    "id",
+                    models.AutoField(
+                        auto_created=True,
+                        primary_key=True,
+                        serialize=False,
+                        verbose_name="ID",
+                    ),
+                ),
+                ("content_hash", models.CharField(max_length=64)),
+                ("published_on", models.DateTimeField(auto_now=True)),
+                (
+                    "experiment",
+                    models.OneToOneField(
+                        on_delete=django.db.models.deletion.CASCADE,
+                        related_name="kinto_record",
+                        to="experiments.Experiment",
+                    ),
+                ),
+            ],
+            options={
+                "verbose_name": "Kinto Published Record",
+                "verbose_name_plural": "Kinto Published Records",
+            },
+        ),
+    ]
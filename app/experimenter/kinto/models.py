@@ -0,0 +1,50 @@
+import hashlib
+import json
+
+from django.contrib.postgres.fields import ArrayField
+from django.core.serializers.json import DjangoJSONEncoder
+from django.db import models
+
+
+class KintoCollectionSync(models.Model):
+    bucket = models.CharField(max_length=255)
+    collection = models.CharField(max_length=255)
+    last_modified = models.BigIntegerField(blank=True, null=True)
+    record_ids = ArrayField(models.CharField(max_length=255), default=list)
+
+    class Meta:
+        unique_together = ("bucket", "collection")
+        verbose_name = "Kinto Collection Sync"
+        verbose_name_plural = "Kinto Collection Syncs"
+
+    def __repr__(self):  # pragma: no cover
+        return f"<{self.__class__.__name__} {self.bucket}/{self.collection}>"
+
+    def __str__(self):
+        return f"{self.bucket}/{self.collection}"
+
+
+class KintoPublishedRecord(models.Model):
+    experiment = models.OneToOneField(
+        "experiments.Experiment", on_delete=models.CASCADE, related_name="kinto_record"
+    )
+    content_hash = models.CharField(max_length=64)
+    published_on = models.DateTimeField(auto_now=True)
+
+    class Meta:
+        verbose_name = "Kinto Published Record"
+        verbose_name_plural = "Kinto Published Records"
+
+    def __repr__(self):  # pragma: no cover
+        return f"<{self.__class__.__name__} {self.experiment_id} {self.content_hash}>"
+
+    def __str__(self):
+        return self.content_hash
+
+    @staticmethod
+    def hash_record(data):
+        # key order and whitespace don't change the published record
+        content = json.dumps(
+            data, cls=DjangoJSONEncoder, sort_keys=True, separators=(",", ":")
+        )
+        return hashlib.sha256(content.encode()).hexdigest()
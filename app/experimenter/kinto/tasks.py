@@ -5,9 +5,13 @@ from django.contrib.auth import get_user_model
 
 from mozilla_nimbus_shared import get_data
 
+from experimenter.base.locks import task_lock
 from experimenter.celery import app
 from experimenter.experiments.api.v4.serializers import ExperimentRapidRecipeSerializer
-from experimenter.experiments.changelog_utils import update_experiment_with_change_log
+from experimenter.experiments.changelog_utils import (
+    bulk_update_experiments_with_change_log,
+    update_experiment_with_change_log,
+)
 from experimenter.experiments.models import (
     Experiment,
     ExperimentChangeLog,
@@ -15,6 +19,7 @@ from experimenter.experiments.models import (
     ExperimentBucketRange,
 )
 from experimenter.kinto import client
+from experimenter.kinto.models import KintoPublishedRecord
 
 
 logger = get_task_logger(__name__)
@@ -23,12 +28,7 @@ metrics = markus.get_metrics("kinto.tasks")
 NIMBUS_DATA = get_data()
 
 
-@app.task
-@metrics.timer_decorator("push_experiment_to_kinto.timing")
-def push_experiment_to_kinto(experiment_id):
-    metrics.incr("push_experiment_to_kinto.started")
-
-    experiment = Experiment.objects.get(id=experiment_id)
+def get_kinto_record(experiment):
     if not ExperimentBucketRange.objects.filter(experiment=experiment).exists():
         ExperimentBucketNamespace.request_namespace_buckets(
             experiment.recipe_slug,
@@ -38,20 +38,50 @@ def push_experiment_to_kinto(experiment_id):
             ]["count"],
         )
 
-    data = ExperimentRapidRecipeSerializer(experiment).data
+    return ExperimentRapidRecipeSerializer(experiment).data
 
-    logger.info(f"Pushing {experiment} to Kinto")
 
-    try:
-        client.push_to_kinto(data)
+def get_changed_records(experiment_records):
+    """
+    Drops the records identical to the ones last published for their
+    experiments, returning (experiment, data, old hash, new hash) tuples.
+    """
+    published_hashes = dict(
+        KintoPublishedRecord.objects.filter(
+            experiment__in=[experiment for experiment, _ in experiment_records]
+        ).values_list("experiment_id", "content_hash")
+    )
+
+    changed_records = []
+    for experiment, data in experiment_records:
+        old_hash = published_hashes.get(experiment.id)
+        new_hash = KintoPublishedRecord.hash_record(data)
+
+        if new_hash == old_hash:
+            logger.info(f"{experiment} is unchanged in Kinto")
+        else:
+            changed_records.append((experiment, data, old_hash, new_hash))
+
+    return changed_records
+
 
-        experimenter_kinto_user, _ = get_user_model().objects.get_or_create(
-            email=settings.KINTO_DEFAULT_CHANGELOG_USER,
-            username=settings.KINTO_DEFAULT_CHANGELOG_USER,
+def create_kinto_push_change_logs(changed_records):
+    experimenter_kinto_user, _ = get_user_model().objects.get_or_create(
+        email=settings.KINTO_DEFAULT_CHANGELOG_USER,
+        username=settings.KINTO_DEFAULT_CHANGELOG_USER,
+    )
+
+    for experiment, data, old_hash, new_hash in changed_records:
+        KintoPublishedRecord.objects.update_or_create(
+            experiment=experiment, defaults={"content_hash": new_hash}
         )
 
         changed_values = {
-            "recipe": {"new_value": data, "old_value": None, "display_name": "Recipe"}
+            "recipe": {
+                "new_value": new_hash,
+                "old_value": old_hash,
+                "display_name": "Recipe",
+            }
         }
         ExperimentChangeLog.objects.create(
             experiment=experiment,
@@ -62,6 +92,27 @@ def push_experiment_to_kinto(experiment_id):
             changed_by=experimenter_kinto_user,
         )
 
+
+# the lock lease expires, so retrying a push until it is free always ends
+@app.task(bind=True, max_retries=None)
+@task_lock(key=lambda experiment_id: experiment_id, retry=True)
+@metrics.timer_decorator("push_experiment_to_kinto.timing")
+def push_experiment_to_kinto(self, experiment_id):
+    metrics.incr("push_experiment_to_kinto.started")
+
+    experiment = Experiment.objects.get(id=experiment_id)
+    changed_records = get_changed_records([(experiment, get_kinto_record(experiment))])
+
+    if not changed_records:
+        metrics.incr("push_experiment_to_kinto.unchanged")
+        return
+
+    logger.info(f"Pushing {experiment} to Kinto")
+
+    try:
+        client.push_to_kinto(changed_records[0][1])
+        create_kinto_push_change_logs(changed_records)
+
         logger.info(f"{experiment} pushed to Kinto")
         metrics.incr("push_experiment_to_kinto.completed")
     except Exception as e:
@@ -70,6 +121,37 @@ def push_experiment_to_kinto(experiment_id):
         raise e
 
 
+@app.task(bind=True, max_retries=None)
+@task_lock(
+    key=lambda experiment_ids: ",".join(map(str, sorted(experiment_ids))), retry=True
+)
+@metrics.timer_decorator("push_experiments_to_kinto.timing")
+def push_experiments_to_kinto(self, experiment_ids):
+    metrics.incr("push_experiments_to_kinto.started")
+
+    experiments = Experiment.objects.filter(id__in=experiment_ids).order_by("id")
+    changed_records = get_changed_records(
+        [(experiment, get_kinto_record(experiment)) for experiment in experiments]
+    )
+
+    if not changed_records:
+        metrics.incr("push_experiments_to_kinto.unchanged")
+        return
+
+    logger.info(f"Pushing {len(changed_records)} experiments to Kinto")
+
+    try:
+        client.push_records_to_kinto([data for _, data, _, _ in changed_records])
+        create_kinto_push_change_logs(changed_records)
+
+        logger.info(f"{len(changed_records)} experiments pushed to Kinto")
+        metrics.incr("push_experiments_to_kinto.completed")
+    except Exception as e:
+        metrics.incr("push_experiments_to_kinto.failed")
+        logger.info(f"Pushing {len(changed_records)} experiments to Kinto failed: {e}")
+        raise e
+
+
 def update_rejected_record(record_id, rejected_data):
     experiment = Experiment.objects.get(recipe_slug=record_id)
     update_experiment_with_change_log(
@@ -79,9 +161,12 @@ def update_rejected_record(record_id, rejected_data):
         message=rejected_data["last_reviewer_comment"],
     )
     client.delete_rejected_record(record_id)
+    # the record is gone from Kinto, so pushing it again must not be skipped
+    KintoPublishedRecord.objects.filter(experiment=experiment).delete()
 
 
 @app.task
+@task_lock()
 @metrics.timer_decorator("check_kinto_push_queue")
 def check_kinto_push_queue():
     metrics.incr("check_kinto_push_queue.started")
@@ -90,29 +175,42 @@ def check_kinto_push_queue():
         type=Experiment.TYPE_RAPID, status=Experiment.STATUS_REVIEW
     ).exclude(bugzilla_id=None)
 
-    if (rejected_collection_data := client.get_rejected_collection_data()) and (
-        reject_recipe_id := client.get_rejected_record()
-    ):
-
-        update_rejected_record(reject_recipe_id[0], rejected_collection_data)
+    if rejected_collection_data := client.get_rejected_collection_data():
+        # a rejected review rejects every record pushed in its batch
+        for record_id in client.get_rejected_record():
+            try:
+                update_rejected_record(record_id, rejected_collection_data)
+            except Experiment.DoesNotExist:
+                logger.info(f"No experiment found for rejected record {record_id}")
+                metrics.incr("check_kinto_push_queue.unknown_rejected_record")
 
     if queued_experiments.exists():
         if client.has_pending_review():
             metrics.incr("check_kinto_push_queue.pending_review")
             return
 
-        next_experiment = queued_experiments.first()
+        next_experiments = list(
+            queued_experiments.order_by("id")[: settings.KINTO_PUSH_BATCH_SIZE]
+        )
 
-        update_experiment_with_change_log(
-            next_experiment,
-            {
-                "status": Experiment.STATUS_ACCEPTED,
-                "recipe_slug": next_experiment.generate_recipe_slug(),
-            },
+        bulk_update_experiments_with_change_log(
+            [
+                (
+                    experiment,
+                    {
+                        "status": Experiment.STATUS_ACCEPTED,
+                        "recipe_slug": experiment.generate_recipe_slug(),
+                    },
+                )
+                for experiment in next_experiments
+            ],
             settings.KINTO_DEFAULT_CHANGELOG_USER,
         )
 
-        push_experiment_to_kinto.delay(next_experiment.id)
+        if len(next_experiments) > 1:
+            push_experiments_to_kinto.delay([e.id for e in next_experiments])
+        else:
+            push_experiment_to_kinto.delay(next_experiments[0].id)
         metrics.incr("check_kinto_push_queue.queued_experiment_selected")
     else:
         metrics.incr("check_kinto_push_queue.no_experiments_queued")
@@ -121,60 +219,100 @@ def check_kinto_push_queue():
 
 
 @app.task
+@task_lock()
 @metrics.timer_decorator("check_experiment_is_live")
 def check_experiment_is_live():
     metrics.incr("check_experiment_is_live.started")
 
-    accepted_experiments = Experiment.objects.filter(
-        type=Experiment.TYPE_RAPID, status=Experiment.STATUS_ACCEPTED
+    accepted_experiments = list(
+        Experiment.objects.status_check_due().filter(
+            type=Experiment.TYPE_RAPID, status=Experiment.STATUS_ACCEPTED
+        )
     )
 
-    records = client.get_main_records()
-    record_ids = [r.get("id") for r in records]
+    if not accepted_experiments:
+        metrics.incr("check_experiment_is_live.no_experiments_due")
+        return
 
+    main_records = client.get_snapshot().main_records
+
+    experiment_changes = []
     for experiment in accepted_experiments:
-        if experiment.recipe_slug in record_ids:
+        if experiment.recipe_slug in main_records:
             logger.info(
                 "{experiment} status is being updated to live".format(
                     experiment=experiment
                 )
             )
-            update_experiment_with_change_log(
-                experiment,
-                {"status": Experiment.STATUS_LIVE},
-                settings.KINTO_DEFAULT_CHANGELOG_USER,
+            experiment_changes.append((experiment, {"status": Experiment.STATUS_LIVE}))
+
+    updated_experiments = {}
+    if experiment_changes:
+        updated_experiments = {
+            experiment.id: experiment
+            for experiment in bulk_update_experiments_with_change_log(
+                experiment_changes, settings.KINTO_DEFAULT_CHANGELOG_USER
             )
+        }
 
-            logger.info("Experiment Status is set to Live")
+        logger.info("Experiment Status is set to Live")
 
+    # updated experiments are scheduled from their new status
+    Experiment.schedule_status_checks(
+        [
+            updated_experiments.get(experiment.id, experiment)
+            for experiment in accepted_experiments
+        ]
+    )
     metrics.incr("check_experiment_is_live.completed")
 
 
 @app.task
+@task_lock()
 @metrics.timer_decorator("check_experiment_is_complete")
 def check_experiment_is_complete():
     metrics.incr("check_experiment_is_complete.started")
 
-    live_experiments = Experiment.objects.filter(
-        type=Experiment.TYPE_RAPID, status=Experiment.STATUS_LIVE
+    live_experiments = list(
+        Experiment.objects.status_check_due().filter(
+            type=Experiment.TYPE_RAPID, status=Experiment.STATUS_LIVE
+        )
     )
 
-    records = client.get_main_records()
-    record_ids = [r.get("id") for r in records]
+    if not live_experiments:
+        metrics.incr("check_experiment_is_complete.no_experiments_due")
+        return
+
+    main_records = client.get_snapshot().main_records
 
+    experiment_changes = []
     for experiment in live_experiments:
-        if experiment.recipe_slug not in record_ids:
+        if experiment.recipe_slug not in main_records:
             logger.info(
                 "{experiment} status is being updated to complete".format(
                     experiment=experiment
                 )
             )
-            update_experiment_with_change_log(
-                experiment,
-                {"status": Experiment.STATUS_COMPLETE},
-                settings.KINTO_DEFAULT_CHANGELOG_USER,
+            experiment_changes.append(
+                (experiment, {"status": Experiment.STATUS_COMPLETE})
+            )
+
+    updated_experiments = {}
+    if experiment_changes:
+        updated_experiments = {
+            experiment.id: experiment
+            for experiment in bulk_update_experiments_with_change_log(
+                experiment_changes, settings.KINTO_DEFAULT_CHANGELOG_USER
             )
+        }
 
-            logger.info("Experiment Status is set to complete")
+        logger.info("Experiment Status is set to complete")
 
+    # updated experiments are scheduled from their new status
+    Experiment.schedule_status_checks(
+        [
+            updated_experiments.get(experiment.id, experiment)
+            for experiment in live_experiments
+        ]
+    )
     metrics.incr("check_experiment_is_complete.completed")
@@ -1,5 +1,8 @@
 import mock
 
+from experimenter.base.http import ProcessLocal
+
+from experimenter.kinto import client
 from experimenter.kinto.client import KINTO_REVIEW_STATUS, KINTO_REJECTED_STATUS
 
 
@@ -11,10 +14,25 @@ class MockKintoClientMixin(object):
             "experimenter.kinto.client.kinto_http.Client"
         )
         self.mock_kinto_client_creator = mock_kinto_client_patcher.start()
-        self.mock_kinto_client = mock.Mock()
+        self.mock_kinto_client = mock.MagicMock()
+        self.mock_kinto_batch = (
+            self.mock_kinto_client.batch.return_value.__enter__.return_value
+        )
         self.mock_kinto_client_creator.return_value = self.mock_kinto_client
         self.addCleanup(mock_kinto_client_patcher.stop)
 
+        # every test starts without a client or a fetched snapshot
+        mock_client_instance_patcher = mock.patch(
+            "experimenter.kinto.client._client", ProcessLocal(client.build_client)
+        )
+        mock_client_instance_patcher.start()
+        self.addCleanup(mock_client_instance_patcher.stop)
+        mock_snapshot_patcher = mock.patch(
+            "experimenter.kinto.client.snapshot", client.KintoSnapshot()
+        )
+        mock_snapshot_patcher.start()
+        self.addCleanup(mock_snapshot_patcher.stop)
+
     def setup_kinto_pending_review(self):
         self.mock_kinto_client.get_collection.return_value = {
             "data": {"status": KINTO_REVIEW_STATUS}
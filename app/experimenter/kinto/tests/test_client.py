@@ -1,7 +1,9 @@
-from django.test import TestCase
+import mock
+from django.test import TestCase, override_settings
 from django.conf import settings
 
 from experimenter.kinto import client
+from experimenter.kinto.models import KintoCollectionSync
 from experimenter.kinto.tests.mixins import MockKintoClientMixin
 
 
@@ -28,6 +30,29 @@ class TestPushToKinto(MockKintoClientMixin, TestCase):
         )
 
 
+class TestPushRecordsToKinto(MockKintoClientMixin, TestCase):
+    def test_push_records_to_kinto_sends_one_batch_with_one_review(self):
+        client.push_records_to_kinto([{"id": "record-1"}, {"id": "record-2"}])
+
+        self.mock_kinto_client.batch.assert_called_once_with()
+        self.assertEqual(
+            self.mock_kinto_batch.update_record.call_args_list,
+            [
+                mock.call(
+                    data={"id": record_id},
+                    collection=settings.KINTO_COLLECTION,
+                    bucket=settings.KINTO_BUCKET,
+                )
+                for record_id in ("record-1", "record-2")
+            ],
+        )
+        self.mock_kinto_batch.patch_collection.assert_called_once_with(
+            id=settings.KINTO_COLLECTION,
+            data={"status": "to-review"},
+            bucket=settings.KINTO_BUCKET,
+        )
+
+
 class TestHasPendingReview(MockKintoClientMixin, TestCase):
     def test_returns_true_for_pending_review(self):
         self.setup_kinto_pending_review()
@@ -38,14 +63,16 @@ class TestHasPendingReview(MockKintoClientMixin, TestCase):
         self.assertFalse(client.has_pending_review())
 
 
-class TestGetMainRecords(MockKintoClientMixin, TestCase):
-    def test_returns_records(self):
+class TestGetMainRecordIds(MockKintoClientMixin, TestCase):
+    def test_returns_record_ids(self):
         self.setup_kinto_get_main_records()
-        self.assertEqual(len(client.get_main_records()), 1)
+        self.assertEqual(
+            client.get_main_record_ids(), {"bug-12345-rapid-test-release-55"}
+        )
 
-    def test_returns_no_records(self):
+    def test_returns_no_record_ids(self):
         self.setup_kinto_no_main_records()
-        self.assertEqual(client.get_main_records(), [])
+        self.assertEqual(client.get_main_record_ids(), set())
 
 
 class TestGetRejectedCollectionData(MockKintoClientMixin, TestCase):
@@ -68,3 +95,110 @@ class TestGetRejectedRecords(MockKintoClientMixin, TestCase):
             ],
         ]
         self.assertEqual(client.get_rejected_record(), ["bug-9999-rapid-test-release-55"])
+
+
+class TestKintoSnapshot(MockKintoClientMixin, TestCase):
+    def test_client_is_reused(self):
+        self.assertIs(client.get_client(), client.get_client())
+        self.mock_kinto_client_creator.assert_called_once()
+
+    def test_collection_is_fetched_once_per_cycle(self):
+        self.setup_kinto_no_pending_review()
+
+        self.assertFalse(client.has_pending_review())
+        self.assertIsNone(client.get_rejected_collection_data())
+
+        self.mock_kinto_client.get_collection.assert_called_once_with(
+            id=settings.KINTO_COLLECTION, bucket=settings.KINTO_BUCKET
+        )
+
+    def test_records_are_fetched_once_per_cycle(self):
+        self.setup_kinto_get_main_records()
+
+        client.get_main_record_ids()
+        client.get_main_record_ids()
+
+        self.mock_kinto_client.get_records.assert_called_once_with(
+            bucket=settings.KINTO_BUCKET_MAIN, collection=settings.KINTO_COLLECTION
+        )
+
+    @override_settings(KINTO_SNAPSHOT_TTL=-1)
+    def test_records_are_synced_since_last_watermark(self):
+        self.mock_kinto_client.get_records.side_effect = [
+            [
+                {"id": "record-1", "last_modified": 10},
+                {"id": "record-2", "last_modified": 20},
+            ],
+            [
+                {"id": "record-1", "last_modified": 30, "deleted": True},
+                {"id": "record-3", "last_modified": 40},
+            ],
+            [],
+        ]
+
+        self.assertEqual(client.get_main_record_ids(), {"record-1", "record-2"})
+        self.assertEqual(client.get_main_record_ids(), {"record-2", "record-3"})
+        self.assertEqual(client.get_main_record_ids(), {"record-2", "record-3"})
+
+        self.assertEqual(
+            [c[1] for c in self.mock_kinto_client.get_records.call_args_list],
+            [
+                {
+                    "bucket": settings.KINTO_BUCKET_MAIN,
+                    "collection": settings.KINTO_COLLECTION,
+                },
+                {
+                    "bucket": settings.KINTO_BUCKET_MAIN,
+                    "collection": settings.KINTO_COLLECTION,
+                    "_since": 20,
+                    "if_none_match": 20,
+                },
+                {
+                    "bucket": settings.KINTO_BUCKET_MAIN,
+                    "collection": settings.KINTO_COLLECTION,
+                    "_since": 40,
+                    "if_none_match": 40,
+                },
+            ],
+        )
+
+        sync = KintoCollectionSync.objects.get(bucket=settings.KINTO_BUCKET_MAIN)
+        self.assertEqual(sync.last_modified, 40)
+        self.assertEqual(sync.record_ids, ["record-2", "record-3"])
+
+    def test_watermark_is_shared_between_snapshots(self):
+        KintoCollectionSync.objects.create(
+            bucket=settings.KINTO_BUCKET_MAIN,
+            collection=settings.KINTO_COLLECTION,
+            last_modified=20,
+            record_ids=["record-1", "record-2"],
+        )
+        self.setup_kinto_no_main_records()
+
+        self.assertEqual(client.get_main_record_ids(), {"record-1", "record-2"})
+        self.mock_kinto_client.get_records.assert_called_once_with(
+            bucket=settings.KINTO_BUCKET_MAIN,
+            collection=settings.KINTO_COLLECTION,
+            _since=20,
+            if_none_match=20,
+        )
+
+    def test_deleted_rejected_record_updates_snapshot(self):
+        self.setup_kinto_rejected_review()
+        self.mock_kinto_client.get_records.side_effect = [
+            [{"id": "bug-12345-rapid-test-release-55"}],
+            [
+                {"id": "bug-12345-rapid-test-release-55"},
+                {"id": "bug-9999-rapid-test-release-55"},
+            ],
+        ]
+        self.assertEqual(client.get_rejected_record(), ["bug-9999-rapid-test-release-55"])
+        self.assertTrue(client.get_rejected_collection_data())
+
+        client.delete_rejected_record("bug-9999-rapid-test-release-55")
+        self.setup_kinto_no_pending_review()
+
+        self.assertEqual(client.get_rejected_record(), [])
+        self.assertIsNone(client.get_rejected_collection_data())
+        self.assertEqual(self.mock_kinto_client.get_records.call_count, 2)
+        self.assertEqual(self.mock_kinto_client.get_collection.call_count, 2)
@@ -1,11 +1,16 @@
 import datetime
 
 import mock
+from celery.exceptions import Retry
 from django.conf import settings
-from django.test import TestCase
+from django.test import TestCase, override_settings
+from django.utils import timezone
 
+from markus.testing import MetricsMock
 from mozilla_nimbus_shared import get_data
 
+from experimenter.base.locks import LocalLock
+
 from experimenter.experiments.models import (
     Experiment,
     ExperimentBucketRange,
@@ -15,6 +20,7 @@ from experimenter.experiments.tests.factories import ExperimentFactory
 from experimenter.kinto.tests.mixins import MockKintoClientMixin
 from experimenter.kinto import tasks
 from experimenter.kinto.client import KINTO_REJECTED_STATUS
+from experimenter.kinto.models import KintoPublishedRecord
 from experimenter.experiments.api.v4.serializers import ExperimentRapidRecipeSerializer
 
 NIMBUS_DATA = get_data()
@@ -57,7 +63,11 @@ class TestPushExperimentToKintoTask(MockKintoClientMixin, TestCase):
         )
 
         changed_values = {
-            "recipe": {"new_value": data, "old_value": None, "display_name": "Recipe"}
+            "recipe": {
+                "new_value": KintoPublishedRecord.hash_record(data),
+                "old_value": None,
+                "display_name": "Recipe",
+            }
         }
 
         self.assertTrue(
@@ -74,6 +84,141 @@ class TestPushExperimentToKintoTask(MockKintoClientMixin, TestCase):
         with self.assertRaises(Exception):
             tasks.push_experiment_to_kinto(self.experiment.id)
 
+        self.assertFalse(
+            KintoPublishedRecord.objects.filter(experiment=self.experiment).exists()
+        )
+
+    def test_push_experiment_to_kinto_skips_unchanged_record(self):
+        tasks.push_experiment_to_kinto(self.experiment.id)
+        tasks.push_experiment_to_kinto(self.experiment.id)
+
+        self.mock_kinto_client.create_record.assert_called_once()
+        self.assertEqual(
+            self.experiment.changes.filter(message="Recipe Sent to Kinto").count(), 1
+        )
+
+    def test_push_experiment_to_kinto_pushes_changed_record(self):
+        tasks.push_experiment_to_kinto(self.experiment.id)
+        old_hash = self.experiment.kinto_record.content_hash
+
+        self.experiment.public_description = "A changed description"
+        self.experiment.save()
+        tasks.push_experiment_to_kinto(self.experiment.id)
+
+        self.assertEqual(self.mock_kinto_client.create_record.call_count, 2)
+        new_hash = KintoPublishedRecord.objects.get(
+            experiment=self.experiment
+        ).content_hash
+        self.assertNotEqual(new_hash, old_hash)
+        self.assertEqual(
+            self.experiment.changes.filter(message="Recipe Sent to Kinto")
+            .order_by("-changed_on")
+            .first()
+            .changed_values["recipe"],
+            {"new_value": new_hash, "old_value": old_hash, "display_name": "Recipe"},
+        )
+
+
+class TestPushExperimentsToKintoTask(MockKintoClientMixin, TestCase):
+    def test_push_experiments_to_kinto_sends_experiments_in_one_batch(self):
+        experiments = [
+            ExperimentFactory.create_with_status(
+                Experiment.STATUS_ACCEPTED, type=Experiment.TYPE_RAPID, audience="us_only"
+            )
+            for i in range(2)
+        ]
+        for i, experiment in enumerate(experiments):
+            experiment.recipe_slug = f"recipe-slug-{i}"
+            experiment.save()
+
+        tasks.push_experiments_to_kinto([e.id for e in experiments])
+
+        records = [
+            call[1]["data"] for call in self.mock_kinto_batch.update_record.call_args_list
+        ]
+        self.assertEqual([r["id"] for r in records], ["recipe-slug-0", "recipe-slug-1"])
+        self.mock_kinto_batch.patch_collection.assert_called_once()
+
+        for experiment, data in zip(experiments, records):
+            self.assertTrue(
+                ExperimentBucketRange.objects.filter(experiment=experiment).exists()
+            )
+            self.assertTrue(
+                experiment.changes.filter(
+                    message="Recipe Sent to Kinto",
+                    changed_by__email=settings.KINTO_DEFAULT_CHANGELOG_USER,
+                    changed_values__recipe__new_value=KintoPublishedRecord.hash_record(
+                        data
+                    ),
+                ).exists()
+            )
+
+    def test_push_experiments_to_kinto_reraises_exception(self):
+        experiment = ExperimentFactory.create_with_status(
+            Experiment.STATUS_ACCEPTED, type=Experiment.TYPE_RAPID, recipe_slug="slug"
+        )
+        self.mock_kinto_client.batch.side_effect = Exception
+
+        with self.assertRaises(Exception):
+            tasks.push_experiments_to_kinto([experiment.id])
+
+        self.assertFalse(
+            experiment.changes.filter(message="Recipe Sent to Kinto").exists()
+        )
+
+    def test_push_experiments_to_kinto_skips_unchanged_records(self):
+        experiments = [
+            ExperimentFactory.create_with_status(
+                Experiment.STATUS_ACCEPTED, type=Experiment.TYPE_RAPID, audience="us_only"
+            )
+            for i in range(2)
+        ]
+        tasks.push_experiments_to_kinto([experiments[0].id])
+        self.mock_kinto_batch.reset_mock()
+
+        tasks.push_experiments_to_kinto([e.id for e in experiments])
+
+        self.mock_kinto_batch.update_record.assert_called_once()
+        self.assertEqual(
+            self.mock_kinto_batch.update_record.call_args[1]["data"]["id"],
+            experiments[1].recipe_slug,
+        )
+
+        self.mock_kinto_client.batch.reset_mock()
+        tasks.push_experiments_to_kinto([e.id for e in experiments])
+
+        self.mock_kinto_client.batch.assert_not_called()
+
+    def test_push_that_finds_its_experiments_locked_is_retried(self):
+        experiments = [
+            ExperimentFactory.create_with_status(
+                Experiment.STATUS_ACCEPTED, type=Experiment.TYPE_RAPID, audience="us_only"
+            )
+            for i in range(2)
+        ]
+        lock = LocalLock(
+            "task-lock:experimenter.kinto.tasks.push_experiments_to_kinto:{}".format(
+                ",".join(str(e.id) for e in experiments)
+            ),
+            60,
+        )
+        self.assertTrue(lock.acquire())
+        self.addCleanup(lock.release)
+
+        with mock.patch.object(
+            tasks.push_experiments_to_kinto, "retry", side_effect=Retry()
+        ) as mock_retry, MetricsMock() as mm:
+            with self.assertRaises(Retry):
+                tasks.push_experiments_to_kinto([e.id for e in reversed(experiments)])
+
+        mock_retry.assert_called_once_with(countdown=settings.TASK_LOCK_RETRY_DELAY)
+        mm.assert_incr_once("base.locks.push_experiments_to_kinto.retried")
+        self.mock_kinto_client.batch.assert_not_called()
+
+        lock.release()
+        tasks.push_experiments_to_kinto([e.id for e in experiments])
+        self.mock_kinto_client.batch.assert_called_once_with()
+
 
 class TestCheckKintoPushQueue(MockKintoClientMixin, TestCase):
     def setUp(self):
@@ -192,6 +337,9 @@ class TestCheckKintoPushQueue(MockKintoClientMixin, TestCase):
         tasks.check_kinto_push_queue()
 
         self.mock_kinto_client.delete_record.assert_called()
+        self.assertFalse(
+            KintoPublishedRecord.objects.filter(experiment=experiment).exists()
+        )
 
         self.assertTrue(
             experiment.changes.filter(
@@ -201,6 +349,75 @@ class TestCheckKintoPushQueue(MockKintoClientMixin, TestCase):
             ).exists()
         )
 
+    @override_settings(KINTO_PUSH_BATCH_SIZE=2)
+    def test_check_with_batch_size_pushes_several_experiments(self):
+        experiments = [
+            ExperimentFactory.create_with_status(
+                Experiment.STATUS_REVIEW,
+                bugzilla_id=str(12345 + i),
+                firefox_channel=Experiment.CHANNEL_RELEASE,
+                firefox_max_version=None,
+                firefox_min_version=Experiment.VERSION_CHOICES[0][0],
+                name=f"test {i}",
+                type=Experiment.TYPE_RAPID,
+            )
+            for i in range(3)
+        ]
+
+        self.setup_kinto_no_pending_review()
+        with mock.patch(
+            "experimenter.kinto.tasks.push_experiments_to_kinto.delay"
+        ) as mock_push_batch_task:
+            tasks.check_kinto_push_queue()
+
+        mock_push_batch_task.assert_called_once_with(
+            [experiments[0].id, experiments[1].id]
+        )
+        self.mock_push_task.assert_not_called()
+
+        statuses = [
+            Experiment.objects.get(id=experiment.id).status for experiment in experiments
+        ]
+        self.assertEqual(
+            statuses,
+            [
+                Experiment.STATUS_ACCEPTED,
+                Experiment.STATUS_ACCEPTED,
+                Experiment.STATUS_REVIEW,
+            ],
+        )
+
+    def test_check_with_rejected_batch_rejects_each_record(self):
+        experiments = [
+            ExperimentFactory.create_with_status(
+                Experiment.STATUS_ACCEPTED, type=Experiment.TYPE_RAPID
+            )
+            for i in range(2)
+        ]
+        for i, experiment in enumerate(experiments):
+            experiment.recipe_slug = f"recipe-slug-{i}"
+            experiment.save()
+
+        self.setup_kinto_rejected_review()
+        self.mock_kinto_client.get_records.side_effect = [
+            [],
+            [{"id": "recipe-slug-0"}, {"id": "recipe-slug-1"}, {"id": "unknown-slug"}],
+        ]
+        tasks.check_kinto_push_queue()
+
+        for experiment in experiments:
+            self.assertTrue(
+                experiment.changes.filter(
+                    old_status=Experiment.STATUS_ACCEPTED,
+                    new_status=Experiment.STATUS_REJECTED,
+                    message="it's no good",
+                ).exists()
+            )
+        self.assertCountEqual(
+            [c[1]["id"] for c in self.mock_kinto_client.delete_record.call_args_list],
+            ["recipe-slug-0", "recipe-slug-1"],
+        )
+
 
 class TestCheckExperimentIsLive(MockKintoClientMixin, TestCase):
     def test_experiment_updates_when_recipe_is_in_main(self):
@@ -316,3 +533,51 @@ class TestCheckExperimentIsComplete(MockKintoClientMixin, TestCase):
                 new_status=Experiment.STATUS_COMPLETE,
             ).exists()
         )
+
+
+class TestStatusCheckScheduling(MockKintoClientMixin, TestCase):
+    def test_no_due_experiments_skip_kinto(self):
+        experiment = ExperimentFactory.create_with_status(
+            Experiment.STATUS_ACCEPTED, type=Experiment.TYPE_RAPID
+        )
+        Experiment.objects.filter(id=experiment.id).update(
+            next_status_check=timezone.now() + datetime.timedelta(minutes=5)
+        )
+
+        tasks.check_experiment_is_live()
+
+        self.mock_kinto_client.get_records.assert_not_called()
+
+    def test_checked_experiments_are_rescheduled(self):
+        experiment = ExperimentFactory.create_with_status(
+            Experiment.STATUS_LIVE,
+            type=Experiment.TYPE_RAPID,
+        )
+        Experiment.objects.filter(id=experiment.id).update(
+            enrollment_end_date=None,
+            end_date=datetime.date.today() + datetime.timedelta(days=20),
+        )
+        self.mock_kinto_client.get_records.return_value = [{"id": experiment.recipe_slug}]
+
+        tasks.check_experiment_is_complete()
+
+        experiment = Experiment.objects.get(id=experiment.id)
+        self.assertEqual(experiment.status, Experiment.STATUS_LIVE)
+        self.assertGreater(
+            experiment.next_status_check,
+            timezone.now() + datetime.timedelta(minutes=10),
+        )
+
+    def test_updated_experiments_are_scheduled_from_new_status(self):
+        experiment = ExperimentFactory.create_with_status(
+            Experiment.STATUS_LIVE,
+            type=Experiment.TYPE_RAPID,
+        )
+        Experiment.objects.filter(id=experiment.id).update(next_status_check=None)
+        self.mock_kinto_client.get_records.return_value = []
+
+        tasks.check_experiment_is_complete()
+
+        experiment = Experiment.objects.get(id=experiment.id)
+        self.assertEqual(experiment.status, Experiment.STATUS_COMPLETE)
+        self.assertIsNone(experiment.next_status_check)
@@ -1,7 +1,17 @@
+from collections import defaultdict
+
+import markus
 import requests
 import logging
 from django.conf import settings
 from django.contrib.auth import get_user_model
+from requests.adapters import HTTPAdapter
+
+from experimenter.base.cache import LocalLRUCache
+from experimenter.base.http import JitteredRetry, ProcessLocal
+
+
+metrics = markus.get_metrics("normandy.client")
 
 
 class NormandyError(Exception):
@@ -20,11 +30,80 @@ class NormandyDecodeError(NormandyError):
     message = "Error parsing JSON Normandy Response"
 
 
-def make_normandy_call(url, params={}):
+def build_session():
+    retry = JitteredRetry(
+        total=settings.NORMANDY_API_MAX_RETRIES,
+        backoff_factor=settings.NORMANDY_API_BACKOFF_FACTOR,
+        status_forcelist=(500, 502, 503, 504),
+        method_whitelist=frozenset(["GET"]),
+        raise_on_status=False,
+    )
+    adapter = HTTPAdapter(
+        pool_connections=settings.NORMANDY_API_POOL_SIZE,
+        pool_maxsize=settings.NORMANDY_API_POOL_SIZE,
+        max_retries=retry,
+    )
+
+    session = requests.Session()
+    session.mount("http://", adapter)
+    session.mount("https://", adapter)
+    return session
+
+
+_session = ProcessLocal(build_session)
+
+
+def get_session():
+    return _session.get()
+
+
+# Responses with their ETag / Last-Modified validators, so unchanged
+# recipes are answered with a 304 instead of being downloaded again
+recipe_cache = LocalLRUCache(settings.NORMANDY_RECIPE_CACHE_SIZE)
+
+
+def make_normandy_call(url, params={}, conditional=False):
+    cache_key = (url, tuple(sorted(params.items())))
+    cached = recipe_cache.get(cache_key) if conditional else None
+
+    headers = {}
+    if cached is not None:
+        if cached["etag"]:
+            headers["If-None-Match"] = cached["etag"]
+        if cached["last_modified"]:
+            headers["If-Modified-Since"] = cached["last_modified"]
+
     try:
-        response = requests.get(url, verify=(not settings.DEBUG), params=params)
+        with metrics.timer("request.timing"):
+            response = get_session().get(
+                url,
+                verify=(not settings.DEBUG),
+                params=params,
+                headers=headers,
+                timeout=(
+                    settings.NORMANDY_API_CONNECT_TIMEOUT,
+                    settings.NORMANDY_API_READ_TIMEOUT,
+                ),
+            )
+
+        if cached is not None and response.status_code == 304:
+            metrics.incr("recipe_cache.hit")
+            return cached["data"]
+
         response.raise_for_status()
-        return response.json()
+        data = response.json()
+
+        if conditional:
+            metrics.incr("recipe_cache.miss")
+            etag = response.headers.get("ETag")
+            last_modified = response.headers.get("Last-Modified")
+            if etag or last_modified:
+                recipe_cache.set(
+                    cache_key,
+                    {"etag": etag, "last_modified": last_modified, "data": data},
+                )
+
+        return data
     except requests.exceptions.HTTPError as e:
         logging.exception(
             "Normandy API returned Nonsuccessful Response Code: {}".format(e)
@@ -40,7 +119,7 @@ def make_normandy_call(url, params={}):
 
 def get_recipe(recipe_id):
     recipe_url = settings.NORMANDY_API_RECIPE_URL.format(id=recipe_id)
-    recipe_data = make_normandy_call(recipe_url)
+    recipe_data = make_normandy_call(recipe_url, conditional=True)
     return recipe_data["approved_revision"]
 
 
@@ -52,6 +131,23 @@ def get_recipe_list(experiment_slug):
     return recipe_data["results"]
 
 
+def get_recipes_by_experimenter_slug():
+    recipes_by_slug = defaultdict(list)
+    recipe_url = settings.NORMANDY_API_RECIPES_LIST_URL
+
+    while recipe_url:
+        recipe_data = make_normandy_call(recipe_url)
+
+        for recipe in recipe_data["results"]:
+            slug = (recipe.get("latest_revision") or {}).get("experimenter_slug")
+            if slug:
+                recipes_by_slug[slug].append(recipe)
+
+        recipe_url = recipe_data.get("next")
+
+    return dict(recipes_by_slug)
+
+
 def get_recipe_state_enabler(recipe_data):
     # set email default if no email/creator is found in normandy
     enabler_email = settings.NORMANDY_DEFAULT_CHANGELOG_USER
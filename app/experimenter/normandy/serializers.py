@@ -1,5 +1,6 @@
 import json
 from rest_framework import serializers
+from rest_framework.fields import get_attribute
 
 from experimenter.experiments.models import (
     Experiment,
@@ -18,15 +19,10 @@ class PrefValueField(serializers.Field):
         self.value_field = value_field
 
     def to_representation(self, obj):
-        model_fields = (
-            type(obj)
-            .objects.filter(id=obj.id)
-            .values(self.type_field, self.value_field)
-            .first()
-        )
-
-        pref_type = model_fields[self.type_field]
-        value = model_fields[self.value_field]
+        # Fields use the lookup notation (experiment__pref_type) but are read
+        # from the loaded instance so prefetched relations aren't queried again
+        pref_type = get_attribute(obj, self.type_field.split("__"))
+        value = get_attribute(obj, self.value_field.split("__"))
 
         if pref_type in (Experiment.PREF_TYPE_BOOL, Experiment.PREF_TYPE_INT):
             return json.loads(value)
@@ -94,7 +90,7 @@ class FilterObjectLocaleSerializer(serializers.ModelSerializer):
         return "locale"
 
     def get_locales(self, obj):
-        return list(obj.locales.all().values_list("code", flat=True))
+        return [locale.code for locale in obj.locales.all()]
 
 
 class FilterObjectCountrySerializer(serializers.ModelSerializer):
@@ -109,7 +105,7 @@ class FilterObjectCountrySerializer(serializers.ModelSerializer):
         return "country"
 
     def get_countries(self, obj):
-        return list(obj.countries.all().values_list("code", flat=True))
+        return [country.code for country in obj.countries.all()]
 
 
 class ExperimentRecipeVariantSerializer(serializers.ModelSerializer):
@@ -1,4 +1,7 @@
 import decimal
+from collections import defaultdict
+from concurrent.futures import ThreadPoolExecutor
+
 import markus
 from celery.utils.log import get_task_logger
 
@@ -6,20 +9,22 @@ from django.conf import settings
 from django.contrib.auth import get_user_model
 from django.db import IntegrityError, transaction
 
+from experimenter.base.locks import task_lock
 from experimenter.celery import app
-from experimenter.experiments.changelog_utils import update_experiment_with_change_log
+from experimenter.experiments.changelog_utils import (
+    bulk_update_experiments_with_change_log,
+    update_experiment_with_change_log,
+)
 
 from experimenter.experiments.models import Experiment
+from experimenter.base.cache import LocalLRUCache
 from experimenter.bugzilla.tasks import (
     add_start_date_comment_task,
     comp_experiment_update_res_task,
 )
 from experimenter.normandy import client as normandy
 
-from experimenter.experiments.email import (
-    send_experiment_launch_email,
-    send_period_ending_emails_task,
-)
+from experimenter.experiments.email import send_experiment_launch_email
 
 STATUS_UPDATE_MAPPING = {
     Experiment.STATUS_ACCEPTED: Experiment.STATUS_LIVE,
@@ -29,21 +34,39 @@ STATUS_UPDATE_MAPPING = {
 logger = get_task_logger(__name__)
 metrics = markus.get_metrics("experiments.tasks")
 
+# recipe revisions already applied to each experiment by this worker
+processed_recipes = LocalLRUCache(settings.NORMANDY_RECIPE_CACHE_SIZE)
+
 
 @app.task
+@task_lock()
 @metrics.timer_decorator("update_recipe_ids_to_experiments.timing")
 def update_recipe_ids_to_experiments():
     metrics.incr("update_ready_to_ship_experiments.started")
     logger.info("Update Recipes to Experiments")
 
-    ready_to_ship_experiments = Experiment.objects.filter(
-        status__in=[Experiment.STATUS_SHIP, Experiment.STATUS_ACCEPTED]
-    ).exclude(type=Experiment.TYPE_RAPID)
+    ready_to_ship_experiments = list(
+        Experiment.objects.status_check_due()
+        .filter(status__in=[Experiment.STATUS_SHIP, Experiment.STATUS_ACCEPTED])
+        .exclude(type=Experiment.TYPE_RAPID)
+    )
 
+    recipes_by_slug = None
+    if ready_to_ship_experiments and settings.NORMANDY_API_BATCH_RECIPE_LIST:
+        try:
+            recipes_by_slug = normandy.get_recipes_by_experimenter_slug()
+        except (KeyError, normandy.NormandyError) as e:
+            logger.info(f"Failed to list recipes, falling back to slug lookups: {e}")
+            metrics.incr("update_ready_to_experiments.list_failed")
+
+    experiment_changes = defaultdict(list)
     for experiment in ready_to_ship_experiments:
         try:
             logger.info("Updating Experiment: {}".format(experiment))
-            recipe_data = normandy.get_recipe_list(experiment.slug)
+            if recipes_by_slug is not None:
+                recipe_data = recipes_by_slug.get(experiment.slug, [])
+            else:
+                recipe_data = normandy.get_recipe_list(experiment.slug)
 
             if len(recipe_data):
                 sorted_recipe_data = sorted(recipe_data, key=lambda x: x.get("id"))
@@ -60,29 +83,67 @@ def update_recipe_ids_to_experiments():
                     .get("email", "")
                 ) or settings.NORMANDY_DEFAULT_CHANGELOG_USER
 
-                update_experiment_with_change_log(experiment, changed_data, user_email)
+                experiment_changes[user_email].append((experiment, changed_data))
 
-        except (IntegrityError, KeyError, normandy.NormandyError) as e:
+        except (KeyError, normandy.NormandyError) as e:
             logger.info(f"Failed to update Experiment {experiment}: {e}")
             metrics.incr("update_ready_to_experiments.failed")
+
+    updated_experiments = {}
+    for user_email, changes in experiment_changes.items():
+        try:
+            for experiment in bulk_update_experiments_with_change_log(
+                changes, user_email
+            ):
+                updated_experiments[experiment.id] = experiment
+        except IntegrityError:
+            # retry one by one so a conflicting experiment doesn't block the rest
+            for experiment, changed_data in changes:
+                try:
+                    updated_experiments[
+                        experiment.id
+                    ] = update_experiment_with_change_log(
+                        experiment, changed_data, user_email
+                    )
+                except IntegrityError as e:
+                    logger.info(f"Failed to update Experiment {experiment}: {e}")
+                    metrics.incr("update_ready_to_experiments.failed")
+
+    # updated experiments are scheduled from their new status
+    Experiment.schedule_status_checks(
+        [
+            updated_experiments.get(experiment.id, experiment)
+            for experiment in ready_to_ship_experiments
+        ]
+    )
     metrics.incr("update_ready_to_experiments.completed")
 
 
 @app.task
+@task_lock()
 @metrics.timer_decorator("update_launched_experiments.timing")
 def update_launched_experiments():
     metrics.incr("update_launched_experiments.started")
     logger.info("Updating launched experiments info")
 
-    launched_experiments = Experiment.objects.filter(
-        status__in=[Experiment.STATUS_ACCEPTED, Experiment.STATUS_LIVE]
-    ).exclude(type=Experiment.TYPE_RAPID)
+    launched_experiments = list(
+        Experiment.objects.status_check_due()
+        .filter(status__in=[Experiment.STATUS_ACCEPTED, Experiment.STATUS_LIVE])
+        .exclude(type=Experiment.TYPE_RAPID)
+    )
+    recipes = fetch_recipes(launched_experiments)
 
     for experiment in launched_experiments:
         try:
             logger.info("Updating Experiment: {}".format(experiment))
             if experiment.normandy_id:
-                recipe_data = normandy.get_recipe(experiment.normandy_id)
+                recipe_data = recipes[experiment.id].result()
+
+                recipe_state = get_recipe_state(experiment, recipe_data)
+                if recipe_state and processed_recipes.get(experiment.id) == recipe_state:
+                    logger.info(f"Skipping Experiment {experiment}: recipe unchanged")
+                    metrics.incr("update_launched_experiments.unchanged")
+                    continue
 
                 if needs_to_be_updated(recipe_data, experiment.status):
                     experiment = update_status_task(experiment, recipe_data)
@@ -97,7 +158,10 @@ def update_launched_experiments():
                 if experiment.status == Experiment.STATUS_LIVE:
                     update_population_percent(experiment, recipe_data)
                     set_is_paused_value_task.delay(experiment.id, recipe_data)
-                    send_period_ending_emails_task(experiment)
+
+                processed_recipes.set(
+                    experiment.id, get_recipe_state(experiment, recipe_data)
+                )
             else:
                 logger.info(
                     "Skipping Experiment: {}. No Normandy id found".format(experiment)
@@ -105,9 +169,32 @@ def update_launched_experiments():
         except (IntegrityError, KeyError, normandy.NormandyError) as e:
             logger.info(f"Failed to update Experiment {experiment}: {e}")
             metrics.incr("update_launched_experiments.failed")
+
+    Experiment.schedule_status_checks(launched_experiments)
     metrics.incr("update_launched_experiments.completed")
 
 
+def get_recipe_state(experiment, recipe_data):
+    # enabling or disabling a recipe doesn't create a new revision, so the
+    # enabled flag and the experiment's own status are part of the state
+    if recipe_data and recipe_data.get("id") is not None:
+        return (recipe_data["id"], recipe_data.get("enabled"), experiment.status)
+
+
+def fetch_recipes(experiments):
+    """
+    Fetches the recipes of the experiments concurrently and returns their
+    futures by experiment id, so a failed fetch raises its error only when
+    that experiment's result is read.
+    """
+    with ThreadPoolExecutor(max_workers=settings.NORMANDY_API_MAX_WORKERS) as executor:
+        return {
+            experiment.id: executor.submit(normandy.get_recipe, experiment.normandy_id)
+            for experiment in experiments
+            if experiment.normandy_id
+        }
+
+
 def update_status_task(experiment, recipe_data):
     logger.info("Updating Experiment Status")
     enabler = normandy.get_recipe_state_enabler(recipe_data)
@@ -126,6 +213,7 @@ def update_status_task(experiment, recipe_data):
 
 
 @app.task
+@task_lock(key=lambda experiment_id, *args, **kwargs: experiment_id)
 @metrics.timer_decorator("set_is_paused_value")
 def set_is_paused_value_task(experiment_id, recipe_data):
     experiment = Experiment.objects.get(id=experiment_id)
@@ -1,19 +1,31 @@
+import json
+import threading
+import time
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+
 import mock
+from django.test import override_settings
+
+from experimenter.base.http import ProcessLocal
+from experimenter.normandy import client, tasks
 
 
 class MockNormandyMixin(object):
     def setUp(self):
         super().setUp()
 
-        mock_normandy_requests_get_patcher = mock.patch(
-            "experimenter.normandy.client.requests.get"
+        mock_normandy_session_patcher = mock.patch(
+            "experimenter.normandy.client.get_session"
         )
-        self.mock_normandy_requests_get = mock_normandy_requests_get_patcher.start()
-        self.addCleanup(mock_normandy_requests_get_patcher.stop)
+        mock_normandy_session = mock_normandy_session_patcher.start()
+        self.addCleanup(mock_normandy_session_patcher.stop)
+        self.mock_normandy_requests_get = mock_normandy_session.return_value.get
         self.mock_normandy_requests_get.return_value = (
             self.buildMockSuccessEnabledResponse()
         )
 
+        client.recipe_cache.clear()
+
     def buildMockSuccessEnabledResponse(self):
         mock_response_data = {
             "approved_revision": {
@@ -72,7 +84,7 @@ class MockNormandyMixin(object):
         return mock_response
 
     def setUpMockNormandyFailWithSpecifiedID(self, normandy_id):
-        def determine_response(url, verify=None, params={}):
+        def determine_response(url, **kwargs):
             if normandy_id in url:
                 return self.buildMockFailedResponse()
             else:
@@ -85,6 +97,8 @@ class MockNormandyTasksMixin(object):
     def setUp(self):
         super().setUp()
 
+        tasks.processed_recipes.clear()
+
         mock_tasks_set_is_paused_value_patcher = mock.patch(
             "experimenter.normandy.tasks.set_is_paused_value_task"
         )
@@ -110,3 +124,97 @@ class MockNormandyTasksMixin(object):
         )
 
         self.addCleanup(mock_tasks_comp_experiment_update_res_patcher.stop)
+
+
+class FakeNormandyRequestHandler(BaseHTTPRequestHandler):
+    protocol_version = "HTTP/1.1"
+
+    def setup(self):
+        super().setup()
+        self.server.connections += 1
+
+    def do_GET(self):
+        self.server.requests.append(self.path)
+        self.server.request_headers.append(self.headers)
+
+        status, data, delay = (200, self.server.default_data, 0)
+        if self.server.responses:
+            status, data, delay = self.server.responses.pop(0)
+
+        time.sleep(delay)
+
+        etag = self.server.etag
+        if etag and self.headers.get("If-None-Match") == etag:
+            self.send_response(304)
+            self.send_header("ETag", etag)
+            self.send_header("Content-Length", "0")
+            self.end_headers()
+            return
+
+        body = json.dumps(data).encode()
+        self.send_response(status)
+        self.send_header("Content-Type", "application/json")
+        self.send_header("Content-Length", str(len(body)))
+        if etag:
+            self.send_header("ETag", etag)
+        self.end_headers()
+        self.wfile.write(body)
+
+    def log_message(self, *args):
+        pass
+
+
+class FakeNormandyServer(ThreadingHTTPServer):
+    daemon_threads = True
+
+    def __init__(self):
+        super().__init__(("127.0.0.1", 0), FakeNormandyRequestHandler)
+        self.connections = 0
+        self.requests = []
+        self.request_headers = []
+        self.responses = []
+        self.etag = None
+        self.default_data = {}
+
+    @property
+    def url(self):
+        return "http://{}:{}".format(*self.server_address)
+
+    def handle_error(self, request, client_address):
+        # timed out clients hang up mid response
+        pass
+
+
+class FakeNormandyServerMixin(object):
+    def setUp(self):
+        super().setUp()
+
+        self.normandy_server = FakeNormandyServer()
+        server_thread = threading.Thread(target=self.normandy_server.serve_forever)
+        server_thread.daemon = True
+        server_thread.start()
+        self.addCleanup(self.normandy_server.server_close)
+        self.addCleanup(self.normandy_server.shutdown)
+
+        settings_override = override_settings(
+            NORMANDY_API_RECIPE_URL=self.normandy_server.url + "/api/v3/recipe/{id}/",
+            NORMANDY_API_RECIPES_LIST_URL=self.normandy_server.url + "/api/v3/recipe/",
+            NORMANDY_API_BACKOFF_FACTOR=0,
+        )
+        settings_override.enable()
+        self.addCleanup(settings_override.disable)
+
+        # every test starts from a fresh session built with its own settings
+        session_patcher = mock.patch.object(
+            client, "_session", ProcessLocal(client.build_session)
+        )
+        session_patcher.start()
+        self.addCleanup(session_patcher.stop)
+        self.addCleanup(self.close_normandy_session)
+        client.recipe_cache.clear()
+
+    def close_normandy_session(self):
+        client.get_session().close()
+
+    def setUpNormandyResponses(self, *responses):
+        self.normandy_server.responses.extend(responses)
@@ -1,6 +1,9 @@
+import socket
+
 import mock
+from markus.testing import MetricsMock
 from requests.exceptions import RequestException, HTTPError
-from django.test import TestCase
+from django.test import TestCase, override_settings
 
 from experimenter.normandy import (
     APINormandyError,
@@ -8,8 +11,13 @@ from experimenter.normandy import (
     NormandyDecodeError,
     make_normandy_call,
     get_recipe,
+    get_recipe_list,
+    client,
+)
+from experimenter.normandy.tests.mixins import (
+    FakeNormandyServerMixin,
+    MockNormandyMixin,
 )
-from experimenter.normandy.tests.mixins import MockNormandyMixin
 
 
 class TestMakeNormandyCall(MockNormandyMixin, TestCase):
@@ -50,3 +58,183 @@ class TestMakeNormandyCall(MockNormandyMixin, TestCase):
     def test_successful_get_recipe_returns_recipe_data(self):
         response_data = get_recipe(1234)
         self.assertTrue(response_data["enabled"])
+
+
+class TestNormandySession(FakeNormandyServerMixin, TestCase):
+    def test_get_recipe_returns_approved_revision(self):
+        self.setUpNormandyResponses((200, {"approved_revision": {"enabled": True}}, 0))
+
+        self.assertEqual(get_recipe(1234), {"enabled": True})
+        self.assertEqual(self.normandy_server.requests, ["/api/v3/recipe/1234/"])
+
+    def test_get_recipe_list_sends_slug(self):
+        self.setUpNormandyResponses((200, {"results": [{"id": 1}]}, 0))
+
+        self.assertEqual(get_recipe_list("a-slug"), [{"id": 1}])
+        self.assertEqual(
+            self.normandy_server.requests, ["/api/v3/recipe/?experimenter_slug=a-slug"]
+        )
+
+    def test_get_recipes_by_experimenter_slug_follows_pages(self):
+        next_url = self.normandy_server.url + "/api/v3/recipe/?page=2"
+        self.setUpNormandyResponses(
+            (
+                200,
+                {
+                    "next": next_url,
+                    "results": [
+                        {"id": 1, "latest_revision": {"experimenter_slug": "a-slug"}},
+                        {"id": 2, "latest_revision": {"experimenter_slug": None}},
+                    ],
+                },
+                0,
+            ),
+            (
+                200,
+                {
+                    "next": None,
+                    "results": [
+                        {"id": 3, "latest_revision": {"experimenter_slug": "a-slug"}},
+                        {"id": 4, "latest_revision": {"experimenter_slug": "b-slug"}},
+                    ],
+                },
+                0,
+            ),
+        )
+
+        recipes_by_slug = client.get_recipes_by_experimenter_slug()
+
+        self.assertEqual(
+            {
+                slug: [r["id"] for r in recipes]
+                for slug, recipes in recipes_by_slug.items()
+            },
+            {"a-slug": [1, 3], "b-slug": [4]},
+        )
+        self.assertEqual(
+            self.normandy_server.requests, ["/api/v3/recipe/", "/api/v3/recipe/?page=2"]
+        )
+
+    def test_unchanged_recipe_is_served_from_cache(self):
+        self.normandy_server.etag = '"v1"'
+        self.normandy_server.default_data = {
+            "approved_revision": {"id": 1, "enabled": True}
+        }
+
+        with MetricsMock() as mm:
+            self.assertEqual(get_recipe(1234), {"id": 1, "enabled": True})
+            self.assertEqual(get_recipe(1234), {"id": 1, "enabled": True})
+
+        first_headers, second_headers = self.normandy_server.request_headers
+        self.assertIsNone(first_headers.get("If-None-Match"))
+        self.assertEqual(second_headers.get("If-None-Match"), '"v1"')
+        mm.assert_incr_once("normandy.client.recipe_cache.miss")
+        mm.assert_incr_once("normandy.client.recipe_cache.hit")
+
+    def test_changed_recipe_replaces_cached_recipe(self):
+        self.normandy_server.etag = '"v1"'
+        self.setUpNormandyResponses((200, {"approved_revision": {"id": 1}}, 0))
+        get_recipe(1234)
+
+        self.normandy_server.etag = '"v2"'
+        self.setUpNormandyResponses((200, {"approved_revision": {"id": 2}}, 0))
+
+        self.assertEqual(get_recipe(1234), {"id": 2})
+        self.assertEqual(get_recipe(1234), {"id": 2})
+        self.assertEqual(
+            self.normandy_server.request_headers[2].get("If-None-Match"), '"v2"'
+        )
+
+    def test_recipe_without_validators_is_not_cached(self):
+        self.normandy_server.default_data = {"approved_revision": {"id": 1}}
+
+        get_recipe(1234)
+        get_recipe(1234)
+
+        self.assertIsNone(self.normandy_server.request_headers[1].get("If-None-Match"))
+
+    def test_calls_reuse_one_connection(self):
+        for i in range(3):
+            make_normandy_call(self.normandy_server.url)
+
+        self.assertEqual(len(self.normandy_server.requests), 3)
+        self.assertEqual(self.normandy_server.connections, 1)
+
+    def test_retries_server_errors(self):
+        self.setUpNormandyResponses(
+            (503, {}, 0), (502, {}, 0), (200, {"detail": "ok"}, 0)
+        )
+
+        self.assertEqual(make_normandy_call(self.normandy_server.url), {"detail": "ok"})
+        self.assertEqual(len(self.normandy_server.requests), 3)
+
+    @override_settings(NORMANDY_API_MAX_RETRIES=1)
+    def test_raises_nonsuccessful_call_after_max_retries(self):
+        self.setUpNormandyResponses((500, {}, 0), (500, {}, 0), (200, {}, 0))
+
+        with self.assertRaises(NonsuccessfulNormandyCall):
+            make_normandy_call(self.normandy_server.url)
+
+        self.assertEqual(len(self.normandy_server.requests), 2)
+
+    def test_client_errors_are_not_retried(self):
+        self.setUpNormandyResponses((404, {"detail": "Not found."}, 0))
+
+        with self.assertRaises(NonsuccessfulNormandyCall):
+            make_normandy_call(self.normandy_server.url)
+
+        self.assertEqual(len(self.normandy_server.requests), 1)
+
+    @override_settings(NORMANDY_API_READ_TIMEOUT=0.1)
+    def test_retries_read_timeouts(self):
+        self.setUpNormandyResponses((200, {}, 0.5), (200, {"detail": "ok"}, 0))
+
+        self.assertEqual(make_normandy_call(self.normandy_server.url), {"detail": "ok"})
+        self.assertEqual(len(self.normandy_server.requests), 2)
+
+    @override_settings(NORMANDY_API_READ_TIMEOUT=0.1, NORMANDY_API_MAX_RETRIES=0)
+    def test_raises_api_error_on_read_timeout(self):
+        self.setUpNormandyResponses((200, {}, 0.5))
+
+        with self.assertRaises(APINormandyError):
+            make_normandy_call(self.normandy_server.url)
+
+    def test_raises_api_error_when_server_is_unreachable(self):
+        with socket.socket() as unused_socket:
+            unused_socket.bind(("127.0.0.1", 0))
+            url = "http://{}:{}".format(*unused_socket.getsockname())
+
+        with self.assertRaises(APINormandyError):
+            make_normandy_call(url)
+
+    def test_records_request_timing(self):
+        with MetricsMock() as mm:
+            make_normandy_call(self.normandy_server.url)
+
+        mm.assert_timing_once("normandy.client.request.timing")
+
+    def test_session_is_rebuilt_in_forked_process(self):
+        session = client.get_session()
+        self.assertIs(client.get_session(), session)
+
+        with mock.patch("experimenter.base.http.os.getpid", return_value=-1):
+            forked_session = client.get_session()
+
+        self.assertIsNot(forked_session, session)
+        session.close()
+
+
+class TestJitteredRetry(TestCase):
+    def test_backoff_is_spread_below_exponential_backoff(self):
+        retry = client.JitteredRetry(total=5, backoff_factor=1)
+        for i in range(3):
+            retry = retry.increment(method="GET", url="/")
+
+        for i in range(20):
+            self.assertTrue(0 <= retry.get_backoff_time() <= 4)
+
+    def test_no_backoff_before_second_retry(self):
+        retry = client.JitteredRetry(total=5, backoff_factor=1)
+        retry = retry.increment(method="GET", url="/")
+
+        self.assertEqual(retry.get_backoff_time(), 0)
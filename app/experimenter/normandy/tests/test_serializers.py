@@ -1,4 +1,6 @@
 from decimal import Decimal
+
+import mock
 from django.test import TestCase
 
 from experimenter.base.tests.factories import CountryFactory, LocaleFactory
@@ -133,6 +135,23 @@ class TestFilterObjectVersionsSerializer(TestCase):
             serializer.data, {"type": "version", "versions": [68, 69, 70]}
         )
 
+    def test_serializer_outputs_stored_version_integers(self):
+        experiment = ExperimentFactory.create(
+            firefox_min_version="68.0", firefox_max_version="70.0"
+        )
+        Experiment.objects.filter(id=experiment.id).update(
+            firefox_min_version_int=71, firefox_max_version_int=72
+        )
+        experiment = Experiment.objects.get(id=experiment.id)
+
+        with mock.patch.object(Experiment, "version_integer") as mock_version_integer:
+            serializer = FilterObjectVersionsSerializer(experiment)
+            self.assertDictEqual(
+                serializer.data, {"type": "version", "versions": [71, 72]}
+            )
+
+        mock_version_integer.assert_not_called()
+
 
 class TestFilterObjectLocaleSerializer(TestCase):
     def test_serializer_outputs_expected_schema(self):
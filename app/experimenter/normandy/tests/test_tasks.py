@@ -1,13 +1,18 @@
+import datetime
 import decimal
+import threading
 from datetime import date
 
 import mock
+from markus.testing import MetricsMock
+from requests.exceptions import HTTPError, RequestException
 from django.conf import settings
 from django.core import mail
 from django.test import override_settings, TestCase
+from django.utils import timezone
 
-from experimenter.experiments.models import Experiment, ExperimentEmail
-from experimenter.experiments.constants import ExperimentConstants
+from experimenter.base.locks import LocalLock
+from experimenter.experiments.models import Experiment
 
 
 from experimenter.experiments.tests.factories import ExperimentFactory
@@ -19,6 +24,7 @@ from experimenter.normandy import tasks, client as normandy
 
 @override_settings(CELERY_TASK_ALWAYS_EAGER=True)
 class TestUpdateExperimentTask(MockNormandyTasksMixin, MockNormandyMixin, TestCase):
+    @override_settings(NORMANDY_API_BATCH_RECIPE_LIST=False)
     def test_update_ready_to_ship_experiment(self):
         experiment = ExperimentFactory.create_with_status(
             target_status=Experiment.STATUS_SHIP
@@ -54,6 +60,7 @@ class TestUpdateExperimentTask(MockNormandyTasksMixin, MockNormandyMixin, TestCa
             ).exists()
         )
 
+    @override_settings(NORMANDY_API_BATCH_RECIPE_LIST=False)
     def test_update_ready_to_ship_experiment_with_pre_existing_recipe(self):
         experiment = ExperimentFactory.create_with_status(
             target_status=Experiment.STATUS_ACCEPTED, normandy_id=2
@@ -82,6 +89,89 @@ class TestUpdateExperimentTask(MockNormandyTasksMixin, MockNormandyMixin, TestCa
             ).exists()
         )
 
+    def test_update_ready_to_ship_experiments_from_recipe_listing(self):
+        experiment1 = ExperimentFactory.create_with_status(
+            target_status=Experiment.STATUS_SHIP, slug="slug-1"
+        )
+        experiment2 = ExperimentFactory.create_with_status(
+            target_status=Experiment.STATUS_SHIP, slug="slug-2"
+        )
+        experiment3 = ExperimentFactory.create_with_status(
+            target_status=Experiment.STATUS_SHIP, slug="slug-3"
+        )
+        pages = {
+            settings.NORMANDY_API_RECIPES_LIST_URL: {
+                "next": "https://normandy/page-2/",
+                "results": [
+                    {
+                        "id": 10,
+                        "latest_revision": {
+                            "experimenter_slug": "slug-1",
+                            "creator": {"email": "dev@example.com"},
+                        },
+                    },
+                    {"id": 20, "latest_revision": {"experimenter_slug": "slug-2"}},
+                ],
+            },
+            "https://normandy/page-2/": {
+                "next": None,
+                "results": [
+                    {"id": 5, "latest_revision": {"experimenter_slug": "slug-1"}},
+                ],
+            },
+        }
+
+        def get_page(url, **kwargs):
+            mock_response = mock.Mock()
+            mock_response.json.return_value = pages[url]
+            return mock_response
+
+        self.mock_normandy_requests_get.side_effect = get_page
+
+        tasks.update_recipe_ids_to_experiments()
+
+        self.assertEqual(self.mock_normandy_requests_get.call_count, 2)
+
+        experiment1 = Experiment.objects.get(id=experiment1.id)
+        self.assertEqual(experiment1.status, Experiment.STATUS_ACCEPTED)
+        self.assertEqual(experiment1.normandy_id, 5)
+        self.assertEqual(experiment1.other_normandy_ids, [10])
+
+        experiment2 = Experiment.objects.get(id=experiment2.id)
+        self.assertEqual(experiment2.status, Experiment.STATUS_ACCEPTED)
+        self.assertEqual(experiment2.normandy_id, 20)
+
+        experiment3 = Experiment.objects.get(id=experiment3.id)
+        self.assertEqual(experiment3.status, Experiment.STATUS_SHIP)
+        self.assertIsNone(experiment3.normandy_id)
+
+    def test_update_ready_to_ship_experiments_falls_back_to_slug_lookups(self):
+        experiment = ExperimentFactory.create_with_status(
+            target_status=Experiment.STATUS_SHIP, slug="a-slug"
+        )
+
+        def get_recipes(url, params=None, **kwargs):
+            mock_response = mock.Mock()
+            if params:
+                mock_response.json.return_value = {"results": [{"id": 1}]}
+            else:
+                mock_response.raise_for_status.side_effect = HTTPError()
+            return mock_response
+
+        self.mock_normandy_requests_get.side_effect = get_recipes
+
+        with MetricsMock() as mm:
+            tasks.update_recipe_ids_to_experiments()
+
+        mm.assert_incr_once("experiments.tasks.update_ready_to_experiments.list_failed")
+        self.assertEqual(
+            self.mock_normandy_requests_get.call_args[1]["params"],
+            {"experimenter_slug": "a-slug"},
+        )
+        experiment = Experiment.objects.get(id=experiment.id)
+        self.assertEqual(experiment.status, Experiment.STATUS_ACCEPTED)
+        self.assertEqual(experiment.normandy_id, 1)
+
     def test_update_accepted_experiment_task(self):
         experiment = ExperimentFactory.create(
             status=Experiment.STATUS_ACCEPTED,
@@ -249,64 +339,130 @@ class TestUpdateExperimentTask(MockNormandyTasksMixin, MockNormandyMixin, TestCa
             ).exists()
         )
 
-    def test_experiment_without_normandy_ids(self):
-        ExperimentFactory.create_with_status(
-            target_status=Experiment.STATUS_LIVE, normandy_id=None
+    def test_failed_recipe_fetch_does_not_affect_other_experiments(self):
+        experiment1 = ExperimentFactory.create_with_status(
+            target_status=Experiment.STATUS_ACCEPTED, normandy_id=1234
+        )
+        experiment2 = ExperimentFactory.create_with_status(
+            target_status=Experiment.STATUS_ACCEPTED, normandy_id=1235
+        )
+        success_response = self.buildMockSuccessEnabledResponse()
+
+        def get_recipe(url, **kwargs):
+            if "1234" in url:
+                raise RequestException()
+            return success_response
+
+        self.mock_normandy_requests_get.side_effect = get_recipe
+
+        with MetricsMock() as mm:
+            tasks.update_launched_experiments()
+
+        experiment1 = Experiment.objects.get(id=experiment1.id)
+        experiment2 = Experiment.objects.get(id=experiment2.id)
+        self.assertEqual(experiment1.status, Experiment.STATUS_ACCEPTED)
+        self.assertEqual(experiment2.status, Experiment.STATUS_LIVE)
+        mm.assert_incr_once("experiments.tasks.update_launched_experiments.failed")
+        mm.assert_incr_once("experiments.tasks.update_launched_experiments.completed")
+
+    def test_unchanged_recipe_revision_is_not_processed_again(self):
+        experiment = ExperimentFactory.create_with_status(
+            target_status=Experiment.STATUS_ACCEPTED, normandy_id=1234
         )
+        mock_response = mock.Mock()
+        mock_response.json.return_value = {
+            "approved_revision": {
+                "id": 10,
+                "enabled": True,
+                "enabled_states": [{"creator": {"email": "dev@example.com"}}],
+                "arguments": {"isEnrollmentPaused": False},
+            }
+        }
+        self.mock_normandy_requests_get.return_value = mock_response
+
         tasks.update_launched_experiments()
-        self.mock_normandy_requests_get.assert_not_called()
 
-    def test_send_experiment_ending_email(self):
-        ExperimentFactory.create(
-            status=Experiment.STATUS_LIVE,
-            normandy_id=1234,
-            proposed_start_date=date.today(),
-            proposed_enrollment=0,
-            proposed_duration=5,
+        experiment = Experiment.objects.get(id=experiment.id)
+        self.assertEqual(experiment.status, Experiment.STATUS_LIVE)
+        self.assertEqual(self.mock_tasks_set_is_paused_value.delay.call_count, 1)
+
+        Experiment.objects.update(next_status_check=None)
+        with MetricsMock() as mm:
+            tasks.update_launched_experiments()
+
+        mm.assert_incr_once("experiments.tasks.update_launched_experiments.unchanged")
+        self.assertEqual(self.mock_tasks_set_is_paused_value.delay.call_count, 1)
+
+        mock_response.json.return_value["approved_revision"]["id"] = 11
+        Experiment.objects.update(next_status_check=None)
+        tasks.update_launched_experiments()
+
+        self.assertEqual(self.mock_tasks_set_is_paused_value.delay.call_count, 2)
+
+    def test_disabled_recipe_is_processed_without_new_revision(self):
+        experiment = ExperimentFactory.create_with_status(
+            target_status=Experiment.STATUS_LIVE, normandy_id=1234
         )
-        ExperimentFactory.create(
-            status=Experiment.STATUS_LIVE,
-            normandy_id=1234,
-            proposed_start_date=date.today(),
-            proposed_duration=30,
-            proposed_enrollment=0,
+        mock_response = mock.Mock()
+        mock_response.json.return_value = {
+            "approved_revision": {
+                "id": 10,
+                "enabled": True,
+                "enabled_states": [{"creator": {"email": "dev@example.com"}}],
+            }
+        }
+        self.mock_normandy_requests_get.return_value = mock_response
+        tasks.update_launched_experiments()
+
+        mock_response.json.return_value["approved_revision"]["enabled"] = False
+        Experiment.objects.update(next_status_check=None)
+        tasks.update_launched_experiments()
+
+        experiment = Experiment.objects.get(id=experiment.id)
+        self.assertEqual(experiment.status, Experiment.STATUS_COMPLETE)
+
+    @override_settings(NORMANDY_API_MAX_WORKERS=2)
+    def test_recipes_are_fetched_concurrently(self):
+        ExperimentFactory.create_with_status(
+            target_status=Experiment.STATUS_LIVE, normandy_id=1234
         )
-        exp_3 = ExperimentFactory.create(
-            status=Experiment.STATUS_LIVE,
-            normandy_id=1234,
-            proposed_start_date=date.today(),
-            proposed_duration=4,
-            proposed_enrollment=0,
+        ExperimentFactory.create_with_status(
+            target_status=Experiment.STATUS_LIVE, normandy_id=1235
         )
+        success_response = self.buildMockSuccessEnabledResponse()
+        # both fetches have to be in flight at once to get past the barrier
+        barrier = threading.Barrier(2, timeout=5)
 
-        ExperimentEmail.objects.create(
-            experiment=exp_3, type=ExperimentConstants.EXPERIMENT_ENDS
-        )
+        def get_recipe(url, **kwargs):
+            barrier.wait()
+            return success_response
+
+        self.mock_normandy_requests_get.side_effect = get_recipe
 
         tasks.update_launched_experiments()
 
-        self.assertEqual(len(mail.outbox), 1)
+        self.assertEqual(self.mock_normandy_requests_get.call_count, 2)
+        self.assertFalse(barrier.broken)
 
-    def test_accepted_experiment_becomes_live_if_normandy_enabled(self):
+    def test_experiment_without_normandy_ids(self):
+        ExperimentFactory.create_with_status(
+            target_status=Experiment.STATUS_LIVE, normandy_id=None
+        )
+        tasks.update_launched_experiments()
+        self.mock_normandy_requests_get.assert_not_called()
 
-        experiment = ExperimentFactory.create(
+    def test_live_experiment_period_ending_emails_are_left_to_digest(self):
+        ExperimentFactory.create(
+            status=Experiment.STATUS_LIVE,
             normandy_id=1234,
             proposed_start_date=date.today(),
             proposed_duration=30,
             proposed_enrollment=1,
         )
 
-        experiment.status = Experiment.STATUS_LIVE
-        experiment.save()
-
         tasks.update_launched_experiments()
-        experiment = Experiment.objects.get(normandy_id=1234)
 
-        self.assertEqual(len(mail.outbox), 1)
-        self.assertEqual(
-            mail.outbox[0].recipients(),
-            [experiment.owner.email, experiment.analysis_owner],
-        )
+        self.assertEqual(len(mail.outbox), 0)
 
     def test_live_rollout_updates_population_percent(self):
         experiment = ExperimentFactory.create(
@@ -409,3 +565,51 @@ class TestUpdateExperimentSubTask(MockNormandyMixin, MockBugzillaMixin, TestCase
                 message="Enrollment Completed",
             ).exists()
         )
+
+
+class TestStatusCheckScheduling(MockNormandyMixin, TestCase):
+    def test_experiments_not_due_are_not_polled(self):
+        ExperimentFactory.create_with_status(
+            target_status=Experiment.STATUS_LIVE, normandy_id=1234
+        )
+        Experiment.objects.update(
+            next_status_check=timezone.now() + datetime.timedelta(minutes=5)
+        )
+
+        tasks.update_launched_experiments()
+
+        self.mock_normandy_requests_get.assert_not_called()
+
+    def test_polled_experiments_are_rescheduled(self):
+        experiment = ExperimentFactory.create_with_status(
+            target_status=Experiment.STATUS_SHIP
+        )
+
+        tasks.update_recipe_ids_to_experiments()
+        call_count = self.mock_normandy_requests_get.call_count
+        tasks.update_recipe_ids_to_experiments()
+
+        self.assertGreater(call_count, 0)
+        self.assertEqual(self.mock_normandy_requests_get.call_count, call_count)
+        experiment = Experiment.objects.get(id=experiment.id)
+        self.assertGreater(experiment.next_status_check, timezone.now())
+
+
+class TestTaskLocks(MockNormandyMixin, TestCase):
+    def tearDown(self):
+        LocalLock.leases.clear()
+
+    def test_overlapping_run_is_skipped(self):
+        ExperimentFactory.create_with_status(
+            target_status=Experiment.STATUS_LIVE, normandy_id=1234
+        )
+        running = LocalLock(
+            "task-lock:experimenter.normandy.tasks.update_launched_experiments", 60
+        )
+        running.acquire()
+
+        with MetricsMock() as mm:
+            tasks.update_launched_experiments()
+
+        mm.assert_incr_once("base.locks.update_launched_experiments.skipped")
+        self.mock_normandy_requests_get.assert_not_called()
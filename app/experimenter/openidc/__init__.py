@@ -0,0 +1 @@
+default_app_config = "experimenter.openidc.apps.OpenIDCConfig"
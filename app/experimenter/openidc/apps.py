@@ -0,0 +1,8 @@
+from django.apps import AppConfig
+
+
+class OpenIDCConfig(AppConfig):
+    name = "experimenter.openidc"
+
+    def ready(self):
+        import experimenter.openidc.signals  # noqa: F401
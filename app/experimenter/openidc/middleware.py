@@ -1,9 +1,45 @@
-from django.urls import resolve, Resolver404
+import re
+
 from django.conf import settings
 from django.contrib.auth import get_user_model
+from django.contrib.auth.middleware import AuthenticationMiddleware
+from django.db import transaction
 from django.http import HttpResponse
+from django.urls import get_resolver
 from rest_framework.authentication import SessionAuthentication
-from django.contrib.auth.middleware import AuthenticationMiddleware
+
+from experimenter.base.cache import LocalLRUCache
+
+
+user_cache = LocalLRUCache(settings.OPENIDC_USER_CACHE_SIZE)
+
+
+class WhitelistMatcher(object):
+    """
+    The url patterns behind the whitelisted url names, compiled once so a
+    request path is matched without resolving it against the whole urlconf.
+    Recompiled whenever the whitelist setting changes.
+    """
+
+    def __init__(self):
+        self.names = None
+        self.patterns = []
+
+    def compile(self, names):
+        resolver = get_resolver()
+        self.patterns = [
+            re.compile(f"/{pattern}")
+            for name in names
+            for _, pattern, _, _ in resolver.reverse_dict.getlist(name)
+        ]
+        self.names = names
+
+    def match(self, path):
+        names = tuple(settings.OPENIDC_AUTH_WHITELIST)
+        if names != self.names:
+            self.compile(names)
+
+        return any(pattern.match(path) for pattern in self.patterns)
 
 
 class OpenIDCAuthMiddleware(AuthenticationMiddleware):
@@ -19,16 +55,14 @@ class OpenIDCAuthMiddleware(AuthenticationMiddleware):
     def __init__(self, get_response):
         self.get_response = get_response
         self.User = get_user_model()
+        self.field_names = [field.attname for field in self.User._meta.concrete_fields]
+        self.whitelist = WhitelistMatcher()
 
     def __call__(self, request):
-        try:
-            resolved = resolve(request.path)
-            if resolved.url_name in settings.OPENIDC_AUTH_WHITELIST:
-                # If the requested path is in our auth whitelist,
-                # skip authentication entirely
-                return self.get_response(request)
-        except Resolver404:
-            pass
+        if self.whitelist.match(request.path):
+            # If the requested path is in our auth whitelist,
+            # skip authentication entirely
+            return self.get_response(request)
 
         default_email = settings.DEV_USER_EMAIL if settings.DEBUG else None
         openidc_email = request.META.get(settings.OPENIDC_EMAIL_HEADER, default_email)
@@ -38,19 +72,38 @@ class OpenIDCAuthMiddleware(AuthenticationMiddleware):
             # is set then we reject the request entirely
             return HttpResponse("Please login using OpenID Connect", status=401)
 
-        try:
-            user = self.User.objects.get(username=openidc_email)
-        except self.User.DoesNotExist:
-            user = self.User(username=openidc_email, email=openidc_email)
-            if user.email == settings.DEV_USER_EMAIL and settings.DEBUG:
-                user.is_superuser = True
-                user.is_staff = True
-            user.save()
-
-        request.user = user
+        request.user = self.get_user(openidc_email)
 
         return self.get_response(request)
 
+    def get_user(self, openidc_email):
+        cached = user_cache.get(openidc_email)
+
+        if cached is None:
+            try:
+                user = self.User.objects.get(username=openidc_email)
+            except self.User.DoesNotExist:
+                user = self.User(username=openidc_email, email=openidc_email)
+                if user.email == settings.DEV_USER_EMAIL and settings.DEBUG:
+                    user.is_superuser = True
+                    user.is_staff = True
+                user.save()
+
+            cached = (user._state.db, [getattr(user, name) for name in self.field_names])
+
+            # only committed rows are cached, a user created in a transaction
+            # that rolls back must not be served from the cache afterwards
+            transaction.on_commit(
+                lambda: user_cache.set(
+                    openidc_email, cached, ttl=settings.OPENIDC_USER_CACHE_TTL
+                )
+            )
+
+        # each request gets its own instance built from the cached row, so
+        # permissions cached on it by the auth backend don't outlive the request
+        db, values = cached
+        return self.User.from_db(db, self.field_names, values)
+
 
 class OpenIDCRestFrameworkAuthenticator(SessionAuthentication):
     def authenticate(self, request):
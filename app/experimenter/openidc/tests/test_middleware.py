@@ -1,11 +1,10 @@
 from django.conf import settings
 from django.contrib.auth import get_user_model
-from django.urls import Resolver404
 from django.test import TestCase
 
 import mock
 
-from experimenter.openidc.middleware import OpenIDCAuthMiddleware
+from experimenter.openidc.middleware import OpenIDCAuthMiddleware, user_cache
 
 
 class OpenIDCAuthMiddlewareTests(TestCase):
@@ -13,29 +12,26 @@ class OpenIDCAuthMiddlewareTests(TestCase):
         self.response = "Response"
         self.middleware = OpenIDCAuthMiddleware(lambda request: self.response)
 
-        mock_resolve_patcher = mock.patch("experimenter.openidc.middleware.resolve")
-        self.mock_resolve = mock_resolve_patcher.start()
-        self.addCleanup(mock_resolve_patcher.stop)
-
     def test_whitelisted_url_is_not_authed(self):
         request = mock.Mock()
-        request.path = "/whitelisted-view/"
-        whitelisted_view_name = "whitelisted-view"
+        request.path = "/api/v1/experiments/experiment-slug/recipe/"
+        request.META = {}
 
-        with self.settings(OPENIDC_AUTH_WHITELIST=[whitelisted_view_name]):
-            mock_view = mock.Mock()
-            mock_view.url_name = whitelisted_view_name
-            self.mock_resolve.return_value = mock_view
+        with self.settings(OPENIDC_AUTH_WHITELIST=["experiments-api-recipe"]):
+            response = self.middleware(request)
 
+        self.assertEqual(response, self.response)
+
+        with self.settings(OPENIDC_AUTH_WHITELIST=["experiments-api-list"]):
             response = self.middleware(request)
-            self.assertEqual(response, self.response)
+
+        self.assertEqual(response.status_code, 401)
 
     def test_404_path_forces_authentication(self):
         request = mock.Mock()
+        request.path = "/not/a/real/path/"
         request.META = {}
 
-        self.mock_resolve.side_effect = Resolver404
-
         response = self.middleware(request)
         self.assertEqual(response.status_code, 401)
 
@@ -142,3 +138,58 @@ class OpenIDCAuthMiddlewareTests(TestCase):
 
         self.assertEqual(response.content, b"Please login using OpenID Connect")
         self.assertEqual(User.objects.all().count(), 0)
+
+
+@mock.patch("experimenter.openidc.middleware.transaction.on_commit", lambda func: func())
+class OpenIDCUserCacheTests(TestCase):
+    def setUp(self):
+        self.middleware = OpenIDCAuthMiddleware(lambda request: "Response")
+        self.user_email = "user@example.com"
+        user_cache.clear()
+        self.addCleanup(user_cache.clear)
+
+    def authenticate(self):
+        request = mock.Mock()
+        request.path = "/"
+        request.META = {settings.OPENIDC_EMAIL_HEADER: self.user_email}
+
+        with self.settings(OPENIDC_AUTH_WHITELIST=[]):
+            self.middleware(request)
+
+        return request.user
+
+    def test_cached_user_is_authenticated_without_queries(self):
+        user = self.authenticate()
+
+        with self.assertNumQueries(0):
+            cached_user = self.authenticate()
+
+        self.assertEqual(cached_user, user)
+        self.assertEqual(cached_user.email, self.user_email)
+        self.assertIsNot(cached_user, user)
+        self.assertFalse(cached_user._state.adding)
+
+    def test_saved_user_is_looked_up_again(self):
+        user = self.authenticate()
+        user.is_staff = True
+        user.save()
+
+        with self.assertNumQueries(1):
+            self.assertTrue(self.authenticate().is_staff)
+
+    def test_deleted_user_is_created_again(self):
+        user = self.authenticate()
+        get_user_model().objects.filter(id=user.id).delete()
+
+        self.assertNotEqual(self.authenticate().id, user.id)
+
+    @mock.patch("experimenter.base.cache.time.monotonic")
+    def test_cached_user_expires_after_ttl(self, mock_monotonic):
+        mock_monotonic.return_value = 100
+
+        with self.settings(OPENIDC_USER_CACHE_TTL=60):
+            self.authenticate()
+
+            mock_monotonic.return_value = 161
+            with self.assertNumQueries(1):
+                self.authenticate()
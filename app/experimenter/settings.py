@@ -63,6 +63,7 @@ INSTALLED_APPS = [
     "widget_tweaks",
     # Experimenter
     "experimenter.base",
+    "experimenter.bugzilla",
     "experimenter.experiments",
     "experimenter.kinto",
     "experimenter.normandy",
@@ -142,6 +143,10 @@ OPENIDC_AUTH_WHITELIST = (
     "experiment-rapid-recipe-list",
     "experiment-rapid-recipe-detail",
 )
+# Users are looked up by their header email at most once per ttl per process,
+# saving or deleting a user drops its entry in the process that made the change
+OPENIDC_USER_CACHE_SIZE = config("OPENIDC_USER_CACHE_SIZE", default=1000, cast=int)
+OPENIDC_USER_CACHE_TTL = config("OPENIDC_USER_CACHE_TTL", default=60, cast=int)
 
 # Internationalization
 # https://docs.djangoproject.com/en/1.9/topics/i18n/
@@ -281,6 +286,31 @@ BUGZILLA_BUG_URL = "{path}?api_key={api_key}".format(
 BUGZILLA_COMMENT_URL = "{path}?api_key={api_key}".format(
     path=urljoin(BUGZILLA_HOST, "/rest/bug/{id}/comment"), api_key=BUGZILLA_API_KEY
 )
+BUGZILLA_API_CONNECT_TIMEOUT = config(
+    "BUGZILLA_API_CONNECT_TIMEOUT", default=3.05, cast=float
+)
+BUGZILLA_API_READ_TIMEOUT = config("BUGZILLA_API_READ_TIMEOUT", default=10, cast=float)
+BUGZILLA_API_MAX_RETRIES = config("BUGZILLA_API_MAX_RETRIES", default=3, cast=int)
+BUGZILLA_API_BACKOFF_FACTOR = config(
+    "BUGZILLA_API_BACKOFF_FACTOR", default=0.5, cast=float
+)
+BUGZILLA_API_POOL_SIZE = config("BUGZILLA_API_POOL_SIZE", default=10, cast=int)
+BUGZILLA_CACHE_SIZE = config("BUGZILLA_CACHE_SIZE", default=1000, cast=int)
+BUGZILLA_CACHE_TTL = config("BUGZILLA_CACHE_TTL", default=3600, cast=int)
+BUGZILLA_CACHE_NEGATIVE_TTL = config("BUGZILLA_CACHE_NEGATIVE_TTL", default=300, cast=int)
+# Rate limits are shared by all workers through the task lock Redis, "local"
+# limits each process on its own for tests without Redis
+RATE_LIMIT_BACKEND = config("RATE_LIMIT_BACKEND", default="redis")
+# Calls per second to the Bugzilla API from all workers together
+BUGZILLA_API_RATE_LIMIT = config("BUGZILLA_API_RATE_LIMIT", default=5, cast=float)
+BUGZILLA_API_RATE_BURST = config("BUGZILLA_API_RATE_BURST", default=10, cast=int)
+# Seconds queued updates to a bug wait for more updates to send along with
+# them, 0 sends each update as soon as it is queued
+BUGZILLA_COALESCE_WINDOW = config("BUGZILLA_COALESCE_WINDOW", default=10, cast=int)
+# Queued updates that fail to send are kept and retried after a delay, until
+# they run out of attempts
+BUGZILLA_UPDATE_MAX_ATTEMPTS = config("BUGZILLA_UPDATE_MAX_ATTEMPTS", default=5, cast=int)
+BUGZILLA_UPDATE_RETRY_DELAY = config("BUGZILLA_UPDATE_RETRY_DELAY", default=60, cast=int)
 
 # DS Issue URL
 DS_ISSUE_HOST = config("DS_ISSUE_HOST")
@@ -293,26 +323,68 @@ REDIS_DB = config("REDIS_DB")
 CELERY_BROKER_URL = "redis://{host}:{port}/{db}".format(
     host=REDIS_HOST, port=REDIS_PORT, db=REDIS_DB
 )
+# Each integration gets its own queue so a slow Bugzilla or Kinto can't
+# starve the others, and run_worker caps the processes serving each queue
+CELERY_TASK_DEFAULT_QUEUE = "celery"
+CELERY_TASK_ROUTES = {
+    "experimenter.bugzilla.tasks.*": {"queue": "bugzilla"},
+    "experimenter.normandy.tasks.*": {"queue": "normandy"},
+    "experimenter.kinto.tasks.*": {"queue": "kinto"},
+    "experimenter.experiments.tasks.*": {"queue": "email"},
+}
+WORKER_QUEUE_CONCURRENCY = {
+    CELERY_TASK_DEFAULT_QUEUE: config("WORKER_DEFAULT_CONCURRENCY", default=1, cast=int),
+    "bugzilla": config("WORKER_BUGZILLA_CONCURRENCY", default=2, cast=int),
+    "normandy": config("WORKER_NORMANDY_CONCURRENCY", default=2, cast=int),
+    "kinto": config("WORKER_KINTO_CONCURRENCY", default=1, cast=int),
+    "email": config("WORKER_EMAIL_CONCURRENCY", default=1, cast=int),
+}
+# Redis serves lower priority numbers first, user triggered tasks jump ahead
+# of background work on the same queue. Prefetching one message at a time
+# keeps a worker from holding background messages a user task could overtake.
+TASK_PRIORITY_USER = 0
+CELERY_TASK_DEFAULT_PRIORITY = 6
+CELERY_BROKER_TRANSPORT_OPTIONS = {"priority_steps": list(range(10))}
+CELERY_WORKER_PREFETCH_MULTIPLIER = 1
+# Beat task locks, "local" keeps them in process for tests without Redis
+TASK_LOCK_BACKEND = config("TASK_LOCK_BACKEND", default="redis")
+TASK_LOCK_URL = config("TASK_LOCK_URL", default=CELERY_BROKER_URL)
+TASK_LOCK_TTL = config("TASK_LOCK_TTL", default=300, cast=int)
+# How long a task that must not be skipped waits before retrying a held lock
+TASK_LOCK_RETRY_DELAY = config("TASK_LOCK_RETRY_DELAY", default=30, cast=int)
+# Beat ticks only poll experiments whose next status check is due, and local
+# status changes wake the matching task right away
+STATUS_CHECK_ACTIVE_INTERVAL = config(
+    "STATUS_CHECK_ACTIVE_INTERVAL", default=60, cast=int
+)
+STATUS_CHECK_DORMANT_INTERVAL = config(
+    "STATUS_CHECK_DORMANT_INTERVAL", default=1800, cast=int
+)
+STATUS_CHECK_TRANSITION_DAYS = config("STATUS_CHECK_TRANSITION_DAYS", default=1, cast=int)
 CELERY_BEAT_SCHEDULE = {
     "experiment_status_ready_to_ship_task": {
         "task": "experimenter.normandy.tasks.update_recipe_ids_to_experiments",
-        "schedule": config("CELERY_SCHEDULE_INTERVAL", default=300, cast=int),
+        "schedule": config("CELERY_SCHEDULE_INTERVAL", default=60, cast=int),
     },
     "experiment_status_launched_task": {
         "task": "experimenter.normandy.tasks.update_launched_experiments",
-        "schedule": config("CELERY_SCHEDULE_INTERVAL", default=300, cast=int),
+        "schedule": config("CELERY_SCHEDULE_INTERVAL", default=60, cast=int),
     },
     "check_kinto_push_queue_task": {
         "task": "experimenter.kinto.tasks.check_kinto_push_queue",
-        "schedule": config("CELERY_SCHEDULE_INTERVAL", default=300, cast=int),
+        "schedule": config("CELERY_SCHEDULE_INTERVAL", default=60, cast=int),
     },
     "check_experiment_is_live": {
         "task": "experimenter.kinto.tasks.check_experiment_is_live",
-        "schedule": config("CELERY_SCHEDULE_INTERVAL", default=300, cast=int),
+        "schedule": config("CELERY_SCHEDULE_INTERVAL", default=60, cast=int),
     },
     "check_experiment_is_complete": {
         "task": "experimenter.kinto.tasks.check_experiment_is_complete",
-        "schedule": config("CELERY_SCHEDULE_INTERVAL", default=300, cast=int),
+        "schedule": config("CELERY_SCHEDULE_INTERVAL", default=60, cast=int),
+    },
+    "send_period_ending_emails_task": {
+        "task": "experimenter.experiments.tasks.send_period_ending_emails_task",
+        "schedule": config("CELERY_SCHEDULE_INTERVAL", default=60, cast=int),
     },
 }
 
@@ -355,6 +427,23 @@ DELIVERY_CONSOLE_EXPERIMENT_IMPORT_URL = urljoin(
 NORMANDY_API_HOST = config("NORMANDY_API_HOST")
 NORMANDY_API_RECIPE_URL = urljoin(NORMANDY_API_HOST, "/api/v3/recipe/{id}/")
 NORMANDY_API_RECIPES_LIST_URL = urljoin(NORMANDY_API_HOST, "/api/v3/recipe/")
+NORMANDY_API_CONNECT_TIMEOUT = config(
+    "NORMANDY_API_CONNECT_TIMEOUT", default=3.05, cast=float
+)
+NORMANDY_API_READ_TIMEOUT = config("NORMANDY_API_READ_TIMEOUT", default=10, cast=float)
+NORMANDY_API_MAX_RETRIES = config("NORMANDY_API_MAX_RETRIES", default=3, cast=int)
+NORMANDY_API_BACKOFF_FACTOR = config(
+    "NORMANDY_API_BACKOFF_FACTOR", default=0.5, cast=float
+)
+NORMANDY_API_POOL_SIZE = config("NORMANDY_API_POOL_SIZE", default=10, cast=int)
+NORMANDY_API_MAX_WORKERS = config("NORMANDY_API_MAX_WORKERS", default=10, cast=int)
+NORMANDY_RECIPE_CACHE_SIZE = config("NORMANDY_RECIPE_CACHE_SIZE", default=1000, cast=int)
+# Match experiments against one paged recipe listing instead of a
+# listing per slug, the per slug listing is still used when this is off or
+# the paged listing fails
+NORMANDY_API_BATCH_RECIPE_LIST = config(
+    "NORMANDY_API_BATCH_RECIPE_LIST", default=True, cast=bool
+)
 
 # Jira URL
 JIRA_URL = config(
@@ -379,3 +468,31 @@ KINTO_PASS = config("KINTO_PASS")
 KINTO_BUCKET = config("KINTO_BUCKET")
 KINTO_BUCKET_MAIN = config("KINTO_BUCKET_MAIN")
 KINTO_COLLECTION = config("KINTO_COLLECTION")
+# How long the Kinto tasks share one fetched snapshot of the collections,
+# half the beat interval so the tasks of one tick share it and each tick
+# sees fresh state
+KINTO_SNAPSHOT_TTL = config(
+    "KINTO_SNAPSHOT_TTL",
+    default=config("CELERY_SCHEDULE_INTERVAL", default=60, cast=int) // 2,
+    cast=int,
+)
+# How many queued experiments one review can publish together
+KINTO_PUSH_BATCH_SIZE = config("KINTO_PUSH_BATCH_SIZE", default=10, cast=int)
+
+# Caches
+# The recipe cache backend can point at any shared cache, for example
+# RECIPE_CACHE_BACKEND=experimenter.base.cache.RedisCache with
+# RECIPE_CACHE_LOCATION=redis://redis:6379/1
+CACHES = {
+    "default": {"BACKEND": "django.core.cache.backends.locmem.LocMemCache"},
+    "recipes": {
+        "BACKEND": config(
+            "RECIPE_CACHE_BACKEND",
+            default="django.core.cache.backends.locmem.LocMemCache",
+        ),
+        "LOCATION": config("RECIPE_CACHE_LOCATION", default="recipes"),
+        "TIMEOUT": config("RECIPE_CACHE_TIMEOUT", default=24 * 60 * 60, cast=int),
+    },
+}
+RECIPE_CACHE_ALIAS = "recipes"
+RECIPE_CACHE_LOCAL_SIZE = config("RECIPE_CACHE_LOCAL_SIZE", default=500, cast=int)